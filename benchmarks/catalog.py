@@ -0,0 +1,115 @@
+import asyncio
+import re
+import time
+from datetime import datetime, timedelta
+from application_sdk.clients.sql import AsyncBaseSQLClient
+from src.routes.database import BULK_QUERIES, QUERIES, signal_query
+from typing import Any, Dict, List, Optional, Tuple
+
+CONSTRAINT_TYPES = ("PRIMARY KEY", "UNIQUE", "FOREIGN KEY", "CHECK")
+DATA_TYPES = ("integer", "character varying", "numeric", "timestamp without time zone", "boolean", "text")
+# Sample queries built by src/utils/profiling.sample_query; names are quoted with " or `
+SAMPLE_QUERY = re.compile(r"SELECT (?P<columns>.+) FROM (?P<schema>([\"`]).+?\3)\.(?P<table>([\"`]).+?\5) .*?(LIMIT|FETCH FIRST) (?P<rows>\d+)", re.S)
+
+def _value(data_type: str, column: int, row: int) -> Any:
+    # Deterministic data: integers are unique, text repeats, nullable columns are null every tenth row
+    if column and row % 10 == 0:
+        return None
+    if data_type == "integer":
+        return row
+    if data_type == "numeric":
+        return (row % 250) * 1.5
+    if data_type == "timestamp without time zone":
+        return datetime(2024, 1, 1) + timedelta(minutes=row)
+    if data_type == "boolean":
+        return row % 3 == 0
+    return f"value_{row % 40}"
+
+class SyntheticCatalogClient(AsyncBaseSQLClient):
+    """
+    In-memory catalog of `schemas` x `tables` x `columns`, with `constraints` per table, answering the
+    extractor's catalog queries after `latency` seconds each. Each table holds `rows` rows of synthetic data for
+    the profiling queries (row estimate and sample). Records the number of queries and the
+    time each one took, so benchmarks can report query counts and latency percentiles.
+    """
+    def __init__(self, db_type: str = "postgresql", schemas: int = 5, tables: int = 20, columns: int = 10,
+                 constraints: int = 2, latency: float = 0.0, rows: int = 1000):
+        self.db_type = db_type
+        self.rows = rows
+        self.latency = latency
+        self.query_count = 0
+        self.query_seconds: List[float] = []
+        self._kinds = {queries[db_type]: ("per_table", kind) for kind, queries in QUERIES.items()}     # Query text -> what to answer
+        self._kinds.update({queries[db_type]: ("bulk", kind) for kind, queries in BULK_QUERIES.items()})
+        self._kinds[signal_query(db_type)] = ("bulk", "signal")
+
+        self.schema_rows = [{"schema_name": f"schema_{s}", "description": f"Schema {s}" if s % 2 else None} for s in range(schemas)]
+        self.table_rows: Dict[str, List[Dict[str, Any]]] = {}
+        self.column_rows: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self.constraint_rows: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for schema_row in self.schema_rows:
+            schema_name = schema_row["schema_name"]
+            self.table_rows[schema_name] = [{"table_name": f"table_{t}", "description": f"Table {t}" if t % 3 else None} for t in range(tables)]
+            for table_row in self.table_rows[schema_name]:
+                key = (schema_name, table_row["table_name"])
+                self.column_rows[key] = [{
+                    "column_name": f"column_{c}",
+                    "data_type": DATA_TYPES[c % len(DATA_TYPES)],
+                    "is_nullable": "NO" if c == 0 else "YES",
+                    "ordinal_position": c + 1,
+                    "description": f"Column {c}" if c % 4 == 0 else None,
+                } for c in range(columns)]
+                self.constraint_rows[key] = [{
+                    "constraint_name": f"{table_row['table_name']}_{CONSTRAINT_TYPES[k % len(CONSTRAINT_TYPES)].split()[0].lower()}_{k}",
+                    "constraint_type": CONSTRAINT_TYPES[k % len(CONSTRAINT_TYPES)],
+                    "column_name": f"column_{k % max(1, columns)}",
+                    "key_position": 1,
+                } for k in range(constraints)]
+
+    async def connect(self, credentials: Dict[str, Any]) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def _sample(self, query: str) -> List[Tuple[Any, ...]]:
+        match = SAMPLE_QUERY.match(query.replace("/* profile_sample */ ", "", 1))
+        unquote = lambda name: name[1:-1].replace(name[0] * 2, name[0])
+        key = (unquote(match.group("schema")), unquote(match.group("table")))
+        types = {row["column_name"]: (index, row["data_type"]) for index, row in enumerate(self.column_rows[key])}
+        columns = [types[unquote(name.strip())] for name in match.group("columns").split(",")]
+        return [tuple(_value(data_type, index, row) for index, data_type in columns)
+                for row in range(min(self.rows, int(match.group("rows"))))]
+
+    def _answer(self, query: str, args: tuple) -> List[Dict[str, Any]]:
+        if query.startswith("/* profile_sample */"):
+            return self._sample(query)
+        if query not in self._kinds:        # Profiling queries are registered on first use, so pandas loads only when profiling
+            from src.utils.profiling import ROW_ESTIMATE_QUERIES
+            self._kinds[ROW_ESTIMATE_QUERIES[self.db_type]] = ("per_table", "row_estimate")
+        mode, kind = self._kinds[query]
+        if kind == "row_estimate":
+            return [{"row_estimate": self.rows}] if (args[0], args[1]) in self.column_rows else []
+        if kind == "schema":
+            return [dict(row) for row in self.schema_rows]
+        if kind == "signal":
+            return [{"schema_name": schema_name, "table_name": row["table_name"], "signal": "0"}
+                    for schema_name, rows in self.table_rows.items() for row in rows]
+        if mode == "per_table":
+            if kind == "table":
+                return [dict(row) for row in self.table_rows.get(args[0], [])]
+            rows = self.column_rows if kind == "column" else self.constraint_rows
+            return [dict(row) for row in rows.get((args[0], args[1]), [])]
+        if kind == "table":
+            return [{"schema_name": schema_name, **row} for schema_name, rows in self.table_rows.items() for row in rows]
+        rows = self.column_rows if kind == "column" else self.constraint_rows
+        return [{"schema_name": schema_name, "table_name": table_name, **row} for (schema_name, table_name), table in rows.items() for row in table]
+
+    async def execute_query(self, query: str, *args, timeout: Optional[float] = None) -> list:
+        started = time.perf_counter()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        result = self._answer(query, args)
+        self.query_count += 1
+        self.query_seconds.append(time.perf_counter() - started)
+        return result
@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.catalog import SyntheticCatalogClient
+from benchmarks.workbook import write_workbook
+from src.routes.database import iter_db_metadata
+from src.routes.excel import iter_excel_batch_metadata, iter_excel_metadata
+from src.transformers.atlas import GenericAtlasTransformer
+from src.utils.streaming import Event, append_event
+
+CREDENTIALS = {"database": "benchmark"}
+CONNECTION = "benchmark/connection"
+
+# Metric -> direction that counts as a regression
+REGRESSION_CHECKS = {
+    "entities_per_s": "lower",
+    "p99_ms": "higher",
+    "queries": "higher",
+    "peak_rss_mb": "higher",
+}
+NOISE_FLOOR_MS = 0.5        # Latency changes smaller than this are timer noise, whatever the percentage
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024       # bytes on macOS, KiB on Linux
+
+def _summary(entities: int, seconds: float, gaps: List[float]) -> Dict[str, Any]:
+    return {
+        "entities": entities,
+        "seconds": round(seconds, 4),
+        "entities_per_s": round(entities / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(percentile(gaps, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(gaps, 0.99) * 1000, 3),
+    }
+
+def _measure(events: Iterable[Event]) -> Dict[str, Any]:
+    # Assemble the result the way fetch_*_metadata does, timing the gap before each event
+    schemas, gaps, entities = [], [], 0
+    started = last = time.perf_counter()
+    for typename, entity in events:
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+        append_event(schemas, typename, entity)
+        entities += 1 + len(entity.get("columns", []))
+    return _summary(entities, time.perf_counter() - started, gaps)
+
+def bench_db(options: Dict[str, Any], bulk: bool, profile: bool = False) -> Dict[str, Any]:
+    # Profiled tables hold ten times the row budget, so Postgres and Oracle take the block-sampling path
+    client = SyntheticCatalogClient(options["db_type"], options["schemas"], options["tables"], options["columns"],
+                                    options["constraints"], options["latency"], rows=options["profile_rows"] * 10)
+    budget = {"rows": options["profile_rows"], "timeout": 30.0, "top_k": 5} if profile else None
+    agen = iter_db_metadata(client, CREDENTIALS, CONNECTION, options["db_type"], bulk=bulk, concurrency=options["concurrency"],
+                            profile=budget)
+    loop = asyncio.new_event_loop()
+
+    def events():       # Step the extractor one event at a time so the measured gaps include query latency
+        try:
+            while True:
+                yield loop.run_until_complete(agen.__anext__())
+        except StopAsyncIteration:
+            return
+        finally:
+            loop.close()
+
+    result = _measure(events())
+    result["queries"] = client.query_count
+    result["query_p50_ms"] = round(percentile(client.query_seconds, 0.50) * 1000, 3)
+    result["query_p99_ms"] = round(percentile(client.query_seconds, 0.99) * 1000, 3)
+    return result
+
+def _column_batches(options: Dict[str, Any]) -> List[Dict[str, List[Any]]]:
+    client = SyntheticCatalogClient(options["db_type"], options["schemas"], options["tables"], options["columns"], 0)
+    batches = []
+    for (schema_name, table_name), rows in client.column_rows.items():
+        batches.append({
+            "column_name": [row["column_name"] for row in rows],
+            "schema_name": [schema_name] * len(rows),
+            "table_name": [table_name] * len(rows),
+            "database_name": ["benchmark"] * len(rows),
+            "connection_qualified_name": [CONNECTION] * len(rows),
+            "data_type": [row["data_type"] for row in rows],
+            "is_nullable": [row["is_nullable"] for row in rows],
+            "ordinal_position": [row["ordinal_position"] for row in rows],
+            "description": [row["description"] or "" for row in rows],
+            "constraint_type": [""] * len(rows),
+        })
+    return batches
+
+def bench_transform(options: Dict[str, Any], batch: bool) -> Dict[str, Any]:
+    # Column entities of every synthetic table, one table per timed step
+    transformer = GenericAtlasTransformer(connector_name=options["db_type"], tenant_id="default")
+    batches = _column_batches(options)
+
+    gaps, entities = [], 0
+    started = time.perf_counter()
+    for columns in batches:
+        step = time.perf_counter()
+        if batch:
+            entities += len(transformer.transform_batch("COLUMN", columns))
+        else:
+            keys = list(columns)
+            entities += len([transformer.transform_row("COLUMN", dict(zip(keys, values))) for values in zip(*columns.values())])
+        gaps.append(time.perf_counter() - step)
+    result = _summary(entities, time.perf_counter() - started, gaps)
+    result["queries"] = 0
+    return result
+
+def bench_excel(options: Dict[str, Any], batch: bool) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="excel_benchmark_") as directory:
+        files = options["files"] if batch else 1
+        paths = [write_workbook(os.path.join(directory, f"workbook_{f}.xlsx"), options["sheets"], options["sheet_columns"], options["rows"])
+                 for f in range(files)]
+        if batch:
+            events = iter_excel_batch_metadata(paths, CONNECTION, options["sample_rows"], options["max_workers"])
+        else:
+            events = iter_excel_metadata(paths[0], CONNECTION, options["sample_rows"])
+        result = _measure(events)
+    result["queries"] = 0
+    return result
+
+SCENARIOS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "db_per_table": lambda options: bench_db(options, bulk=False),
+    "db_bulk": lambda options: bench_db(options, bulk=True),
+    "db_profile": lambda options: bench_db(options, bulk=True, profile=True),
+    "transform_row": lambda options: bench_transform(options, batch=False),
+    "transform_batch": lambda options: bench_transform(options, batch=True),
+    "excel": lambda options: bench_excel(options, batch=False),
+    "excel_batch": lambda options: bench_excel(options, batch=True),
+}
+
+def run_scenario(name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    # Runs in a fresh process so peak RSS belongs to this scenario alone
+    GenericAtlasTransformer(connector_name=options["db_type"]).transform_row(      # Warm up one-time SDK and logger setup
+        "SCHEMA", {"schema_name": "warmup", "database_name": "", "connection_qualified_name": CONNECTION, "description": "", "tags": []})
+    best = None
+    for _ in range(options["repeat"]):
+        result = SCENARIOS[name](options)
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    best["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    return best
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    # Regressions beyond `tolerance` (a fraction) for scenarios present in both runs
+    failures = []
+    for name, result in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric, direction in REGRESSION_CHECKS.items():
+            if metric not in result or not previous.get(metric):
+                continue
+            if metric.endswith("_ms") and abs(result[metric] - previous[metric]) < NOISE_FLOOR_MS:
+                continue
+            change = (result[metric] - previous[metric]) / previous[metric]
+            if (direction == "lower" and change < -tolerance) or (direction == "higher" and change > tolerance):
+                failures.append(f"{name}.{metric}: {previous[metric]} -> {result[metric]} ({change:+.1%})")
+    return failures
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the metadata extractors against synthetic sources")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--db-type", dest="db_type", default="postgresql", choices=["postgresql", "mysql", "oracle"])
+    parser.add_argument("--schemas", type=int, default=5)
+    parser.add_argument("--tables", type=int, default=50, help="tables per schema")
+    parser.add_argument("--columns", type=int, default=20, help="columns per table")
+    parser.add_argument("--constraints", type=int, default=2, help="constraints per table")
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds per catalog query")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--profile-rows", dest="profile_rows", type=int, default=1000, help="sampled rows per table in db_profile")
+    parser.add_argument("--sheets", type=int, default=5)
+    parser.add_argument("--sheet-columns", dest="sheet_columns", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=2000, help="rows per sheet")
+    parser.add_argument("--sample-rows", dest="sample_rows", type=int, default=1000)
+    parser.add_argument("--files", type=int, default=4, help="workbooks in the excel_batch scenario")
+    parser.add_argument("--max-workers", dest="max_workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario; the fastest is reported")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression as a fraction (default 0.2)")
+    return parser.parse_args(argv)
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    options = {key: value for key, value in vars(args).items() if key not in ("scenarios", "output", "baseline", "tolerance")}
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    results = {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(), "options": options, "scenarios": {}}
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            result = executor.submit(run_scenario, name, options).result()
+        results["scenarios"][name] = result
+        print(f"{name:<16} {result['entities']:>9} entities {result['entities_per_s']:>12.1f}/s  p50 {result['p50_ms']:>8.3f} ms  "
+              f"p99 {result['p99_ms']:>8.3f} ms  queries {result['queries']:>6}  peak RSS {result['peak_rss_mb']:>7.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,17 @@
+import openpyxl
+from datetime import datetime, timedelta
+
+def write_workbook(path: str, sheets: int = 3, columns: int = 20, rows: int = 1000) -> str:
+    """
+    Write a synthetic workbook of `sheets` x `columns` x `rows`, cycling through integer, float, text,
+    date and boolean columns so type inference has something to do.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    start = datetime(2024, 1, 1)
+    for s in range(sheets):
+        sheet = workbook.create_sheet(f"Sheet_{s}")
+        sheet.append([f"column_{c}" for c in range(columns)])
+        for r in range(rows):
+            sheet.append([(r, r * 1.5, f"value_{r}", start + timedelta(days=r), r % 2 == 0)[c % 5] for c in range(columns)])
+    workbook.save(path)
+    return path
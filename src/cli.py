@@ -0,0 +1,207 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Exit codes for cron and Kubernetes Jobs: everything extracted / extraction failed / bad arguments or config /
+# some sources failed / interrupted
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_PARTIAL = 3
+EXIT_INTERRUPTED = 130
+
+FORMATS = ("json", "ndjson", "json_stream", "parquet", "arrow")
+DATABASES = ("postgres", "mysql", "oracle")
+
+# Modules are imported inside the commands: an Excel run never loads a database driver, and a database run
+# only loads its own dialect's driver (see DB_SOURCES in src/routes/database.py)
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extract metadata without the Flask app")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name in DATABASES:
+        database = commands.add_parser(name, help=f"extract {name} metadata")
+        database.add_argument("--env-prefix", dest="env_prefix", help="read credentials from <prefix>_USER, _PASSWORD, ... (default the dialect's)")
+        database.add_argument("--connection", help="connection_qualified_name (default default/<dialect>)")
+        database.add_argument("--bulk", action="store_true", help="set-based catalog queries instead of one per table")
+        database.add_argument("--concurrency", type=int, default=1, help="catalog queries in flight at once")
+        database.add_argument("--rate-limit", dest="rate_limit", type=float, default=None, help="catalog queries per second")
+        database.add_argument("--include-schemas", dest="include_schemas", nargs="+")
+        database.add_argument("--exclude-schemas", dest="exclude_schemas", nargs="+")
+        database.add_argument("--include-tables", dest="include_tables", nargs="+")
+        database.add_argument("--exclude-tables", dest="exclude_tables", nargs="+")
+        database.add_argument("--pattern-type", dest="pattern_type", default="like", choices=["like", "regex"])
+        database.add_argument("--object-types", dest="object_types", nargs="+", choices=["table", "view"])
+        database.add_argument("--max-depth", dest="max_depth", default="constraint", choices=["schema", "table", "column", "constraint"])
+        database.add_argument("--profile", action="store_true", help="profile column values from a sample of each table")
+        database.add_argument("--profile-rows", dest="profile_rows", type=int, default=None)
+        database.add_argument("--profile-timeout", dest="profile_timeout", type=float, default=None)
+        database.add_argument("--retries", type=int, default=None, help="attempts per table after a failure (default EXTRACTION_RETRIES)")
+        database.add_argument("--retry-backoff", dest="retry_backoff", type=float, default=None, help="seconds before the first retry, doubling after each (default RETRY_BACKOFF)")
+        database.add_argument("--checkpoint", action="store_true", help="record completed tables in CHECKPOINT_PATH")
+        database.add_argument("--resume", action="store_true", help="continue the last unfinished checkpointed run")
+        database.add_argument("--format", default="json", choices=FORMATS)
+        database.add_argument("--output", help="output file; for parquet/arrow the base directory (default EXPORT_DIR)")
+
+    excel = commands.add_parser("excel", help="extract Excel workbook metadata")
+    excel.add_argument("files", nargs="+", help=".xlsx or .xls files; several are parsed in parallel")
+    excel.add_argument("--connection", default="default/excel", help="connection_qualified_name")
+    excel.add_argument("--sample-rows", dest="sample_rows", type=int, default=1000, help="rows read per sheet (0 reads every row)")
+    excel.add_argument("--max-workers", dest="max_workers", type=int, default=None, help="workbooks parsed at once when several are given (default, and at most, the available cores)")
+    excel.add_argument("--format", default="json", choices=FORMATS)
+    excel.add_argument("--output", help="output file; for parquet/arrow the base directory (default EXPORT_DIR)")
+
+    sources = commands.add_parser("sources", help="extract several sources in parallel, merged by connection_qualified_name")
+    sources.add_argument("--config", required=True, help='JSON file: {"sources": [...]} as accepted by POST /extract_sources, or the list itself')
+    sources.add_argument("--max-parallel", dest="max_parallel", type=int, default=None, help="sources extracted at once (default FANOUT_MAX_PARALLEL)")
+    sources.add_argument("--timeout", type=float, default=None, help="seconds per source unless the source sets its own (default FANOUT_SOURCE_TIMEOUT)")
+    sources.add_argument("--output", required=True, help="write the merged result to this JSON file")
+    return parser.parse_args(argv)
+
+def _write(path: str, chunks: Iterable[bytes]) -> None:
+    # Written next to the target and renamed, so a reader never sees a partial file
+    partial = f"{path}.partial"
+    try:
+        with open(partial, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+def _output_error(args: argparse.Namespace) -> str:
+    # Logs go to stdout, so results always go to a file
+    if args.format not in ("parquet", "arrow") and not args.output:
+        return f"--output is required for --format {args.format}"
+    return ""
+
+def _run_export(args: argparse.Namespace, connection_qualified_name: str, export: Callable[[str], Dict[str, Any]]) -> int:
+    from src.utils.config import get_export_dir
+    from src.utils.export import export_directory
+
+    manifest = export(export_directory(args.output or get_export_dir(), connection_qualified_name))
+    print(f"Exported {manifest['files']['tables']['rows']} tables to {manifest['directory']}", file=sys.stderr)
+    return EXIT_OK
+
+def run_database(args: argparse.Namespace) -> int:
+    from src.routes.database import DB_SOURCES, _extraction_options, fetch_db_metadata, iter_db_metadata
+    from src.utils.config import get_db_credentials
+    from src.utils.export import export_events_async
+    from src.utils.serialization import dumps
+    from src.utils.streaming import STREAM_FORMATS, iterate_async
+
+    client_factory, env_prefix, default_connection, db_type = DB_SOURCES[args.command]
+    fields = {key: value for key, value in vars(args).items() if value is not None and key not in ("command", "env_prefix", "connection", "format", "output")}
+    try:
+        options = _extraction_options(fields)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_USAGE
+    if _output_error(args):
+        print(_output_error(args), file=sys.stderr)
+        return EXIT_USAGE
+    credentials = get_db_credentials(args.env_prefix or env_prefix)
+    connection_qualified_name = args.connection or default_connection
+    # One extraction per process, so the client connects and closes itself instead of going through the registry
+    events = lambda: iter_db_metadata(client_factory(), credentials, connection_qualified_name, db_type, **options)
+
+    if args.format in STREAM_FORMATS:       # Written one table at a time
+        chunks, _ = STREAM_FORMATS[args.format]
+        _write(args.output, chunks(iterate_async(events)))
+    elif args.format in ("parquet", "arrow"):
+        return _run_export(args, connection_qualified_name, lambda directory: asyncio.run(export_events_async(events(), directory, args.format)))
+    else:
+        metadata = asyncio.run(fetch_db_metadata(client_factory(), credentials, connection_qualified_name, db_type, **options))
+        _write(args.output, [dumps({"schemas": metadata})])
+    print(f"Extracted {connection_qualified_name} to {args.output}", file=sys.stderr)
+    return EXIT_OK
+
+def run_excel(args: argparse.Namespace) -> int:
+    from src.routes.excel import _sample_rows, fetch_excel_batch_metadata, fetch_excel_metadata, iter_excel_batch_metadata, iter_excel_metadata
+    from src.utils.export import export_events
+    from src.utils.serialization import dumps
+    from src.utils.streaming import STREAM_FORMATS
+
+    for file_path in args.files:
+        if not file_path.endswith(('.xlsx', '.xls')) or not os.path.exists(file_path):
+            print(f"Not an .xlsx or .xls file: {file_path}", file=sys.stderr)
+            return EXIT_USAGE
+    if _output_error(args):
+        print(_output_error(args), file=sys.stderr)
+        return EXIT_USAGE
+    sample_rows = _sample_rows({"sample_rows": args.sample_rows})
+    if len(args.files) == 1:
+        events = lambda: iter_excel_metadata(args.files[0], args.connection, sample_rows)
+    else:
+        events = lambda: iter_excel_batch_metadata(args.files, args.connection, sample_rows, args.max_workers)
+
+    if args.format in STREAM_FORMATS:
+        chunks, _ = STREAM_FORMATS[args.format]
+        _write(args.output, chunks(events()))
+    elif args.format in ("parquet", "arrow"):
+        return _run_export(args, args.connection, lambda directory: export_events(events(), directory, args.format))
+    else:
+        if len(args.files) == 1:
+            metadata = fetch_excel_metadata(args.files[0], args.connection, sample_rows)
+        else:
+            metadata = fetch_excel_batch_metadata(args.files, args.connection, sample_rows, args.max_workers)
+        _write(args.output, [dumps({"schemas": metadata})])
+    print(f"Extracted {len(args.files)} workbooks to {args.output}", file=sys.stderr)
+    return EXIT_OK
+
+def run_sources(args: argparse.Namespace) -> int:
+    from src.clients.registry import client_registry
+    from src.routes.database import _number
+    from src.routes.sources import extract_sources, parse_sources
+    from src.utils.config import get_fanout_settings
+    from src.utils.serialization import dumps
+
+    try:
+        with open(args.config) as f:
+            data = json.load(f)
+        data = {"sources": data} if isinstance(data, list) else data
+        if args.timeout is not None:
+            data["timeout"] = args.timeout
+        specs = parse_sources(data)
+        max_parallel = args.max_parallel or _number(data, "max_parallel", int, get_fanout_settings()["max_parallel"])
+    except (OSError, ValueError) as e:      # json.JSONDecodeError is a ValueError
+        print(f"Invalid config {args.config}: {str(e)}", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        result: Dict[str, Any] = asyncio.run_coroutine_threadsafe(extract_sources(specs, max_parallel), client_registry.loop).result()
+    finally:
+        client_registry.shutdown()
+    _write(args.output, [dumps(result)])
+
+    for connection_qualified_name, source in result["sources"].items():
+        print(f"{source['status']:<10} {source['seconds']:>9.3f}s  {connection_qualified_name}"
+              + (f"  {source['error']}" if source.get("error") else ""), file=sys.stderr)
+    summary = result["summary"]
+    if summary["succeeded"] == len(specs):
+        return EXIT_OK
+    return EXIT_PARTIAL if summary["succeeded"] else EXIT_FAILED
+
+COMMANDS = {**{name: run_database for name in DATABASES}, "excel": run_excel, "sources": run_sources}
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    try:
+        return COMMANDS[args.command](args)
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        print(f"Extraction failed: {type(e).__name__}: {str(e)}", file=sys.stderr)
+        return EXIT_FAILED
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
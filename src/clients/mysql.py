@@ -1,7 +1,13 @@
-import mysql.connector
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import mysql.connector.pooling
 from application_sdk.clients.sql import AsyncBaseSQLClient
+from src.clients.rows import cursor_rows
 from src.utils.logger import get_logger
-from typing import Any, Dict
+from src.utils.metrics import observe_query
+from typing import Any, Dict, Optional
 
 class MySQLClient(AsyncBaseSQLClient):
     DB_CONFIG = {
@@ -9,39 +15,96 @@ class MySQLClient(AsyncBaseSQLClient):
         "required": ["user", "password", "host", "port", "database"],
     }
 
-    def __init__(self):
+    def __init__(self, pool_size: int = 10):
         self.logger = get_logger(__name__)
+        self.pool_size = min(pool_size, 32)     # mysql.connector caps pools at 32 connections
 
-    async def connect(self, credentials: Dict[str, Any]) -> None:       # Connect
+    async def connect(self, credentials: Dict[str, Any]) -> None:       # Create a connection pool
         try:
-            self.engine = mysql.connector.connect(
+            # One worker thread per pooled connection, so blocking cursors never run on the event loop
+            # and the pool is never asked for more connections than it holds
+            self.executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="mysql")
+            self._lock = threading.Lock()
+            self._closed = False
+            self.engine = await asyncio.get_running_loop().run_in_executor(self.executor, lambda: mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=f"metadata_extractor_{id(self)}",
+                pool_size=self.pool_size,
+                pool_reset_session=False,       # Nothing to reset but MAX_EXECUTION_TIME, which _execute restores itself
                 user=credentials["user"],
                 password=credentials["password"],
                 host=credentials["host"],
                 port=credentials["port"],
                 database=credentials["database"],
                 charset='utf8mb4',
-                use_pure=True
-            )
+                use_pure=True,
+                autocommit=True     # No long-lived transaction snapshots on reused connections
+            ))
             self.logger.info("Successfully connected to MySQL database")        # Logger
         except Exception as e:
             self.logger.error(f"Failed to connect to MySQL: {str(e)}")
             raise
 
-    async def execute_query(self, query: str, *args) -> list:       # Execute a query
+    def _release(self, connection: Any) -> None:
+        # close() returns a pooled connection to the pool; once the client is closed it is disconnected instead
+        with self._lock:
+            if not self._closed:
+                connection.close()
+                return
+        self._disconnect(connection)
+
+    def _disconnect(self, connection: Any) -> None:
         try:
-            cursor = self.engine.cursor(dictionary=True)
-            cursor.execute(query, args)
-            result = cursor.fetchall()
-            normalized_result = [{k.lower(): v for k, v in row.items()} for row in result]
-            cursor.close()
-            self.logger.debug(f"MySQL query result: {normalized_result}")
-            return normalized_result
+            connection.disconnect()
         except Exception as e:
+            self.logger.warning(f"Failed to close MySQL connection: {str(e)}")
+
+    def _execute(self, query: str, args: tuple, timeout: Optional[float]) -> list:     # Runs on an executor thread
+        connection = self.engine.get_connection()
+        try:
+            cursor = connection.cursor()
+            try:
+                if timeout is not None:     # The server stops SELECTs running longer, freeing this thread and connection
+                    cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {max(1, int(timeout * 1000))}")
+                try:
+                    cursor.execute(query, args)
+                    return cursor_rows(cursor.description, cursor.fetchall())
+                finally:
+                    if timeout is not None:
+                        cursor.execute("SET SESSION MAX_EXECUTION_TIME = 0")
+            finally:
+                cursor.close()
+        finally:
+            self._release(connection)
+
+    async def execute_query(self, query: str, *args, timeout: Optional[float] = None) -> list:     # Execute a query
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, self._execute, query, args, timeout)
+            observe_query("mysql", query, time.perf_counter() - started, len(result))
+            self.logger.debug("MySQL query returned %d rows", len(result))
+            return result
+        except Exception as e:
+            observe_query("mysql", query, time.perf_counter() - started, None)
             self.logger.error(f"Query execution failed: {str(e)}")
             raise
 
-    async def close(self):      # Close connection
+    def _close_idle(self) -> None:       # Runs on an executor thread
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                connection = self.engine.get_connection()
+            except mysql.connector.errors.PoolError:        # Every idle connection is taken
+                break
+            except mysql.connector.Error as e:      # A dead connection that could not be reopened
+                self.logger.warning(f"Failed to close MySQL connection: {str(e)}")
+                break
+            self._disconnect(connection)
+
+    async def close(self):      # Close pooled connections
         if hasattr(self, "engine") and self.engine:
-            self.engine.close()
-            self.logger.info("MySQL connection closed")
\ No newline at end of file
+            # Idle connections are closed here; ones still running a query close as soon as it returns
+            await asyncio.get_running_loop().run_in_executor(self.executor, self._close_idle)
+            self.engine = None
+            self.executor.shutdown(wait=False)
+            self.logger.info("MySQL connection closed")
@@ -1,7 +1,12 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 import oracledb
 from application_sdk.clients.sql import AsyncBaseSQLClient
+from src.clients.rows import cursor_rows
 from src.utils.logger import get_logger
-from typing import Any, Dict
+from src.utils.metrics import observe_query
+from typing import Any, Dict, Optional
 
 class OracleClient(AsyncBaseSQLClient):
     DB_CONFIG = {
@@ -9,39 +14,57 @@ class OracleClient(AsyncBaseSQLClient):
         "required": ["user", "password", "host", "port", "service_name"],
     }
 
-    def __init__(self):
+    def __init__(self, pool_size: int = 10):
         self.logger = get_logger(__name__)
+        self.pool_size = pool_size
 
     async def connect(self, credentials: Dict[str, Any]) -> None:
-        # Connect synchronously but wrapped in async interface.
+        # Create a session pool; blocking driver calls run on a dedicated thread pool sized to match it.
         try:
             dsn = f"{credentials['host']}:{credentials['port']}/{credentials['service_name']}"
-            self.engine = oracledb.connect(
+            self.executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="oracle")
+            self.engine = await asyncio.get_running_loop().run_in_executor(self.executor, lambda: oracledb.create_pool(
                 user=credentials["user"],
                 password=credentials["password"],
-                dsn=dsn
-            )
+                dsn=dsn,
+                min=1,
+                max=self.pool_size,
+                increment=1
+            ))
             self.logger.info("Successfully connected to Oracle database")
         except Exception as e:
             self.logger.error(f"Failed to connect to Oracle: {str(e)}")
             raise
 
-    async def execute_query(self, query: str, *args) -> list:
-        # Execute a query using synchronous cursor in thread pool to avoid blocking.
+    def _execute(self, query: str, args: tuple, timeout: Optional[float]) -> list:     # Runs on an executor thread
+        with self.engine.acquire() as connection:
+            # call_timeout makes the server abandon the round-trip, so the session and this thread are freed
+            connection.call_timeout = max(1, int(timeout * 1000)) if timeout is not None else 0
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(query, args)
+                    return cursor_rows(cursor.description, cursor.fetchall())
+            finally:
+                connection.call_timeout = 0     # The session goes back to the pool
+
+    async def execute_query(self, query: str, *args, timeout: Optional[float] = None) -> list:
+        # Execute a query using a pooled session in the client's thread pool to avoid blocking the event loop.
+        # With a timeout (seconds) the database call is abandoned once it runs longer.
+        started = time.perf_counter()
         try:
-            cursor = self.engine.cursor()
-            cursor.execute(query, args)
-            columns = [col[0].lower() for col in cursor.description]
-            result = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            cursor.close()
-            self.logger.debug(f"Oracle query result: {result}")
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, self._execute, query, args, timeout)
+            observe_query("oracle", query, time.perf_counter() - started, len(result))
+            self.logger.debug("Oracle query returned %d rows", len(result))
             return result
         except Exception as e:
+            observe_query("oracle", query, time.perf_counter() - started, None)
             self.logger.error(f"Query execution failed: {str(e)}")
             raise
 
     async def close(self):
-        # Close connection synchronously but wrapped in async interface.
+        # Close the pool off-loop; force drops sessions still checked out by cancelled queries.
         if hasattr(self, "engine") and self.engine:
-            self.engine.close()
-            self.logger.info("Oracle connection closed")
\ No newline at end of file
+            await asyncio.get_running_loop().run_in_executor(self.executor, lambda: self.engine.close(force=True))
+            self.engine = None
+            self.executor.shutdown(wait=False)
+            self.logger.info("Oracle connection closed")
@@ -1,7 +1,9 @@
 import asyncpg
+import time
 from application_sdk.clients.sql import AsyncBaseSQLClient
 from src.utils.logger import get_logger
-from typing import Any, Dict
+from src.utils.metrics import observe_query
+from typing import Any, Dict, Optional
 
 class PostgresClient(AsyncBaseSQLClient):
     DB_CONFIG = {
@@ -24,16 +26,25 @@ class PostgresClient(AsyncBaseSQLClient):
             self.logger.error(f"Failed to connect to PostgreSQL: {str(e)}")
             raise
 
-    async def execute_query(self, query: str, *args) -> list:
+    async def execute_query(self, query: str, *args, timeout: Optional[float] = None) -> list:
         """
         Execute a query with optional arguments and return list of dict results.
+        With a timeout (seconds) the server cancels the statement once it runs longer.
         """
+        started = time.perf_counter()
         async with self.engine.acquire() as connection:
             try:
-                result = await connection.fetch(query, *args)
-                self.logger.debug(f"PostgreSQL query result: {result}")
+                if timeout is None:
+                    result = await connection.fetch(query, *args)
+                else:
+                    async with connection.transaction():        # SET LOCAL only lasts until the transaction ends
+                        await connection.execute(f"SET LOCAL statement_timeout = {max(1, int(timeout * 1000))}")
+                        result = await connection.fetch(query, *args)
+                observe_query("postgresql", query, time.perf_counter() - started, len(result))
+                self.logger.debug("PostgreSQL query returned %d rows", len(result))        # asyncpg Records are returned as-is
                 return result
             except Exception as e:
+                observe_query("postgresql", query, time.perf_counter() - started, None)
                 self.logger.error(f"Query execution failed: {str(e)}")
                 raise
 
@@ -0,0 +1,187 @@
+import asyncio
+import atexit
+import hashlib
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from src.utils.config import get_client_registry_settings
+from src.utils.logger import get_logger
+from src.utils.metrics import register_query_kind
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, List, Optional
+
+logger = get_logger(__name__)
+
+PING_QUERIES = {"postgresql": "SELECT 1", "mysql": "SELECT 1", "oracle": "SELECT 1 FROM dual"}
+for _query in PING_QUERIES.values():
+    register_query_kind(_query, "ping")
+
+def credentials_fingerprint(credentials: Dict[str, Any]) -> str:
+    # Registry key component; keeps secrets out of keys and logs
+    return hashlib.sha256(json.dumps(credentials, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+class _Entry:
+    __slots__ = ("key", "db_type", "client", "created_at", "last_used", "last_checked", "leases", "retired")
+
+    def __init__(self, key: str, db_type: str, client: Any):
+        self.key = key
+        self.db_type = db_type
+        self.client = client
+        self.created_at = self.last_used = self.last_checked = time.monotonic()
+        self.leases = 0
+        self.retired = False
+
+class ClientRegistry:
+    """
+    Process-wide pool of connected clients, one per (db_type, credentials), shared by every request.
+    Clients live on a dedicated event loop thread because asyncpg pools are bound to the loop that
+    created them while Flask runs each async view on its own loop; callers hand coroutines to `call`
+    or async generators to `iterate_async(..., loop=registry.loop)`.
+    A client is pinged before reuse once `health_check_interval` has passed, closed after `idle_timeout`
+    without leases, and retired after `max_lifetime` (closed once its last lease is returned).
+    """
+    def __init__(self, enabled: bool = True, idle_timeout: float = 300, max_lifetime: float = 3600,
+                 health_check_interval: float = 30, reap_interval: float = 15):
+        self.enabled = enabled
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.reap_interval = reap_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="client-registry", daemon=True)
+                self._thread.start()
+                self._reaper = asyncio.run_coroutine_threadsafe(self._reap(), self._loop)
+                atexit.register(self.shutdown)
+            return self._loop
+
+    async def call(self, coro: Coroutine) -> Any:
+        # Run `coro` on the registry loop and await it from any other loop
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    async def _close(self, entry: _Entry) -> None:
+        try:
+            await entry.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing {entry.db_type} client: {str(e)}")
+
+    def _retire(self, entry: _Entry) -> None:
+        entry.retired = True
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+
+    async def _healthy(self, entry: _Entry) -> bool:
+        try:
+            await entry.client.execute_query(PING_QUERIES.get(entry.db_type, "SELECT 1"))
+            entry.last_checked = time.monotonic()
+            return True
+        except Exception as e:
+            logger.warning(f"Health check failed for {entry.db_type} client, reconnecting: {str(e)}")
+            return False
+
+    async def _acquire(self, db_type: str, client_factory: Callable[[], Any], credentials: Dict[str, Any]) -> _Entry:
+        key = f"{db_type}:{credentials_fingerprint(credentials)}"
+        async with self._locks.setdefault(key, asyncio.Lock()):     # One connect per key, even under concurrent first requests
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry and now - entry.created_at > self.max_lifetime:
+                self._retire(entry)
+            elif entry and now - entry.last_checked > self.health_check_interval and not await self._healthy(entry):
+                self._retire(entry)
+            if entry and entry.retired:
+                if entry.leases == 0:
+                    await self._close(entry)
+                entry = None
+            if entry is None:
+                client = client_factory()
+                await client.connect(credentials)
+                entry = self._entries[key] = _Entry(key, db_type, client)
+                logger.info(f"Opened pooled {db_type} client")
+            entry.leases += 1
+            return entry
+
+    @asynccontextmanager
+    async def lease(self, db_type: str, client_factory: Callable[[], Any], credentials: Dict[str, Any]) -> AsyncIterator[Any]:
+        """
+        Borrow a connected client; must run on the registry loop. With the registry disabled, a fresh
+        client is connected and closed around the lease.
+        """
+        if not self.enabled:
+            client = client_factory()
+            await client.connect(credentials)
+            try:
+                yield client
+            finally:
+                await client.close()
+            return
+        entry = await self._acquire(db_type, client_factory, credentials)
+        try:
+            yield entry.client
+        finally:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if entry.retired and entry.leases == 0:
+                await self._close(entry)
+
+    async def borrowed_events(self, db_type: str, client_factory: Callable[[], Any], credentials: Dict[str, Any],
+                              events: Callable[[Any], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        # Lease a client for as long as the async generator `events(client)` runs
+        async with self.lease(db_type, client_factory, credentials) as client:
+            agen = events(client)
+            try:
+                async for item in agen:
+                    yield item
+            finally:
+                await agen.aclose()
+
+    async def _reap(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            now = time.monotonic()
+            for entry in list(self._entries.values()):
+                if entry.leases == 0 and (now - entry.last_used > self.idle_timeout or now - entry.created_at > self.max_lifetime):
+                    self._retire(entry)
+                    await self._close(entry)
+                    logger.info(f"Closed idle {entry.db_type} client")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [{"key": entry.key, "age": round(now - entry.created_at, 1), "idle": round(now - entry.last_used, 1), "leases": entry.leases}
+                for entry in list(self._entries.values())]
+
+    async def _close_all(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while any(entry.leases for entry in self._entries.values()) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)        # Let in-flight extractions finish
+        self._reaper.cancel()       # The loop stops next; a pending reaper would be destroyed with it
+        for entry in list(self._entries.values()):
+            self._retire(entry)
+            await self._close(entry)
+
+    def shutdown(self, timeout: float = 10) -> None:
+        # Close every pooled client and stop the loop; registered with atexit
+        with self._start_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(timeout), loop).result(timeout + 5)
+        except Exception as e:
+            logger.warning(f"Client registry shutdown incomplete: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        if not self._thread.is_alive():
+            loop.close()
+        logger.info("Client registry shut down")
+
+# Process-wide registry shared by the extraction routes and background jobs
+client_registry = ClientRegistry(**get_client_registry_settings())
@@ -0,0 +1,54 @@
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+class Row:
+    """
+    Read-only result row: the driver's value tuple plus a column -> index map shared by every row of
+    the same result, so a query costs one map instead of one dict per row.
+    Reads like asyncpg.Record (row["name"], row[0], get, keys, values, items, dict(row)), which lets
+    the extractors treat rows from every client the same way.
+    """
+    __slots__ = ("_values", "_columns")
+
+    def __init__(self, values: Tuple[Any, ...], columns: Dict[str, int]):
+        self._values = values
+        self._columns = columns
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, str):
+            return self._values[self._columns[key]]
+        return self._values[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = self._columns.get(key)
+        return default if index is None else self._values[index]
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def values(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self._columns, self._values)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._columns
+
+    def __iter__(self) -> Iterator[Any]:       # Values, as asyncpg.Record does
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Row):
+            return self._values == other._values and list(self._columns) == list(other._columns)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return "<Row " + " ".join(f"{key}={value!r}" for key, value in self.items()) + ">"
+
+def cursor_rows(description: Sequence[Sequence[Any]], values: List[Tuple[Any, ...]]) -> List[Row]:
+    # Column names are lower-cased once per result, matching the aliases used in the catalog queries
+    columns = {column[0].lower(): index for index, column in enumerate(description)}
+    return [Row(row, columns) for row in values]
@@ -22,11 +22,19 @@ from flask import Flask
 from src.utils.logger import get_logger
 from src.routes.database import register_database_routes
 from src.routes.excel import register_excel_route
+from src.routes.cache import register_cache_routes
+from src.routes.jobs import register_job_routes
+from src.routes.metrics import register_metrics_routes
+from src.routes.sources import register_source_routes
 app = Flask(__name__)
 logger = get_logger(__name__)
 # Register routes
 register_database_routes(app)
 register_excel_route(app)
+register_cache_routes(app)
+register_job_routes(app)
+register_metrics_routes(app)
+register_source_routes(app)
 if __name__ == "__main__":
     logger.info("Starting metadata extractor application")
     app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -0,0 +1,22 @@
+from flask import jsonify, request
+from src.utils.cache import result_cache
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def register_cache_routes(app):
+    @app.route('/cache/stats', methods=['GET'])
+    def cache_stats():
+        return jsonify(result_cache.stats()), 200
+
+    @app.route('/cache/invalidate', methods=['POST'])
+    def cache_invalidate():
+        try:
+            data = request.get_json(silent=True) or {}
+            connection_qualified_name = data.get("connection_qualified_name")       # Omit to clear the whole cache
+            removed = result_cache.invalidate(connection_qualified_name)
+            logger.info(f"Invalidated {removed} cache entries for {connection_qualified_name or 'all connections'}")
+            return jsonify({"invalidated": removed}), 200
+        except Exception as e:
+            logger.error(f"Error in cache_invalidate: {str(e)}")
+            return jsonify({"error": str(e)}), 500
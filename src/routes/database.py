@@ -1,12 +1,22 @@
 from flask import jsonify, request
-from src.clients.postgres import PostgresClient
-from src.clients.mysql import MySQLClient
-from src.clients.oracle import OracleClient
+from src.clients.registry import client_registry
 from src.transformers.atlas import GenericAtlasTransformer
-from src.utils.config import get_db_credentials
+from src.utils.cache import ResultCache, cache_key, populate_cache, replay_events, result_cache
+from src.utils.checkpoint import ExtractionCheckpoint, checkpoint_run_id
+from src.utils.config import get_cached_db_credentials, get_checkpoint_path, get_export_dir, get_profiling_settings, get_retry_settings, get_signal_settings, get_snapshot_path
+from src.utils.export import EXPORT_FORMATS, HAS_PYARROW, export_directory, export_events_async
 from src.utils.logger import get_logger
+from src.utils.metrics import collect_timings, register_query_kind
+from src.utils.scheduler import QueryScheduler
+from src.utils.serialization import dumps, json_response, stream_response
+from src.utils.snapshot import CatalogSnapshot, entity_hash
+from src.utils.streaming import STREAM_FORMATS, Event, append_event, flatten_table, iterate_async
 import asyncio
-from typing import Any, Dict, List
+import hashlib
+import importlib
+import json
+import re
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 logger = get_logger(__name__)
 
@@ -44,7 +54,7 @@ QUERIES = {
         "oracle": """
             SELECT table_name, comments AS description
             FROM all_tab_comments
-            WHERE owner = %s AND table_type = 'TABLE'
+            WHERE owner = :1 AND table_type = 'TABLE'
         """
     },
     "column": {
@@ -60,14 +70,18 @@ QUERIES = {
             WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
         """,
         "oracle": """
-            SELECT column_name, data_type, nullable AS is_nullable, column_id AS ordinal_position, comments AS description
-            FROM all_col_comments
-            WHERE owner = %s AND table_name = %s
+            SELECT c.column_name, c.data_type, c.nullable AS is_nullable, c.column_id AS ordinal_position, cc.comments AS description
+            FROM all_tab_columns c
+            LEFT JOIN all_col_comments cc
+            ON c.owner = cc.owner
+            AND c.table_name = cc.table_name
+            AND c.column_name = cc.column_name
+            WHERE c.owner = :1 AND c.table_name = :2
         """
     },
     "constraint": {
         "postgresql": """
-            SELECT tc.constraint_name, tc.constraint_type, kcu.column_name
+            SELECT tc.constraint_name, tc.constraint_type, kcu.column_name, kcu.ordinal_position AS key_position
             FROM information_schema.table_constraints tc
             LEFT JOIN information_schema.key_column_usage kcu
             ON tc.constraint_name = kcu.constraint_name
@@ -76,7 +90,7 @@ QUERIES = {
             WHERE tc.table_schema = $1 AND tc.table_name = $2
         """,
         "mysql": """
-            SELECT tc.CONSTRAINT_NAME AS constraint_name, tc.CONSTRAINT_TYPE AS constraint_type, kcu.COLUMN_NAME AS column_name
+            SELECT tc.CONSTRAINT_NAME AS constraint_name, tc.CONSTRAINT_TYPE AS constraint_type, kcu.COLUMN_NAME AS column_name, kcu.ORDINAL_POSITION AS key_position
             FROM information_schema.TABLE_CONSTRAINTS tc
             LEFT JOIN information_schema.KEY_COLUMN_USAGE kcu
             ON tc.CONSTRAINT_NAME = kcu.CONSTRAINT_NAME
@@ -85,105 +99,777 @@ QUERIES = {
             WHERE tc.TABLE_SCHEMA = %s AND tc.TABLE_NAME = %s
         """,
         "oracle": """
-            SELECT c.constraint_name, c.constraint_type, cc.column_name
+            SELECT c.constraint_name, c.constraint_type, cc.column_name, cc.position AS key_position
             FROM all_constraints c
             LEFT JOIN all_cons_columns cc
             ON c.constraint_name = cc.constraint_name
             AND c.owner = cc.owner
-            WHERE c.owner = %s AND c.table_name = %s
+            WHERE c.owner = :1 AND c.table_name = :2
         """
     }
 }
 
-async def fetch_db_metadata(client, credentials: Dict[str, Any], connection_qualified_name: str, db_type: str) -> List[Dict[str, Any]]:
-    await client.connect(credentials)
+# Set-based variants of the table/column/constraint queries used by bulk extraction.
+# Each returns rows for every non-system schema in one round-trip, keyed by schema_name/table_name.
+BULK_QUERIES = {
+    "table": {
+        "postgresql": """
+            SELECT t.table_schema AS schema_name, t.table_name, obj_description(to_regclass(t.table_schema || '.' || t.table_name)::oid, 'pg_class') AS description
+            FROM information_schema.tables t
+            WHERE t.table_schema NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+        """,
+        "mysql": """
+            SELECT TABLE_SCHEMA AS schema_name, TABLE_NAME AS table_name, TABLE_COMMENT AS description
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
+        """,
+        "oracle": """
+            SELECT owner AS schema_name, table_name, comments AS description
+            FROM all_tab_comments
+            WHERE owner NOT IN ('SYS', 'SYSTEM', 'PUBLIC') AND table_type = 'TABLE'
+        """
+    },
+    "column": {
+        "postgresql": """
+            SELECT c.table_schema AS schema_name, c.table_name, c.column_name, c.data_type, c.is_nullable, c.ordinal_position,
+                   col_description(to_regclass(c.table_schema || '.' || c.table_name)::oid, c.ordinal_position) AS description
+            FROM information_schema.columns c
+            WHERE c.table_schema NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+        """,
+        "mysql": """
+            SELECT TABLE_SCHEMA AS schema_name, TABLE_NAME AS table_name, COLUMN_NAME AS column_name, DATA_TYPE AS data_type, IS_NULLABLE AS is_nullable, ORDINAL_POSITION AS ordinal_position, COLUMN_COMMENT AS description
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
+        """,
+        "oracle": """
+            SELECT c.owner AS schema_name, c.table_name, c.column_name, c.data_type, c.nullable AS is_nullable, c.column_id AS ordinal_position, cc.comments AS description
+            FROM all_tab_columns c
+            LEFT JOIN all_col_comments cc
+            ON c.owner = cc.owner
+            AND c.table_name = cc.table_name
+            AND c.column_name = cc.column_name
+            WHERE c.owner NOT IN ('SYS', 'SYSTEM', 'PUBLIC')
+        """
+    },
+    "constraint": {
+        "postgresql": """
+            SELECT tc.table_schema AS schema_name, tc.table_name, tc.constraint_name, tc.constraint_type, kcu.column_name, kcu.ordinal_position AS key_position
+            FROM information_schema.table_constraints tc
+            LEFT JOIN information_schema.key_column_usage kcu
+            ON tc.constraint_name = kcu.constraint_name
+            AND tc.table_schema = kcu.table_schema
+            AND tc.table_name = kcu.table_name
+            WHERE tc.table_schema NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+        """,
+        "mysql": """
+            SELECT tc.TABLE_SCHEMA AS schema_name, tc.TABLE_NAME AS table_name, tc.CONSTRAINT_NAME AS constraint_name, tc.CONSTRAINT_TYPE AS constraint_type, kcu.COLUMN_NAME AS column_name, kcu.ORDINAL_POSITION AS key_position
+            FROM information_schema.TABLE_CONSTRAINTS tc
+            LEFT JOIN information_schema.KEY_COLUMN_USAGE kcu
+            ON tc.CONSTRAINT_NAME = kcu.CONSTRAINT_NAME
+            AND tc.TABLE_SCHEMA = kcu.TABLE_SCHEMA
+            AND tc.TABLE_NAME = kcu.TABLE_NAME
+            WHERE tc.TABLE_SCHEMA NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
+        """,
+        "oracle": """
+            SELECT c.owner AS schema_name, c.table_name, c.constraint_name, c.constraint_type, cc.column_name, cc.position AS key_position
+            FROM all_constraints c
+            LEFT JOIN all_cons_columns cc
+            ON c.constraint_name = cc.constraint_name
+            AND c.owner = cc.owner
+            WHERE c.owner NOT IN ('SYS', 'SYSTEM', 'PUBLIC')
+        """
+    }
+}
+
+# Cheap per-table change signals for incremental extraction; a table is re-queried only when its signal changes.
+# Postgres: xmin of the catalog rows describing the table, its columns, comments and constraints (any DDL rewrites them).
+# MySQL: checksums of the table's COLUMNS and constraint rows, read from the data dictionary; UPDATE_TIME is left out
+# because it tracks data changes and is held back by information_schema_stats_expiry (`signal` is a reserved word there).
+SIGNAL_QUERIES = {
+    "postgresql": """
+        SELECT n.nspname AS schema_name, c.relname AS table_name,
+               md5(concat_ws(':', c.xmin::text, c.relnatts,
+                   (SELECT string_agg(a.xmin::text, ',' ORDER BY a.attnum) FROM pg_attribute a WHERE a.attrelid = c.oid),
+                   (SELECT string_agg(d.xmin::text, ',' ORDER BY d.objsubid) FROM pg_description d WHERE d.objoid = c.oid),
+                   (SELECT string_agg(k.xmin::text, ',' ORDER BY k.conname) FROM pg_constraint k WHERE k.conrelid = c.oid))) AS signal
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'v', 'f', 'p')
+        AND n.nspname NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+    """,
+    "mysql": """
+        SELECT t.TABLE_SCHEMA AS schema_name, t.TABLE_NAME AS table_name,
+               CONCAT_WS(':', t.CREATE_TIME, t.UPDATE_TIME, MD5(t.TABLE_COMMENT)) AS `signal`
+        FROM information_schema.TABLES t
+        WHERE t.TABLE_SCHEMA NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
+    """,
+    "oracle": """
+        SELECT owner AS schema_name, object_name AS table_name,
+               TO_CHAR(last_ddl_time, 'YYYY-MM-DD HH24:MI:SS') AS signal
+        FROM all_objects
+        WHERE object_type = 'TABLE' AND owner NOT IN ('SYS', 'SYSTEM', 'PUBLIC')
+    """
+}
+
+# Opt-in signals (SIGNAL_CHECKSUMS=true) that also see changes the default ones miss, such as MySQL columns added or
+# altered in place (ALGORITHM=INSTANT) without touching the table's timestamps. They checksum every column and key,
+# so each check scans information_schema.COLUMNS and KEY_COLUMN_USAGE, which costs close to a bulk extraction.
+CHECKSUM_SIGNAL_QUERIES = {
+    "mysql": """
+        SELECT t.TABLE_SCHEMA AS schema_name, t.TABLE_NAME AS table_name,
+               CONCAT_WS(':', t.CREATE_TIME, MD5(t.TABLE_COMMENT), c.column_count, c.column_checksum, k.key_checksum) AS `signal`
+        FROM information_schema.TABLES t
+        LEFT JOIN (
+            SELECT TABLE_SCHEMA, TABLE_NAME, COUNT(*) AS column_count,
+                   SUM(CRC32(CONCAT_WS(':', ORDINAL_POSITION, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_COMMENT))) AS column_checksum
+            FROM information_schema.COLUMNS
+            GROUP BY TABLE_SCHEMA, TABLE_NAME
+        ) c ON c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME
+        LEFT JOIN (
+            SELECT tc.TABLE_SCHEMA, tc.TABLE_NAME,
+                   SUM(CRC32(CONCAT_WS(':', tc.CONSTRAINT_NAME, tc.CONSTRAINT_TYPE, kcu.COLUMN_NAME, kcu.ORDINAL_POSITION))) AS key_checksum
+            FROM information_schema.TABLE_CONSTRAINTS tc
+            LEFT JOIN information_schema.KEY_COLUMN_USAGE kcu
+                ON kcu.CONSTRAINT_SCHEMA = tc.CONSTRAINT_SCHEMA AND kcu.CONSTRAINT_NAME = tc.CONSTRAINT_NAME
+                AND kcu.TABLE_SCHEMA = tc.TABLE_SCHEMA AND kcu.TABLE_NAME = tc.TABLE_NAME
+            GROUP BY tc.TABLE_SCHEMA, tc.TABLE_NAME
+        ) k ON k.TABLE_SCHEMA = t.TABLE_SCHEMA AND k.TABLE_NAME = t.TABLE_NAME
+        WHERE t.TABLE_SCHEMA NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
+    """,
+}
+
+def signal_query(db_type: str) -> str:
+    if get_signal_settings()["checksums"] and db_type in CHECKSUM_SIGNAL_QUERIES:
+        return CHECKSUM_SIGNAL_QUERIES[db_type]
+    return SIGNAL_QUERIES[db_type]
+
+# Selective extraction: catalog columns each query filters on, per dialect. Patterns are bound as query
+# parameters after the query's own; object types are expanded from OBJECT_TYPES into `type` ("{types}").
+# Where a query already restricts the object type (`default_type`), that predicate is replaced.
+SELECTION_COLUMNS = {
+    "schema": {
+        "postgresql": {"schema": "s.schema_name"},
+        "mysql": {"schema": "SCHEMA_NAME"},
+        "oracle": {"schema": "username"},
+    },
+    "table": {
+        "postgresql": {"table": "t.table_name", "type": "t.table_type IN ({types})"},
+        "mysql": {"table": "TABLE_NAME", "type": "TABLE_TYPE IN ({types})"},
+        "oracle": {"table": "table_name", "type": "table_type IN ({types})", "default_type": "table_type = 'TABLE'"},
+    },
+    "bulk_table": {
+        "postgresql": {"schema": "t.table_schema", "table": "t.table_name", "type": "t.table_type IN ({types})"},
+        "mysql": {"schema": "TABLE_SCHEMA", "table": "TABLE_NAME", "type": "TABLE_TYPE IN ({types})"},
+        "oracle": {"schema": "owner", "table": "table_name", "type": "table_type IN ({types})", "default_type": "table_type = 'TABLE'"},
+    },
+    "bulk_column": {
+        "postgresql": {"schema": "c.table_schema", "table": "c.table_name",
+                       "type": "EXISTS (SELECT 1 FROM information_schema.tables o WHERE o.table_schema = c.table_schema AND o.table_name = c.table_name AND o.table_type IN ({types}))"},
+        "mysql": {"schema": "TABLE_SCHEMA", "table": "TABLE_NAME",
+                  "type": "EXISTS (SELECT 1 FROM information_schema.TABLES o WHERE o.TABLE_SCHEMA = COLUMNS.TABLE_SCHEMA AND o.TABLE_NAME = COLUMNS.TABLE_NAME AND o.TABLE_TYPE IN ({types}))"},
+        "oracle": {"schema": "c.owner", "table": "c.table_name",
+                   "type": "EXISTS (SELECT 1 FROM all_tab_comments o WHERE o.owner = c.owner AND o.table_name = c.table_name AND o.table_type IN ({types}))"},
+    },
+    "bulk_constraint": {
+        "postgresql": {"schema": "tc.table_schema", "table": "tc.table_name",
+                       "type": "EXISTS (SELECT 1 FROM information_schema.tables o WHERE o.table_schema = tc.table_schema AND o.table_name = tc.table_name AND o.table_type IN ({types}))"},
+        "mysql": {"schema": "tc.TABLE_SCHEMA", "table": "tc.TABLE_NAME",
+                  "type": "EXISTS (SELECT 1 FROM information_schema.TABLES o WHERE o.TABLE_SCHEMA = tc.TABLE_SCHEMA AND o.TABLE_NAME = tc.TABLE_NAME AND o.TABLE_TYPE IN ({types}))"},
+        "oracle": {"schema": "c.owner", "table": "c.table_name",
+                   "type": "EXISTS (SELECT 1 FROM all_tab_comments o WHERE o.owner = c.owner AND o.table_name = c.table_name AND o.table_type IN ({types}))"},
+    },
+    "signal": {
+        "postgresql": {"schema": "n.nspname", "table": "c.relname", "type": "c.relkind IN ({types})", "types": {"table": ["r", "p", "f"], "view": ["v"]}},
+        "mysql": {"schema": "t.TABLE_SCHEMA", "table": "t.TABLE_NAME", "type": "t.TABLE_TYPE IN ({types})"},
+        "oracle": {"schema": "owner", "table": "object_name", "type": "object_type IN ({types})", "default_type": "object_type = 'TABLE'"},
+    },
+}
+
+OBJECT_TYPES = {
+    "postgresql": {"table": ["BASE TABLE", "FOREIGN"], "view": ["VIEW"]},
+    "mysql": {"table": ["BASE TABLE"], "view": ["VIEW", "SYSTEM VIEW"]},
+    "oracle": {"table": ["TABLE"], "view": ["VIEW"]},
+}
+
+PLACEHOLDERS = {"postgresql": lambda n: f"${n}", "mysql": lambda n: "%s", "oracle": lambda n: f":{n}"}
+PATTERN_MATCH = {
+    "like": {"postgresql": "{column} LIKE {value}", "mysql": "{column} LIKE {value}", "oracle": "{column} LIKE {value}"},
+    "regex": {"postgresql": "{column} ~ {value}", "mysql": "{column} REGEXP {value}", "oracle": "REGEXP_LIKE({column}, {value})"},
+}
+
+# Extraction depth, outermost first; entities below max_depth are never queried
+DEPTHS = ("schema", "table", "column", "constraint")
+
+def selective_query(kind: str, db_type: str, selection: Optional[Dict[str, Any]], *args: Any) -> Tuple[Any, ...]:
+    """
+    (query, *args) for `kind` ("schema", "table", "column", "constraint", "bulk_<kind>" or "signal") with the
+    selection's patterns and object types added to its WHERE clause, ready for client.execute_query.
+    Without a selection the shared query text is returned unchanged.
+    """
+    if kind == "signal":
+        query = signal_query(db_type)
+    elif kind.startswith("bulk_"):
+        query = BULK_QUERIES[kind[5:]][db_type]
+    else:
+        query = QUERIES[kind][db_type]
+    columns = SELECTION_COLUMNS.get(kind, {}).get(db_type)
+    if not selection or not columns:
+        return (query, *args)
+    params = list(args)
+    predicates = []
+
+    def match(column: str, pattern: str) -> str:
+        params.append(pattern)
+        return PATTERN_MATCH[selection["pattern_type"]][db_type].format(column=column, value=PLACEHOLDERS[db_type](len(params)))
+
+    for level in ("schema", "table"):
+        column = columns.get(level)
+        if not column:
+            continue
+        if selection[f"include_{level}s"]:
+            predicates.append("(" + " OR ".join(match(column, pattern) for pattern in selection[f"include_{level}s"]) + ")")
+        predicates.extend("NOT " + match(column, pattern) for pattern in selection[f"exclude_{level}s"])
+    if selection["object_types"] and "type" in columns:
+        type_values = columns.get("types", OBJECT_TYPES[db_type])
+        types = ", ".join(f"'{value}'" for object_type in selection["object_types"] for value in type_values[object_type])
+        predicate = columns["type"].format(types=types)
+        if columns.get("default_type") and columns["default_type"] in query:
+            query = query.replace(columns["default_type"], predicate)
+        else:
+            predicates.append(predicate)
+    if predicates:
+        indent = re.search(r"\n([ \t]*)WHERE", query).group(1)
+        query = query.rstrip() + "".join(f"\n{indent}AND {predicate}" for predicate in predicates) + query[len(query.rstrip()):]
+    register_query_kind(query, kind)
+    return (query, *params)
+
+def _includes(selection: Optional[Dict[str, Any]], depth: str) -> bool:
+    return selection is None or DEPTHS.index(depth) <= DEPTHS.index(selection["max_depth"])
+
+for kind, queries in QUERIES.items():       # Label the query latency metrics by kind
+    for query in queries.values():
+        register_query_kind(query, kind)
+for kind, queries in BULK_QUERIES.items():
+    for query in queries.values():
+        register_query_kind(query, f"bulk_{kind}")
+for query in [*SIGNAL_QUERIES.values(), *CHECKSUM_SIGNAL_QUERIES.values()]:
+    register_query_kind(query, "signal")
+
+def _database_name(credentials: Dict[str, Any]) -> str:
+    return credentials.get("database", credentials.get("service_name", ""))
+
+def _group_by_table(rows: List[Any]) -> Dict[Tuple[str, str], List[Any]]:
+    # Hash rows of a bulk query on (schema_name, table_name), keeping the catalog order within each table
+    grouped = {}
+    for row in rows:
+        grouped.setdefault((row["schema_name"], row["table_name"]), []).append(row)
+    return grouped
+
+def _position(value: Any) -> Tuple[bool, int]:
+    # Sort key for ordinal/key positions; rows without one go last
+    return value is None, value or 0
+
+def build_constraint_index(constraints: List[Any]) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Collapse constraint rows (one per key column) into one entry per constraint name, with its key columns
+    in key order, and index those entries by column name. Returns (table constraints, constraints by column).
+    """
+    by_name = {}
+    key_columns = {}
+    for cons_row in constraints:
+        name = cons_row["constraint_name"]
+        if name not in by_name:
+            by_name[name] = {"constraint_name": name, "constraint_type": cons_row["constraint_type"], "columns": []}
+            key_columns[name] = {}
+        if cons_row["column_name"] is not None:
+            key_columns[name].setdefault(cons_row["column_name"], cons_row["key_position"])
+
+    by_column = {}
+    for name, entry in by_name.items():
+        positions = key_columns[name]
+        entry["columns"] = sorted(positions, key=lambda column: _position(positions[column]))
+        for column in entry["columns"]:
+            by_column.setdefault(column, []).append(entry)
+    return list(by_name.values()), by_column
+
+def build_schema_entity(transformer: GenericAtlasTransformer, schema_row: Any, credentials: Dict[str, Any], connection_qualified_name: str) -> Optional[Dict[str, Any]]:
+    schema_data = {
+        "schema_name": schema_row["schema_name"],
+        "database_name": _database_name(credentials),
+        "connection_qualified_name": connection_qualified_name,
+        "description": schema_row["description"] or "",
+        "tags": []
+    }
+    schema_entity = transformer.transform_row("SCHEMA", schema_data)
+    if schema_entity:
+        schema_entity["tables"] = []
+    return schema_entity
+
+def build_table_entity(transformer: GenericAtlasTransformer, schema_name: str, table_row: Any, columns: List[Any], constraints: List[Any],
+                       credentials: Dict[str, Any], connection_qualified_name: str) -> Optional[Dict[str, Any]]:
+    table_data = {
+        "table_name": table_row["table_name"],
+        "schema_name": schema_name,
+        "database_name": _database_name(credentials),
+        "connection_qualified_name": connection_qualified_name,
+        "description": table_row["description"] or "",
+        "tags": []
+    }
+    table_entity = transformer.transform_row("TABLE", table_data)
+    if not table_entity:
+        return None
+    # Catalog views return rows in no guaranteed order, so columns and constraints are ordered here rather than in SQL;
+    # this keeps the per-table, bulk and incremental paths identical (and leaves selective_query's WHERE appends alone)
+    columns = sorted(columns, key=lambda col_row: _position(col_row["ordinal_position"]))
+    constraints = sorted(constraints, key=lambda cons_row: (cons_row["constraint_name"], _position(cons_row["key_position"])))
+    table_constraints, constraints_by_column = build_constraint_index(constraints)
+    col_constraints = [constraints_by_column.get(col_row["column_name"], []) for col_row in columns]
+    col_entities = transformer.transform_batch("COLUMN", {      # one pass over the table's columns; scalars apply to every column
+        "column_name": [col_row["column_name"] for col_row in columns],
+        "schema_name": schema_name,
+        "table_name": table_row["table_name"],
+        "database_name": _database_name(credentials),
+        "connection_qualified_name": connection_qualified_name,
+        "data_type": [col_row["data_type"] for col_row in columns],
+        "is_nullable": [col_row["is_nullable"] for col_row in columns],
+        "ordinal_position": [col_row["ordinal_position"] for col_row in columns],
+        "description": [col_row["description"] or "" for col_row in columns],
+        "constraint_type": [cons[0]["constraint_type"] if cons else "" for cons in col_constraints],
+        "constraint_types": [list(dict.fromkeys(entry["constraint_type"] for entry in cons)) for cons in col_constraints],
+        "constraints": col_constraints
+    })
+    table_entity["columns"] = [col_entity for col_entity in col_entities if col_entity]
+    table_entity["constraints"] = table_constraints
+    return table_entity
+
+async def _no_rows() -> List[Any]:
+    return []
+
+async def _iter_per_table(client, scheduler: QueryScheduler, transformer: GenericAtlasTransformer, schemas: List[Any],
+                          credentials: Dict[str, Any], connection_qualified_name: str, db_type: str,
+                          selection: Optional[Dict[str, Any]] = None, checkpoint: Optional[ExtractionCheckpoint] = None) -> AsyncIterator[Event]:
+    async def load_tables(schema_row):      # fetch tables for the schema
+        if not _includes(selection, "table"):
+            return schema_row, []
+        return schema_row, await scheduler.retrying(
+            f"Tables of {schema_row['schema_name']}", scheduler.run, client.execute_query,
+            *selective_query("table", db_type, selection, schema_row["schema_name"]))
+
+    async def load_table(item):     # fetch columns and constraints for the table, down to the selected depth
+        schema_name, table_row = item
+        if checkpoint is not None:      # Completed by the run being resumed
+            stored = await checkpoint.table(f"{connection_qualified_name}/{schema_name}/{table_row['table_name']}")
+            if stored is not None:
+                return stored
+        return await scheduler.retrying(f"Table {schema_name}.{table_row['table_name']}", query_table, schema_name, table_row)
+
+    async def query_table(schema_name, table_row):
+        columns, constraints = await asyncio.gather(
+            scheduler.run(client.execute_query, QUERIES["column"][db_type], schema_name, table_row["table_name"])
+            if _includes(selection, "column") else _no_rows(),
+            scheduler.run(client.execute_query, QUERIES["constraint"][db_type], schema_name, table_row["table_name"])
+            if _includes(selection, "constraint") else _no_rows()
+        )
+        return build_table_entity(transformer, schema_name, table_row, columns, constraints, credentials, connection_qualified_name)
+
+    async for schema_row, tables in scheduler.map(load_tables, schemas):
+        schema_entity = build_schema_entity(transformer, schema_row, credentials, connection_qualified_name)
+        if schema_entity:
+            yield "SCHEMA", schema_entity
+            async for table_entity in scheduler.map(load_table, [(schema_row["schema_name"], table_row) for table_row in tables]):
+                if table_entity:
+                    yield "TABLE", table_entity
+
+async def _iter_bulk(client, scheduler: QueryScheduler, transformer: GenericAtlasTransformer, schemas: List[Any],
+                     credentials: Dict[str, Any], connection_qualified_name: str, db_type: str,
+                     selection: Optional[Dict[str, Any]] = None) -> AsyncIterator[Event]:
+    # One round-trip per entity kind, then hash-join the rows back into the schema -> table -> column tree.
+    # The raw catalog rows are held in memory, but entities are still built and emitted one table at a time.
+    tables, columns, constraints = await asyncio.gather(*(
+        scheduler.retrying(f"Bulk {kind} query", scheduler.run, client.execute_query, *selective_query(f"bulk_{kind}", db_type, selection))
+        if _includes(selection, kind) else _no_rows()
+        for kind in ("table", "column", "constraint")
+    ))
+    logger.info(f"Bulk extraction loaded {len(tables)} tables for {db_type}")
+    columns = _group_by_table(columns)
+    constraints = _group_by_table(constraints)
+
+    tables_by_schema = {}
+    for table_row in tables:
+        tables_by_schema.setdefault(table_row["schema_name"], []).append(table_row)
+
+    for schema_row in schemas:
+        schema_entity = build_schema_entity(transformer, schema_row, credentials, connection_qualified_name)
+        if schema_entity:
+            yield "SCHEMA", schema_entity
+            for table_row in tables_by_schema.get(schema_row["schema_name"], []):
+                key = (schema_row["schema_name"], table_row["table_name"])
+                table_entity = build_table_entity(transformer, schema_row["schema_name"], table_row, columns.get(key, []),
+                                                  constraints.get(key, []), credentials, connection_qualified_name)
+                if table_entity:
+                    yield "TABLE", table_entity
+
+def _catalog_fingerprint(credentials: Dict[str, Any], schemas: List[Any], signals: List[Any]) -> str:
+    # Changes whenever a schema, or the change signal of any table, changes
+    catalog = [
+        [credentials.get("host"), credentials.get("port"), _database_name(credentials)],
+        sorted((row["schema_name"], row["description"] or "") for row in schemas),
+        sorted((row["schema_name"], row["table_name"], str(row["signal"])) for row in signals)
+    ]
+    return hashlib.sha256(json.dumps(catalog, default=str).encode("utf-8")).hexdigest()
+
+async def iter_db_metadata(client, credentials: Dict[str, Any], connection_qualified_name: str, db_type: str, bulk: bool = False,
+                           concurrency: int = 1, rate_limit: Optional[float] = None, cache: Optional[ResultCache] = None,
+                           selection: Optional[Dict[str, Any]] = None, profile: Optional[Dict[str, Any]] = None,
+                           retries: int = 0, retry_backoff: float = 1.0, checkpoint: bool = False, resume: bool = False,
+                           manage_connection: bool = True) -> AsyncIterator[Event]:
+    """
+    Stream ("SCHEMA", entity) / ("TABLE", entity) events as they are extracted, see src/utils/streaming.py.
+    With a cache, the result is keyed by a catalog fingerprint and replayed while the catalog is unchanged.
+    A selection (see parse_selection) is applied in the catalog queries themselves.
+    With profile budgets (see src/utils/profiling.py) each table's columns are profiled from a sample; profiles
+    reflect the data rather than the catalog, so profiled extractions bypass the cache.
+    Each table's queries (each set-based query in bulk mode) are retried up to `retries` times with exponential
+    backoff from `retry_backoff` seconds. With checkpoint, completed tables are recorded in CHECKPOINT_PATH as they
+    are extracted; with resume, an unfinished run of the same extraction continues and its recorded tables are
+    replayed without catalog queries (bulk mode repeats its set-based queries and records only).
+    With manage_connection=False the client is already connected (borrowed from the client registry) and left open.
+    """
+    if manage_connection:
+        await client.connect(credentials)
     transformer = GenericAtlasTransformer(connector_name=db_type.lower())
-    result = []
+    # Bounds in-flight catalog queries; rate_limit (queries/s) is shared by all extractions of the same connection
+    scheduler = QueryScheduler(concurrency=concurrency, rate_limit=rate_limit, source=connection_qualified_name,
+                               retries=retries, retry_backoff=retry_backoff)
+    if profile is not None:
+        cache = None
+    store = None
 
     try:
-        schemas = await client.execute_query(QUERIES["schema"][db_type])    # Fetch schemas
+        if cache is not None:
+            schemas, signals = await asyncio.gather(
+                scheduler.retrying("Schema query", scheduler.run, client.execute_query, *selective_query("schema", db_type, selection)),
+                scheduler.retrying("Signal query", scheduler.run, client.execute_query, *selective_query("signal", db_type, selection))
+            )
+            key = cache_key(connection_qualified_name, db_type, _catalog_fingerprint(credentials, schemas, signals),
+                            *([json.dumps(selection, sort_keys=True)] if selection else []))
+            cached = cache.get(key)
+            if cached is not None:
+                logger.info(f"Serving {db_type} metadata for {connection_qualified_name} from cache")
+                for event in replay_events(cached):
+                    yield event
+                return
+        else:
+            schemas = await scheduler.retrying("Schema query", scheduler.run, client.execute_query,
+                                               *selective_query("schema", db_type, selection))    # Fetch schemas
         if not schemas:
             logger.warning(f"No schemas found for {db_type}")
-            return result
+            return
+
+        if checkpoint or resume:
+            store = await ExtractionCheckpoint.open(get_checkpoint_path(), checkpoint_run_id(connection_qualified_name, db_type, selection, profile is not None))
+            await store.start(resume)
+        if bulk:        # set-based catalog queries instead of one round-trip per table
+            events = _iter_bulk(client, scheduler, transformer, schemas, credentials, connection_qualified_name, db_type, selection)
+        else:
+            events = _iter_per_table(client, scheduler, transformer, schemas, credentials, connection_qualified_name, db_type, selection, store)
+        if cache is not None:
+            events = populate_cache(cache, key, events)
+        if profile is not None:
+            from src.utils.profiling import profile_events      # pandas is only loaded for profiled extractions
+            events = profile_events(client, scheduler, events, db_type, profile)
+        if store is not None:
+            events = store.record(events)
+        async for event in events:
+            yield event
+    except Exception as e:
+        logger.error(f"Query execution failed for {db_type}: {str(e)}")
+        raise
+    finally:
+        if store is not None:
+            await store.close()
+        if manage_connection:
+            await client.close()
+
+async def fetch_db_metadata(client, credentials: Dict[str, Any], connection_qualified_name: str, db_type: str, **options: Any) -> List[Dict[str, Any]]:
+    result = []
+    async for typename, entity in iter_db_metadata(client, credentials, connection_qualified_name, db_type, **options):
+        append_event(result, typename, entity)
+    return result
+
+def _deleted_entity(typename: str, qualified_name: str) -> Dict[str, Any]:
+    return {"typeName": typename, "attributes": {"qualifiedName": qualified_name}, "status": "DELETED"}
+
+async def iter_db_changes(client, credentials: Dict[str, Any], connection_qualified_name: str, db_type: str, snapshot_path: str,
+                          concurrency: int = 1, rate_limit: Optional[float] = None, retries: int = 0, retry_backoff: float = 1.0,
+                          manage_connection: bool = True) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Incremental extraction: yield ("created" | "updated" | "deleted", flat entity) relative to the snapshot
+    of the previous run, re-querying columns and constraints only for tables whose change signal moved.
+    The snapshot is advanced only once the whole run has been consumed.
+    """
+    if manage_connection:
+        await client.connect(credentials)
+    transformer = GenericAtlasTransformer(connector_name=db_type.lower())
+    scheduler = QueryScheduler(concurrency=concurrency, rate_limit=rate_limit, source=connection_qualified_name,
+                               retries=retries, retry_backoff=retry_backoff)
+    snapshot = await CatalogSnapshot.open(snapshot_path, connection_qualified_name)
 
+    try:
+        schemas, signals = await asyncio.gather(
+            scheduler.retrying("Schema query", scheduler.run, client.execute_query, QUERIES["schema"][db_type]),
+            scheduler.retrying("Signal query", scheduler.run, client.execute_query, signal_query(db_type))
+        )
+
+        # Schemas are cheap to rebuild, compare them directly
+        previous_schemas = await snapshot.schema_hashes()
+        current_schemas = {}
         for schema_row in schemas:
-            schema_data = {
-                "schema_name": schema_row["schema_name"],
-                "database_name": credentials.get("database", credentials.get("service_name", "")),
-                "connection_qualified_name": connection_qualified_name,
-                "description": schema_row["description"] or "",
-                "tags": []
-            }
-            schema_entity = transformer.transform_row("SCHEMA", schema_data)
+            schema_entity = build_schema_entity(transformer, schema_row, credentials, connection_qualified_name)
             if schema_entity:
-                schema_entity["tables"] = []
-                result.append(schema_entity)
-
-                # fetch tables for the schema
-                tables = await client.execute_query(QUERIES["table"][db_type], schema_row["schema_name"])
-                for table_row in tables:
-                    table_data = {
-                        "table_name": table_row["table_name"],
-                        "schema_name": schema_row["schema_name"],
-                        "database_name": credentials.get("database", credentials.get("service_name", "")),
-                        "connection_qualified_name": connection_qualified_name,
-                        "description": table_row["description"] or "",
-                        "tags": []
-                    }
-                    table_entity = transformer.transform_row("TABLE", table_data)
-                    if table_entity:
-                        table_entity["columns"] = []
-                        table_entity["constraints"] = []
-                        schema_entity["tables"].append(table_entity)
-
-                        # fetch columns and constraints for the table
-                        columns = await client.execute_query(QUERIES["column"][db_type], schema_row["schema_name"], table_row["table_name"])
-                        constraints = await client.execute_query(QUERIES["constraint"][db_type], schema_row["schema_name"], table_row["table_name"])
-
-                        for col_row in columns:
-                            # Map constraints to the current column
-                            col_constraints = [cons["constraint_type"] for cons in constraints if cons["column_name"] == col_row["column_name"]]
-                            constraint_type = col_constraints[0] if col_constraints else ""
-                            col_data = {
-                                "column_name": col_row["column_name"],
-                                "schema_name": schema_row["schema_name"],
-                                "table_name": table_row["table_name"],
-                                "database_name": credentials.get("database", credentials.get("service_name", "")),
-                                "connection_qualified_name": connection_qualified_name,
-                                "data_type": col_row["data_type"],
-                                "is_nullable": col_row["is_nullable"],
-                                "ordinal_position": col_row["ordinal_position"],
-                                "description": col_row["description"] or "",
-                                "tags": [],
-                                "constraint_type": constraint_type
-                            }
-                            col_entity = transformer.transform_row("COLUMN", col_data)
-                            if col_entity:
-                                table_entity["columns"].append(col_entity)
-
-                        # Append constraints to table entity (deduplicated if needed)
-                        for cons_row in constraints:
-                            table_entity["constraints"].append({
-                                "constraint_name": cons_row["constraint_name"],
-                                "constraint_type": cons_row["constraint_type"]
-                            })
-
-        return result
+                schema_entity.pop("tables")
+                qualified_name = schema_entity["attributes"]["qualifiedName"]
+                current_schemas[qualified_name] = entity_hash(schema_entity)
+                if qualified_name not in previous_schemas:
+                    yield "created", schema_entity
+                elif previous_schemas[qualified_name] != current_schemas[qualified_name]:
+                    yield "updated", schema_entity
+        for qualified_name in previous_schemas.keys() - current_schemas.keys():
+            yield "deleted", _deleted_entity("SCHEMA", qualified_name)
+
+        # Tables: only those whose signal differs from the snapshot are extracted again
+        schema_names = {schema_row["schema_name"] for schema_row in schemas}
+        previous_signals = await snapshot.table_signals()
+        current_signals = {}
+        changed = {}
+        for row in signals:
+            if row["schema_name"] not in schema_names:
+                continue
+            table_qualified_name = f"{connection_qualified_name}/{row['schema_name']}/{row['table_name']}"
+            current_signals[table_qualified_name] = str(row["signal"])
+            if previous_signals.get(table_qualified_name) != current_signals[table_qualified_name]:
+                changed.setdefault(row["schema_name"], set()).add(row["table_name"])
+        logger.info(f"Incremental extraction: {sum(len(tables) for tables in changed.values())} of {len(current_signals)} tables changed for {db_type}")
+
+        async def load_tables(schema_name):
+            tables = await scheduler.retrying(f"Tables of {schema_name}", scheduler.run, client.execute_query, QUERIES["table"][db_type], schema_name)
+            return schema_name, [table_row for table_row in tables if table_row["table_name"] in changed[schema_name]]
+
+        async def query_table(schema_name, table_row):
+            columns, constraints = await asyncio.gather(
+                scheduler.run(client.execute_query, QUERIES["column"][db_type], schema_name, table_row["table_name"]),
+                scheduler.run(client.execute_query, QUERIES["constraint"][db_type], schema_name, table_row["table_name"])
+            )
+            return build_table_entity(transformer, schema_name, table_row, columns, constraints, credentials, connection_qualified_name)
+
+        async def load_table(item):
+            schema_name, table_row = item
+            return await scheduler.retrying(f"Table {schema_name}.{table_row['table_name']}", query_table, schema_name, table_row)
+
+        async for schema_name, tables in scheduler.map(load_tables, list(changed)):
+            async for table_entity in scheduler.map(load_table, [(schema_name, table_row) for table_row in tables]):
+                if not table_entity:
+                    continue
+                table_qualified_name = table_entity["attributes"]["qualifiedName"]
+                previous = await snapshot.table_entities(table_qualified_name)
+                current = []
+                for entity in flatten_table(table_entity, f"{connection_qualified_name}/{schema_name}"):
+                    qualified_name = entity["attributes"]["qualifiedName"]
+                    content_hash = entity_hash(entity)
+                    current.append((qualified_name, entity["typeName"], content_hash))
+                    if qualified_name not in previous:
+                        yield "created", entity
+                    elif previous[qualified_name][1] != content_hash:
+                        yield "updated", entity
+                current_names = {qualified_name for qualified_name, _, _ in current}
+                for qualified_name, (typename, _) in previous.items():
+                    if qualified_name not in current_names:
+                        yield "deleted", _deleted_entity(typename, qualified_name)
+                await snapshot.replace_table(table_qualified_name, current_signals[table_qualified_name], current)
+
+        for table_qualified_name in previous_signals.keys() - current_signals.keys():
+            for qualified_name, (typename, _) in (await snapshot.table_entities(table_qualified_name)).items():
+                yield "deleted", _deleted_entity(typename, qualified_name)
+            await snapshot.delete_table(table_qualified_name)
+
+        await snapshot.replace_schemas(current_schemas)
+        await snapshot.commit()
     except Exception as e:
-        logger.error(f"Query execution failed for {db_type}: {str(e)}")
+        logger.error(f"Incremental extraction failed for {db_type}: {str(e)}")
         raise
     finally:
-        await client.close()
+        await snapshot.close()
+        if manage_connection:
+            await client.close()
+
+def _client_factory(module: str, name: str) -> Callable[[], Any]:
+    # Imports the client module, and with it the driver, on first use
+    def create() -> Any:
+        return getattr(importlib.import_module(module), name)()
+    return create
+
+# Source name -> (client factory, credentials env prefix, default connection_qualified_name, db_type)
+DB_SOURCES: Dict[str, Tuple[Callable[[], Any], str, str, str]] = {
+    "postgres": (_client_factory("src.clients.postgres", "PostgresClient"), "PG", "default/postgresql", "postgresql"),
+    "mysql": (_client_factory("src.clients.mysql", "MySQLClient"), "MYSQL", "default/mysql", "mysql"),
+    "oracle": (_client_factory("src.clients.oracle", "OracleClient"), "ORACLE", "default/oracle", "oracle"),
+}
+
+def _patterns(value: Any) -> List[str]:
+    if not value:
+        return []
+    return [value] if isinstance(value, str) else [str(pattern) for pattern in value]
+
+def parse_selection(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Selective extraction fields of a request: include_schemas / exclude_schemas / include_tables /
+    exclude_tables (a pattern or a list), pattern_type ("like" or "regex"), object_types ("table", "view")
+    and max_depth (one of DEPTHS). Returns None when nothing is restricted. Raises ValueError on bad input.
+    """
+    selection = {
+        "include_schemas": _patterns(data.get("include_schemas")),
+        "exclude_schemas": _patterns(data.get("exclude_schemas")),
+        "include_tables": _patterns(data.get("include_tables")),
+        "exclude_tables": _patterns(data.get("exclude_tables")),
+        "pattern_type": data.get("pattern_type", "like"),
+        "object_types": sorted(set(_patterns(data.get("object_types")))),
+        "max_depth": data.get("max_depth", DEPTHS[-1]),
+    }
+    if selection["pattern_type"] not in PATTERN_MATCH:
+        raise ValueError(f"Unsupported pattern_type: {selection['pattern_type']}")
+    if selection["max_depth"] not in DEPTHS:
+        raise ValueError(f"Unsupported max_depth: {selection['max_depth']}, expected one of {', '.join(DEPTHS)}")
+    unknown = [object_type for object_type in selection["object_types"] if object_type not in ("table", "view")]
+    if unknown:
+        raise ValueError(f"Unsupported object_types: {', '.join(unknown)}")
+    if not any(selection[field] for field in ("include_schemas", "exclude_schemas", "include_tables", "exclude_tables", "object_types")) \
+            and selection["max_depth"] == DEPTHS[-1]:
+        return None
+    return selection
+
+def _number(data: Dict[str, Any], field: str, cast: Callable[[Any], Any], default: Any) -> Any:
+    # A numeric request field; a value that is not a number is a ValueError (a 400), never a TypeError
+    value = data.get(field, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{field} must be a number, got {value!r}")
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f"{field} must be {'an integer' if cast is int else 'a number'}, got {value!r}")
+
+def _extraction_options(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Optional request body fields forwarded to fetch_db_metadata
+    options = {
+        "bulk": bool(data.get("bulk", False)),
+        "concurrency": _number(data, "concurrency", int, 1),
+        "rate_limit": _number(data, "rate_limit", float, None) if data.get("rate_limit") else None,
+        "selection": parse_selection(data),
+        "profile": parse_profile(data),
+        **parse_recovery(data)
+    }
+    if options["concurrency"] < 1:
+        raise ValueError("concurrency must be at least 1")
+    if options["rate_limit"] is not None and options["rate_limit"] <= 0:
+        raise ValueError("rate_limit must be positive")
+    return options
+
+def parse_recovery(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Retry and checkpoint fields of a request; retries and retry_backoff default to EXTRACTION_RETRIES / RETRY_BACKOFF
+    settings = get_retry_settings()
+    recovery = {
+        "retries": _number(data, "retries", int, settings["retries"]),
+        "retry_backoff": _number(data, "retry_backoff", float, settings["backoff"]),
+        "checkpoint": bool(data.get("checkpoint", False)),
+        "resume": bool(data.get("resume", False)),
+    }
+    if recovery["retries"] < 0 or recovery["retry_backoff"] < 0:
+        raise ValueError("retries and retry_backoff must not be negative")
+    return recovery
+
+def parse_profile(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Profiling fields of a request; None unless "profile" is set. Budgets default to the PROFILE_* settings.
+    if not data.get("profile"):
+        return None
+    settings = get_profiling_settings()
+    profile = {
+        "rows": _number(data, "profile_rows", int, settings["rows"]),
+        "timeout": _number(data, "profile_timeout", float, settings["timeout"]),
+        "top_k": _number(data, "profile_top_k", int, settings["top_k"]),
+    }
+    if profile["rows"] <= 0 or profile["timeout"] <= 0 or profile["top_k"] < 0:
+        raise ValueError("profile_rows and profile_timeout must be positive and profile_top_k not negative")
+    return profile
+
+async def _collect_changes(changes: AsyncIterator[Tuple[str, Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    result = {"created": [], "updated": [], "deleted": []}
+    async for change, entity in changes:
+        result[change].append(entity)
+    return result
+
+async def _extract(client_factory: Callable[[], Any], env_prefix: str, default_connection: str, db_type: str):
+    data = request.get_json() or {}
+    credentials = get_cached_db_credentials(env_prefix)
+    connection_qualified_name = data.get("connection_qualified_name", default_connection)
+    try:
+        options = _extraction_options(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    output_format = data.get("format", "json")
+
+    # Extractions run on the registry loop with a pooled client, connected once per credential set
+    def borrowed(events):
+        return client_registry.borrowed_events(db_type, client_factory, credentials, events)
+
+    if data.get("incremental"):     # Only entities created, updated or deleted since the last snapshot
+        if options.pop("selection"):     # The snapshot covers the whole connection; a subset would read as deletions
+            return jsonify({"error": "Selective extraction is not supported with incremental extraction"}), 400
+        if options.pop("profile"):
+            return jsonify({"error": "Profiling is not supported with incremental extraction"}), 400
+        if options.pop("checkpoint") or options.pop("resume"):      # The snapshot already limits a rerun to changed tables
+            return jsonify({"error": "Checkpointing is not supported with incremental extraction"}), 400
+        options.pop("bulk")
+        changes = lambda: borrowed(lambda client: iter_db_changes(client, credentials, connection_qualified_name, db_type, get_snapshot_path(),
+                                                                  manage_connection=False, **options))
+        if output_format == "ndjson":
+            lines = ({**entity, "changeType": change} for change, entity in iterate_async(changes, loop=client_registry.loop))
+            return stream_response((dumps(line) + b"\n" for line in lines), "application/x-ndjson")
+        if output_format != "json":
+            return jsonify({"error": f"Unsupported format for incremental extraction: {output_format}"}), 400
+        with collect_timings() as timings:
+            result = await client_registry.call(_collect_changes(changes()))
+        return json_response(result, timings=timings if data.get("timings") else None)
+
+    events = lambda: borrowed(lambda client: iter_db_metadata(client, credentials, connection_qualified_name, db_type,
+                                                              manage_connection=False, **options))
+    if output_format in STREAM_FORMATS:     # Entities are encoded and sent as soon as each table is extracted
+        chunks, mimetype = STREAM_FORMATS[output_format]
+        return stream_response(chunks(iterate_async(events, loop=client_registry.loop)), mimetype)
+    if output_format in EXPORT_FORMATS:     # Flat Parquet/Arrow files, written one record batch at a time as tables arrive
+        if not HAS_PYARROW:
+            return jsonify({"error": "pyarrow is required for Parquet/Arrow export"}), 400
+        directory = export_directory(get_export_dir(), connection_qualified_name)
+        manifest = await client_registry.call(export_events_async(events(), directory, output_format))
+        return json_response({"export": manifest})
+    if output_format != "json":
+        return jsonify({"error": f"Unsupported format: {output_format}"}), 400
+
+    cache = result_cache if data.get("cache", False) else None     # Opt-in: validating an entry costs a full signal scan
+
+    async def fetch():
+        async with client_registry.lease(db_type, client_factory, credentials) as client:
+            return await fetch_db_metadata(client, credentials, connection_qualified_name, db_type, cache=cache,
+                                           manage_connection=False, **options)
+
+    with collect_timings() as timings:
+        metadata = await client_registry.call(fetch())
+    return json_response({"schemas": metadata}, timings=timings if data.get("timings") else None)
 
 def register_database_routes(app):
     @app.route('/extract_postgres', methods=['POST'])
     async def extract_postgres():
         try:
-            data = request.get_json() or {}
-            credentials = get_db_credentials("PG")
-            connection_qualified_name = data.get("connection_qualified_name", "default/postgresql")
-            metadata = await fetch_db_metadata(PostgresClient(), credentials, connection_qualified_name, "postgresql")
-            return jsonify({"schemas": metadata}), 200
+            client_factory, env_prefix, default_connection, db_type = DB_SOURCES["postgres"]
+            return await _extract(client_factory, env_prefix, default_connection, db_type)
         except Exception as e:
             logger.error(f"Error in extract_postgres: {str(e)}")
             return jsonify({"error": str(e)}), 500
@@ -191,11 +877,8 @@ def register_database_routes(app):
     @app.route('/extract_mysql', methods=['POST'])
     async def extract_mysql():
         try:
-            data = request.get_json() or {}
-            credentials = get_db_credentials("MYSQL")
-            connection_qualified_name = data.get("connection_qualified_name", "default/mysql")
-            metadata = await fetch_db_metadata(MySQLClient(), credentials, connection_qualified_name, "mysql")
-            return jsonify({"schemas": metadata}), 200
+            client_factory, env_prefix, default_connection, db_type = DB_SOURCES["mysql"]
+            return await _extract(client_factory, env_prefix, default_connection, db_type)
         except Exception as e:
             logger.error(f"Error in extract_mysql: {str(e)}")
             return jsonify({"error": str(e)}), 500
@@ -203,11 +886,8 @@ def register_database_routes(app):
     @app.route('/extract_oracle', methods=['POST'])
     async def extract_oracle():
         try:
-            data = request.get_json() or {}
-            credentials = get_db_credentials("ORACLE")
-            connection_qualified_name = data.get("connection_qualified_name", "default/oracle")
-            metadata = await fetch_db_metadata(OracleClient(), credentials, connection_qualified_name, "oracle")
-            return jsonify({"schemas": metadata}), 200
+            client_factory, env_prefix, default_connection, db_type = DB_SOURCES["oracle"]
+            return await _extract(client_factory, env_prefix, default_connection, db_type)
         except Exception as e:
             logger.error(f"Error in extract_oracle: {str(e)}")
-            return jsonify({"error": str(e)}), 500
\ No newline at end of file
+            return jsonify({"error": str(e)}), 500
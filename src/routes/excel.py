@@ -1,76 +1,220 @@
 from flask import jsonify, request
+from src.routes.database import _number
 from src.transformers.atlas import GenericAtlasTransformer
+from src.utils.cache import ResultCache, cache_key, cached_events, file_digest, result_cache
+from src.utils.config import get_excel_settings, get_export_dir
+from src.utils.export import EXPORT_FORMATS, HAS_PYARROW, export_directory, export_events
+from src.utils.inference import infer_column, split_header
 from src.utils.logger import get_logger
+from src.utils.metrics import collect_timings
+from src.utils.serialization import json_response, stream_response
+from src.utils.streaming import STREAM_FORMATS, Event, append_event
 import pandas as pd
+import glob
+import importlib.util
+import multiprocessing
+import multiprocessing.util
 import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional
 
 logger = get_logger(__name__)
 
-def fetch_excel_metadata(file_path: str, connection_qualified_name: str) -> list:
-    transformer = GenericAtlasTransformer(connector_name="excel")
-    result = []
+# Rows read per sheet for type inference; None reads the whole sheet
+DEFAULT_SAMPLE_ROWS = 1000
+# Leading text-only rows considered as a (multi-row) header
+MAX_HEADER_ROWS = get_excel_settings()["max_header_rows"]
+CANDIDATE_KEY = "CANDIDATE KEY"
+# calamine (Rust) opens large workbooks without parsing every shared string up front; fall back to openpyxl read-only mode
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
 
-    try:
-        xl = pd.ExcelFile(file_path)     # Load the Excel file
-        for sheet_name in xl.sheet_names:       # Process each sheet as a table
-            schema_data = {
+def _sheet_events(transformer: GenericAtlasTransformer, xl: pd.ExcelFile, sheet_name: str, database_name: str,
+                  connection_qualified_name: str, sample_rows: Optional[int]) -> Iterator[Event]:
+    schema_data = {
+        "schema_name": sheet_name,
+        "database_name": database_name,
+        "connection_qualified_name": connection_qualified_name,
+        "description": "",
+        "tags": []
+    }
+    schema_entity = transformer.transform_row("SCHEMA", schema_data)
+    if schema_entity:
+        schema_entity["tables"] = []
+        yield "SCHEMA", schema_entity
+
+        # Single pass over the sheet: header rows plus the first sample_rows data rows for type inference
+        raw = xl.parse(sheet_name, header=None, nrows=sample_rows + MAX_HEADER_ROWS if sample_rows else None)
+        column_names, df = split_header(raw, MAX_HEADER_ROWS)
+        if sample_rows:
+            df = df.iloc[:sample_rows]
+        inferred = [infer_column(df[column_name]) for column_name in column_names]
+        table_data = {          # Prepare table-level metadata (sheet treated as table)
+            "table_name": sheet_name,
+            "schema_name": sheet_name,
+            "database_name": database_name,
+            "connection_qualified_name": connection_qualified_name,
+            "description": "",
+            "tags": []
+        }
+        table_entity = transformer.transform_row("TABLE", table_data)
+        if table_entity:
+            # Columns whose sampled values are all present and distinct are reported as candidate keys
+            candidate_keys = [{"constraint_name": f"candidate_key_{column_name}", "constraint_type": CANDIDATE_KEY, "columns": [column_name]}
+                              if column["unique"] else None for column_name, column in zip(column_names, inferred)]
+            col_entities = transformer.transform_batch("COLUMN", {       # Prepare column-level metadata in one pass
+                "column_name": column_names,
                 "schema_name": sheet_name,
-                "database_name": os.path.basename(file_path),
+                "table_name": sheet_name,
+                "database_name": database_name,
                 "connection_qualified_name": connection_qualified_name,
+                "data_type": [column["data_type"] for column in inferred],
+                "is_nullable": [column["is_nullable"] for column in inferred],
+                "ordinal_position": list(range(1, len(column_names) + 1)),
                 "description": "",
-                "tags": []
-            }
-            schema_entity = transformer.transform_row("SCHEMA", schema_data)
-            if schema_entity:
-                schema_entity["tables"] = []
-                result.append(schema_entity)
-
-                df = pd.read_excel(file_path, sheet_name=sheet_name)        # Read the sheet into a DataFrame
-                table_data = {          # Prepare table-level metadata (sheet treated as table)
-                    "table_name": sheet_name,
-                    "schema_name": sheet_name,
-                    "database_name": os.path.basename(file_path),
-                    "connection_qualified_name": connection_qualified_name,
-                    "description": "",
-                    "tags": []
-                }
-                table_entity = transformer.transform_row("TABLE", table_data)
-                if table_entity:
-                    table_entity["columns"] = []
-                    table_entity["constraints"] = []
-                    schema_entity["tables"].append(table_entity)
-
-                    for col_name, dtype in df.dtypes.items():       # Prepare column-level metadata
-                        col_data = {
-                            "column_name": str(col_name),
-                            "schema_name": sheet_name,
-                            "table_name": sheet_name,
-                            "database_name": os.path.basename(file_path),
-                            "connection_qualified_name": connection_qualified_name,
-                            "data_type": str(dtype),
-                            "is_nullable": True,
-                            "ordinal_position": df.columns.get_loc(col_name) + 1,
-                            "description": "",
-                            "tags": [],
-                            "constraint_type": ""
-                        }
-                        col_entity = transformer.transform_row("COLUMN", col_data)
-                        if col_entity:
-                            table_entity["columns"].append(col_entity)
-
-        return result
+                "constraint_type": [CANDIDATE_KEY if key else "" for key in candidate_keys],
+                "constraint_types": [[CANDIDATE_KEY] if key else [] for key in candidate_keys],
+                "constraints": [[key] if key else [] for key in candidate_keys]
+            })
+            table_entity["columns"] = [col_entity for col_entity in col_entities if col_entity]
+            table_entity["constraints"] = [key for key in candidate_keys if key]
+            yield "TABLE", table_entity
+
+def iter_excel_metadata(file_path: str, connection_qualified_name: str, sample_rows: Optional[int] = DEFAULT_SAMPLE_ROWS) -> Iterator[Event]:
+    # Stream ("SCHEMA", entity) / ("TABLE", entity) events, one sheet at a time
+    transformer = GenericAtlasTransformer(connector_name="excel")
+
+    try:
+        with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as xl:     # Open the workbook once and reuse it for every sheet
+            for sheet_name in xl.sheet_names:       # Process each sheet as a table
+                yield from _sheet_events(transformer, xl, sheet_name, os.path.basename(file_path), connection_qualified_name, sample_rows)
     except Exception as e:
         logger.error(f"Excel metadata extraction failed: {str(e)}")
         raise
 
+def _extract_workbook(file_path: str, connection_qualified_name: str, sample_rows: Optional[int]) -> List[Event]:
+    # Process pool task: every sheet of one workbook, which the worker opens and parses once
+    return list(iter_excel_metadata(file_path, connection_qualified_name, sample_rows))
+
+def _available_cores() -> int:
+    # Cores this process may run on (honours container CPU pinning); sched_getaffinity only exists on Linux
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    # One pool per process, created on first use and sized to the available cores. Workers are spawned, not forked:
+    # forking the threaded server would copy locks held by other threads into the children.
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=_available_cores(), mp_context=multiprocessing.get_context("spawn"))
+        return _process_pool
+
+def _shutdown_process_pool() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+# Shut down at exit. A multiprocessing finalizer rather than atexit: a process that is itself a multiprocessing
+# child joins its children before atexit handlers run, and would wait forever on the idle workers. It must run
+# before the pool's own queues are closed (their finalizers use priority 10).
+multiprocessing.util.Finalize(None, _shutdown_process_pool, exitpriority=100)
+
+def iter_excel_batch_metadata(file_paths: List[str], connection_qualified_name: str, sample_rows: Optional[int] = DEFAULT_SAMPLE_ROWS,
+                              max_workers: Optional[int] = None) -> Iterator[Event]:
+    """
+    Extract many workbooks at once on the shared process pool, one workbook per task and at most max_workers
+    (default, and at most, the available cores) in flight. Events come back in file order, then sheet order,
+    exactly as if each workbook had been extracted in turn.
+    """
+    max_workers = max(1, max_workers or _available_cores())
+    pending = deque()
+    try:
+        logger.info(f"Extracting {len(file_paths)} workbooks on {min(max_workers, len(file_paths), _available_cores())} processes")
+        pool = _get_process_pool()
+        for file_path in file_paths:
+            pending.append(pool.submit(_extract_workbook, file_path, connection_qualified_name, sample_rows))
+            if len(pending) >= max_workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    except BrokenProcessPool as e:      # A worker died; the next batch starts a new pool
+        logger.error(f"Excel batch metadata extraction failed: {str(e)}")
+        _shutdown_process_pool()
+        raise
+    except Exception as e:
+        logger.error(f"Excel batch metadata extraction failed: {str(e)}")
+        raise
+    finally:
+        for future in pending:      # Early exit or failure: drop workbooks not started yet
+            future.cancel()
+
+def fetch_excel_metadata(file_path: str, connection_qualified_name: str, sample_rows: Optional[int] = DEFAULT_SAMPLE_ROWS,
+                         cache: Optional[ResultCache] = None) -> list:
+    result = []
+    events = iter_excel_metadata(file_path, connection_qualified_name, sample_rows)
+    if cache is not None:       # Keyed by workbook content, so re-uploads of the same file are served from the cache
+        events = cached_events(cache, cache_key(connection_qualified_name, "excel", file_digest(file_path), sample_rows), events)
+    for typename, entity in events:
+        append_event(result, typename, entity)
+    return result
+
+def fetch_excel_batch_metadata(file_paths: List[str], connection_qualified_name: str, sample_rows: Optional[int] = DEFAULT_SAMPLE_ROWS,
+                               max_workers: Optional[int] = None) -> list:
+    result = []
+    for typename, entity in iter_excel_batch_metadata(file_paths, connection_qualified_name, sample_rows, max_workers):
+        append_event(result, typename, entity)
+    return result
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+    else:
+        return
+    logger.info(f"Deleted temporary file: {path}")
+
+def _remove_after(events: Iterator[Event], path: str) -> Iterator[Event]:
+    # Keep uploaded workbooks until the streamed response has been fully produced
+    try:
+        yield from events
+    finally:
+        _remove(path)
+
+def _sample_rows(data: dict) -> Optional[int]:
+    # Raises ValueError (a 400) when sample_rows is not an integer
+    sample_rows = DEFAULT_SAMPLE_ROWS if data.get("sample_rows") in (None, "") else _number(data, "sample_rows", int, None)
+    return sample_rows if sample_rows > 0 else None     # 0 or a negative value reads every row
+
 def register_excel_route(app):
     @app.route('/extract_excel', methods=['POST'])
     async def extract_excel():
         try:
             data = request.form.to_dict()
             connection_qualified_name = data.get("connection_qualified_name", "default/excel")
+            output_format = data.get("format", "json")
+            try:
+                sample_rows = _sample_rows(data)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            if output_format != "json" and output_format not in STREAM_FORMATS and output_format not in EXPORT_FORMATS:
+                return jsonify({"error": f"Unsupported format: {output_format}"}), 400
+            if output_format in EXPORT_FORMATS and not HAS_PYARROW:
+                return jsonify({"error": "pyarrow is required for Parquet/Arrow export"}), 400
             file_path = None
-            if 'file' in request.files and request.files['file'].filename:      # Handle file upload
+            uploaded = 'file' in request.files and request.files['file'].filename
+            if uploaded:      # Handle file upload
                 file = request.files['file']
                 if not file.filename.endswith(('.xlsx', '.xls')):       # validate file type
                     return jsonify({"error": "Invalid file format, must be .xlsx or .xls"}), 400
@@ -87,11 +231,86 @@ def register_excel_route(app):
                     return jsonify({"error": "Invalid file format in EXCEL_FILE_PATH, must be .xlsx or .xls"}), 400
                 logger.info(f"Processing Excel file from .env: {file_path}")
 
-            metadata = fetch_excel_metadata(file_path, connection_qualified_name)       # Extract metadata from the Excel file
-            if 'file' in request.files and request.files['file'].filename and os.path.exists(file_path):
-                os.remove(file_path)        # Cleanup uploaded temp file
-                logger.info(f"Deleted temporary file: {file_path}")
-            return jsonify({"schemas": metadata}), 200
+            if output_format in STREAM_FORMATS:     # Entities are encoded and sent one sheet at a time
+                chunks, mimetype = STREAM_FORMATS[output_format]
+                events = iter_excel_metadata(file_path, connection_qualified_name, sample_rows)
+                if uploaded:
+                    events = _remove_after(events, file_path)
+                return stream_response(chunks(events), mimetype)
+            if output_format in EXPORT_FORMATS:     # Flat Parquet/Arrow files, written one record batch at a time
+                events = iter_excel_metadata(file_path, connection_qualified_name, sample_rows)
+                if uploaded:
+                    events = _remove_after(events, file_path)
+                manifest = export_events(events, export_directory(get_export_dir(), connection_qualified_name), output_format)
+                return json_response({"export": manifest})
+
+            cache = result_cache if data.get("cache", "false").lower() == "true" else None
+            with collect_timings() as timings:
+                metadata = fetch_excel_metadata(file_path, connection_qualified_name, sample_rows, cache)       # Extract metadata from the Excel file
+            if uploaded:
+                _remove(file_path)        # Cleanup uploaded temp file
+            return json_response({"schemas": metadata}, timings=timings if data.get("timings", "false").lower() == "true" else None)
         except Exception as e:
             logger.error(f"Error in extract_excel: {str(e)}")
-            return jsonify({"error": str(e)}), 500
\ No newline at end of file
+            return jsonify({"error": str(e)}), 500
+
+    @app.route('/extract_excel_batch', methods=['POST'])
+    async def extract_excel_batch():
+        upload_dir = None
+        try:
+            data = request.form.to_dict()
+            connection_qualified_name = data.get("connection_qualified_name", "default/excel")
+            output_format = data.get("format", "json")
+            if output_format != "json" and output_format not in STREAM_FORMATS and output_format not in EXPORT_FORMATS:
+                return jsonify({"error": f"Unsupported format: {output_format}"}), 400
+            if output_format in EXPORT_FORMATS and not HAS_PYARROW:
+                return jsonify({"error": "pyarrow is required for Parquet/Arrow export"}), 400
+            try:
+                sample_rows = _sample_rows(data)
+                max_workers = _number(data, "max_workers", int, None) if data.get("max_workers") else None
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+            file_paths = []
+            uploads = [file for file in request.files.getlist('files') if file.filename]
+            if uploads:     # Multi-file upload
+                if not all(file.filename.endswith(('.xlsx', '.xls')) for file in uploads):
+                    return jsonify({"error": "Invalid file format, must be .xlsx or .xls"}), 400
+                upload_dir = tempfile.mkdtemp(prefix="excel_batch_")
+                for index, file in enumerate(uploads):
+                    file_path = os.path.join(upload_dir, f"{index}_{os.path.basename(file.filename)}")
+                    file.save(file_path)
+                    file_paths.append(file_path)
+            elif data.get("directory"):
+                if not os.path.isdir(data["directory"]):
+                    return jsonify({"error": f"Directory not found at {data['directory']}"}), 400
+                file_paths = sorted(glob.glob(os.path.join(data["directory"], "*.xls*")))
+            elif data.get("glob"):
+                file_paths = sorted(glob.glob(data["glob"], recursive=True))
+            else:
+                return jsonify({"error": "Provide files, directory or glob"}), 400
+            file_paths = [file_path for file_path in file_paths if file_path.endswith(('.xlsx', '.xls'))]
+            if not file_paths:
+                return jsonify({"error": "No .xlsx or .xls files found"}), 400
+            logger.info(f"Processing {len(file_paths)} Excel files")
+
+            if output_format in STREAM_FORMATS:
+                chunks, mimetype = STREAM_FORMATS[output_format]
+                events = iter_excel_batch_metadata(file_paths, connection_qualified_name, sample_rows, max_workers)
+                if upload_dir:
+                    events = _remove_after(events, upload_dir)
+                    upload_dir = None       # Removed once the stream completes
+                return stream_response(chunks(events), mimetype)
+            if output_format in EXPORT_FORMATS:
+                events = iter_excel_batch_metadata(file_paths, connection_qualified_name, sample_rows, max_workers)
+                manifest = export_events(events, export_directory(get_export_dir(), connection_qualified_name), output_format)
+                return json_response({"export": manifest})
+
+            metadata = fetch_excel_batch_metadata(file_paths, connection_qualified_name, sample_rows, max_workers)
+            return json_response({"schemas": metadata})
+        except Exception as e:
+            logger.error(f"Error in extract_excel_batch: {str(e)}")
+            return jsonify({"error": str(e)}), 500
+        finally:
+            if upload_dir:
+                _remove(upload_dir)
@@ -0,0 +1,171 @@
+from flask import jsonify, request
+from src.clients.registry import client_registry
+from src.routes.database import DB_SOURCES, _extraction_options, _number, iter_db_metadata
+from src.routes.excel import _remove, _remove_after, _sample_rows, iter_excel_metadata
+from src.utils.cache import cache_key, cached_events, file_digest, result_cache
+from src.utils.config import get_cached_db_credentials, get_job_settings
+from src.utils.jobs import FINISHED_STATES, JobManager, create_job_store
+from src.utils.logger import get_logger
+from src.utils.serialization import json_response
+from src.utils.streaming import Event, iterate_async
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+logger = get_logger(__name__)
+
+def run_job(params: Dict[str, Any]) -> Iterator[Event]:
+    # Event stream of a submitted job; the same extractors the /extract_* endpoints use
+    connection_qualified_name = params["connection_qualified_name"]
+    if params["source"] == "excel":
+        file_path = params["file_path"]
+        events = iter_excel_metadata(file_path, connection_qualified_name, params["sample_rows"])
+        if params["cache"]:
+            events = cached_events(result_cache, cache_key(connection_qualified_name, "excel", file_digest(file_path), params["sample_rows"]), events)
+        if params.get("upload_dir"):
+            events = _remove_after(events, params["upload_dir"])
+        return events
+    client_factory, env_prefix, _, db_type = DB_SOURCES[params["source"]]
+    credentials = get_cached_db_credentials(env_prefix)
+    cache = result_cache if params["cache"] else None
+    return iterate_async(lambda: client_registry.borrowed_events(
+        db_type, client_factory, credentials,
+        lambda client: iter_db_metadata(client, credentials, connection_qualified_name, db_type, cache=cache,
+                                        manage_connection=False, **params["options"])
+    ), loop=client_registry.loop)
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    # Created on first use rather than at import, so importing the routes never opens the store or recovers jobs
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            settings = get_job_settings()
+            manager = JobManager(create_job_store(settings["backend"], settings["path"]), run_job, settings["workers"])
+            manager.start()     # Fails jobs interrupted by a restart and resumes queued ones
+            _job_manager = manager
+        return _job_manager
+
+def _allowed_file(file_path: str) -> bool:
+    # Server-side paths from a request must be inside JOB_FILE_DIR; EXCEL_FILE_PATH is always allowed
+    file_dir = get_job_settings()["file_dir"]
+    real_path = os.path.realpath(file_path)
+    if os.getenv("EXCEL_FILE_PATH") and real_path == os.path.realpath(os.getenv("EXCEL_FILE_PATH")):
+        return True
+    return bool(file_dir) and os.path.commonpath([real_path, os.path.realpath(file_dir)]) == os.path.realpath(file_dir)
+
+def _excel_params(data: Dict[str, Any]):
+    try:
+        sample_rows = _sample_rows(data)
+    except ValueError as e:
+        return None, str(e)
+    params = {
+        "source": "excel",
+        "connection_qualified_name": data.get("connection_qualified_name", "default/excel"),
+        "sample_rows": sample_rows,
+        "cache": str(data.get("cache", False)).lower() == "true",
+    }
+    if 'file' in request.files and request.files['file'].filename:       # Kept until the job has run
+        file = request.files['file']
+        if not file.filename.endswith(('.xlsx', '.xls')):
+            return None, "Invalid file format, must be .xlsx or .xls"
+        params["upload_dir"] = tempfile.mkdtemp(prefix="excel_job_")
+        params["file_path"] = os.path.join(params["upload_dir"], os.path.basename(file.filename))
+        file.save(params["file_path"])
+        return params, None
+    file_path = data.get("file_path") or os.getenv("EXCEL_FILE_PATH")
+    if file_path and not _allowed_file(file_path):
+        return None, "file_path must be inside JOB_FILE_DIR; upload the file instead"
+    if not file_path or not os.path.exists(file_path):
+        return None, f"File not found at {file_path}"
+    if not file_path.endswith(('.xlsx', '.xls')):
+        return None, "Invalid file format, must be .xlsx or .xls"
+    params["file_path"] = os.path.abspath(file_path)
+    return params, None
+
+def _job_params(data: Dict[str, Any]):
+    # Validated parameters of a job, or an error message
+    source = data.get("source")
+    if source == "excel":
+        return _excel_params(data)
+    if source not in DB_SOURCES:
+        return None, f"Unsupported source: {source}"
+    try:
+        options = _extraction_options(data)
+    except ValueError as e:
+        return None, str(e)
+    return {
+        "source": source,
+        "connection_qualified_name": data.get("connection_qualified_name", DB_SOURCES[source][2]),
+        "options": options,
+        "cache": bool(data.get("cache", False)),
+    }, None
+
+def register_job_routes(app):
+    @app.route('/jobs', methods=['POST'])
+    def submit_job():
+        try:
+            data = request.get_json(silent=True) or request.form.to_dict()
+            params, error = _job_params(data)
+            if error:
+                return jsonify({"error": error}), 400
+            job = get_job_manager().submit(params)
+            return jsonify({"job_id": job["job_id"], "status": job["status"]}), 202
+        except Exception as e:
+            logger.error(f"Error in submit_job: {str(e)}")
+            return jsonify({"error": str(e)}), 500
+
+    @app.route('/jobs', methods=['GET'])
+    def list_jobs():
+        try:
+            limit = _number(request.args, "limit", int, 100)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if limit < 1:
+            return jsonify({"error": f"limit must be at least 1, got {limit}"}), 400
+        return jsonify({"jobs": get_job_manager().store.list(limit)}), 200
+
+    @app.route('/jobs/<job_id>', methods=['GET'])
+    def job_status(job_id):
+        job = get_job_manager().store.get(job_id)       # status, progress counts and timestamps
+        if not job:
+            return jsonify({"error": f"Job not found: {job_id}"}), 404
+        return jsonify(job), 200
+
+    @app.route('/jobs/<job_id>/cancel', methods=['POST'])
+    def cancel_job(job_id):
+        try:
+            job = get_job_manager().store.get(job_id)
+            if not job:
+                return jsonify({"error": f"Job not found: {job_id}"}), 404
+            if job["status"] in FINISHED_STATES:
+                return jsonify({"error": f"Job already {job['status']}", "job": job}), 409
+            job = get_job_manager().cancel(job_id)
+            if job["status"] == "cancelled" and job["params"].get("upload_dir"):       # Never started, so nothing else removes the upload
+                _remove(job["params"]["upload_dir"])
+            return jsonify(job), 200
+        except Exception as e:
+            logger.error(f"Error in cancel_job: {str(e)}")
+            return jsonify({"error": str(e)}), 500
+
+    @app.route('/jobs/<job_id>/result', methods=['GET'])
+    def job_result(job_id):
+        job = get_job_manager().store.get(job_id)
+        if not job:
+            return jsonify({"error": f"Job not found: {job_id}"}), 404
+        if job["status"] != "succeeded":
+            return jsonify({"error": f"Job is {job['status']}", "job": job}), 409
+        return json_response({"schemas": get_job_manager().store.result(job_id)})
+
+    @app.route('/jobs/<job_id>', methods=['DELETE'])
+    def delete_job(job_id):
+        job = get_job_manager().store.get(job_id)
+        if not job:
+            return jsonify({"error": f"Job not found: {job_id}"}), 404
+        if job["status"] not in FINISHED_STATES:
+            return jsonify({"error": f"Job is {job['status']}, cancel it first", "job": job}), 409
+        get_job_manager().store.delete(job_id)
+        return jsonify({"deleted": job_id}), 200
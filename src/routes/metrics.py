@@ -0,0 +1,13 @@
+from flask import Response, jsonify
+from src.clients.registry import client_registry
+from src.utils.metrics import render_metrics
+
+def register_metrics_routes(app):
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4"), 200
+
+    @app.route('/clients', methods=['GET'])
+    def clients():
+        # Pooled clients: age and idle seconds, leases in use
+        return jsonify({"enabled": client_registry.enabled, "clients": client_registry.stats()}), 200
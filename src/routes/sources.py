@@ -0,0 +1,145 @@
+from flask import jsonify, request
+from src.clients.registry import client_registry
+from src.routes.database import DB_SOURCES, _extraction_options, _number, fetch_db_metadata
+from src.routes.excel import _sample_rows, fetch_excel_metadata
+from src.utils.cache import ResultCache, result_cache
+from src.utils.config import get_cached_db_credentials, get_fanout_settings
+from src.utils.logger import get_logger
+from src.utils.serialization import json_response
+import asyncio
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+logger = get_logger(__name__)
+
+SOURCE_STATUSES = ("succeeded", "failed", "timeout")
+_ENV_PREFIX = re.compile(r"^[A-Z][A-Z0-9_]*$")
+
+def parse_sources(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Validated sources of a multi-source request: {"sources": [{"source": ..., "connection_qualified_name": ...}, ...]}.
+    Database sources read credentials from <env_prefix>_USER, _PASSWORD, _HOST, ... (the dialect's prefix by
+    default, so several instances of one dialect use prefixes like PG_SALES) and take the database endpoints'
+    options; Excel sources take file_path and sample_rows. Each source may set its own timeout in seconds.
+    Raises ValueError on bad input, including two sources with the same connection_qualified_name.
+    """
+    sources = data.get("sources")
+    if not isinstance(sources, list) or not sources:
+        raise ValueError("sources must be a non-empty list")
+    default_timeout = _number(data, "timeout", float, get_fanout_settings()["timeout"])
+    specs = []
+    seen = set()
+    for index, source in enumerate(sources):
+        if not isinstance(source, dict):
+            raise ValueError(f"sources[{index}] must be an object")
+        kind = source.get("source")
+        if kind == "excel":
+            file_path = source.get("file_path") or ""
+            if not file_path.endswith(('.xlsx', '.xls')):
+                raise ValueError(f"sources[{index}]: file_path must be an .xlsx or .xls file")
+            try:
+                sample_rows = _sample_rows(source)
+            except ValueError as e:
+                raise ValueError(f"sources[{index}]: {str(e)}")
+            spec = {
+                "source": kind,
+                "connection_qualified_name": source.get("connection_qualified_name", "default/excel"),
+                "file_path": file_path,
+                "sample_rows": sample_rows,
+            }
+        elif kind in DB_SOURCES:
+            env_prefix = source.get("env_prefix", DB_SOURCES[kind][1])
+            if not _ENV_PREFIX.match(str(env_prefix)):
+                raise ValueError(f"sources[{index}]: env_prefix must be upper case letters, digits and underscores")
+            try:
+                options = _extraction_options(source)
+            except ValueError as e:
+                raise ValueError(f"sources[{index}]: {str(e)}")
+            spec = {
+                "source": kind,
+                "connection_qualified_name": source.get("connection_qualified_name", DB_SOURCES[kind][2]),
+                "env_prefix": env_prefix,
+                "options": options,
+            }
+        else:
+            raise ValueError(f"sources[{index}]: unsupported source: {kind}")
+        try:
+            spec["timeout"] = _number(source, "timeout", float, default_timeout)
+        except ValueError as e:
+            raise ValueError(f"sources[{index}]: {str(e)}")
+        if spec["timeout"] <= 0:
+            raise ValueError(f"sources[{index}]: timeout must be positive")
+        if spec["connection_qualified_name"] in seen:      # Results are keyed by it
+            raise ValueError(f"Duplicate connection_qualified_name: {spec['connection_qualified_name']}")
+        seen.add(spec["connection_qualified_name"])
+        specs.append(spec)
+    return specs
+
+async def _fetch_source(spec: Dict[str, Any], cache: Optional[ResultCache]) -> List[Dict[str, Any]]:
+    connection_qualified_name = spec["connection_qualified_name"]
+    if spec["source"] == "excel":
+        if not os.path.exists(spec["file_path"]):
+            raise FileNotFoundError(f"File not found at {spec['file_path']}")
+        # Parsing blocks; a worker thread keeps the other sources going (a timed out workbook finishes in the background)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, fetch_excel_metadata, spec["file_path"], connection_qualified_name, spec["sample_rows"], cache)
+    client_factory, _, _, db_type = DB_SOURCES[spec["source"]]
+    credentials = get_cached_db_credentials(spec["env_prefix"])
+    if not credentials["host"]:
+        raise ValueError(f"{spec['env_prefix']}_HOST is not set")
+    async with client_registry.lease(db_type, client_factory, credentials) as client:
+        return await fetch_db_metadata(client, credentials, connection_qualified_name, db_type, cache=cache,
+                                       manage_connection=False, **spec["options"])
+
+async def _run_source(spec: Dict[str, Any], cache: Optional[ResultCache], slots: asyncio.Semaphore) -> Dict[str, Any]:
+    result = {"source": spec["source"], "status": "succeeded"}
+    async with slots:
+        started = time.perf_counter()
+        try:
+            result["schemas"] = await asyncio.wait_for(_fetch_source(spec, cache), spec["timeout"])
+        except asyncio.TimeoutError:
+            result.update(status="timeout", error=f"Timed out after {spec['timeout']}s")
+        except Exception as e:
+            result.update(status="failed", error=str(e))
+        result["seconds"] = round(time.perf_counter() - started, 3)
+    if result["status"] == "succeeded":
+        logger.info(f"Extracted {spec['connection_qualified_name']} in {result['seconds']}s")
+    else:
+        logger.error(f"Extraction of {spec['connection_qualified_name']} {result['status']}: {result['error']}")
+    return result
+
+async def extract_sources(specs: List[Dict[str, Any]], max_parallel: int, cache: Optional[ResultCache] = None) -> Dict[str, Any]:
+    """
+    Extract every source concurrently, at most max_parallel at a time, and merge the results keyed by
+    connection_qualified_name. Runs on the client registry loop, which owns the pooled clients.
+    A source that fails or times out is reported with its status and error; the others are unaffected.
+    """
+    started = time.perf_counter()
+    slots = asyncio.Semaphore(max(1, max_parallel))
+    results = await asyncio.gather(*(_run_source(spec, cache, slots) for spec in specs))
+    summary = {status: sum(1 for result in results if result["status"] == status) for status in SOURCE_STATUSES}
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return {
+        "sources": {spec["connection_qualified_name"]: result for spec, result in zip(specs, results)},
+        "summary": summary,
+    }
+
+def register_source_routes(app):
+    @app.route('/extract_sources', methods=['POST'])
+    async def extract_all_sources():
+        try:
+            data = request.get_json() or {}
+            try:
+                specs = parse_sources(data)
+                max_parallel = _number(data, "max_parallel", int, get_fanout_settings()["max_parallel"])
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            cache = result_cache if data.get("cache", False) else None
+            result = await client_registry.call(extract_sources(specs, max_parallel, cache))
+            # 207 when only some sources succeeded, so callers can tell a partial sweep from a complete one
+            return json_response(result, status=200 if result["summary"]["succeeded"] == len(specs) else 207)
+        except Exception as e:
+            logger.error(f"Error in extract_sources: {str(e)}")
+            return jsonify({"error": str(e)}), 500
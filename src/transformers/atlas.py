@@ -1,9 +1,81 @@
 from application_sdk.transformers.atlas import AtlasTransformer
 from src.utils.logger import get_logger
-from typing import Any, Dict, Optional
+from src.utils.metrics import observe_transform
+import numpy as np
+import time
+from typing import Any, Dict, List, Optional, Sequence
 
 logger = get_logger(__name__)
 
+_MISSING = object()
+# Fields whose per-row value is itself a list; in a dict of columns they are columns only as a non-empty list of lists
+LIST_FIELDS = {"tags", "constraint_types", "constraints"}
+
+def _is_column(key: str, value: Any) -> bool:
+    if hasattr(value, "iloc") or isinstance(value, np.ndarray):       # pandas Series / numpy array
+        return True
+    if not isinstance(value, (list, tuple)):
+        return False
+    if key in LIST_FIELDS:      # "tags": [] is one empty list for every row, not a zero-length column
+        return len(value) > 0 and all(isinstance(item, (list, tuple)) for item in value)
+    return True
+
+class ColumnarRows:
+    """
+    Column-wise view over a batch of rows: a pandas DataFrame, a pyarrow Table, a dict of columns
+    (lists, or scalars broadcast to every row) or a list of dicts. Raises ValueError when the columns
+    of a dict differ in length.
+    """
+    def __init__(self, rows: Any):
+        self._rows = None
+        self._frame = None
+        self._scalars = {}
+        if hasattr(rows, "to_pydict"):      # pyarrow Table / RecordBatch
+            self._columns = rows.to_pydict()
+            self.size = rows.num_rows
+        elif hasattr(rows, "iloc"):     # pandas DataFrame
+            self._frame = rows
+            self._columns = {name: rows[name] for name in rows.columns}
+            self.size = len(rows)
+        elif isinstance(rows, dict):
+            self._columns = {key: value for key, value in rows.items() if _is_column(key, value)}
+            self._scalars = {key: value for key, value in rows.items() if key not in self._columns}
+            lengths = {key: len(value) for key, value in self._columns.items()}
+            if len(set(lengths.values())) > 1:      # zip would silently drop the rows past the shortest column
+                raise ValueError(f"Columns differ in length: {lengths}")
+            self.size = next(iter(lengths.values()), 1)
+        else:
+            self._rows = rows
+            self.size = len(rows)
+
+    def get(self, key: str, default: Any) -> List[Any]:
+        if self._rows is not None:
+            return [row.get(key, default) for row in self._rows]
+        value = self._columns.get(key, _MISSING)
+        if value is _MISSING:
+            return [self._scalars.get(key, default)] * self.size
+        if hasattr(value, "tolist"):
+            return value.tolist()
+        return value
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        if self._rows is not None:
+            return list(self._rows)
+        keys = list(self._columns) + list(self._scalars)
+        return [dict(zip(keys, values)) for values in zip(*(self.get(key, None) for key in keys))]
+
+    def join(self, keys: Sequence[str]) -> List[str]:
+        # "/"-joined qualifiedNames, concatenated as whole columns when the input is a DataFrame
+        if self._frame is not None and all(key in self._columns for key in keys):
+            joined = self._frame[keys[0]].to_numpy(dtype=object).astype(str)
+            for key in keys[1:]:
+                joined = np.char.add(np.char.add(joined, "/"), self._frame[key].to_numpy(dtype=object).astype(str))
+            return joined.tolist()
+        joined = self.get(keys[0], "")
+        for key in keys[1:]:
+            joined = [f"{head}/{tail}" for head, tail in zip(joined, self.get(key, ""))]
+        return joined
+
 class GenericSchema:
     @classmethod
     def get_attributes(cls, obj: Dict[str, Any]) -> Dict[str, Any]:     # Extract schema attributes from input dict  
@@ -21,6 +93,22 @@ class GenericSchema:
             }
         }
 
+    @classmethod
+    def get_entities(cls, typename: str, rows: ColumnarRows) -> List[Dict[str, Any]]:       # Batch form of get_attributes, entity per row
+        return [
+            {
+                "typeName": typename,
+                "attributes": {"name": name, "qualifiedName": qualified_name, "connectionQualifiedName": connection, "databaseName": database},
+                "customAttributes": {"description": description, "tags": list(tags)},
+                "status": "ACTIVE",
+            }
+            for name, qualified_name, connection, database, description, tags in zip(
+                rows.get("schema_name", ""), rows.join(("connection_qualified_name", "schema_name")),
+                rows.get("connection_qualified_name", ""), rows.get("database_name", ""),
+                rows.get("description", ""), rows.get("tags", ())
+            )
+        ]
+
 class GenericTable:
     @classmethod
     def get_attributes(cls, obj: Dict[str, Any]) -> Dict[str, Any]:     # Extract table attributes from input dict 
@@ -39,6 +127,22 @@ class GenericTable:
             }
         }
 
+    @classmethod
+    def get_entities(cls, typename: str, rows: ColumnarRows) -> List[Dict[str, Any]]:       # Batch form of get_attributes, entity per row
+        return [
+            {
+                "typeName": typename,
+                "attributes": {"name": name, "schemaName": schema, "databaseName": database, "qualifiedName": qualified_name, "connectionQualifiedName": connection},
+                "customAttributes": {"description": description, "tags": list(tags)},
+                "status": "ACTIVE",
+            }
+            for name, schema, database, qualified_name, connection, description, tags in zip(
+                rows.get("table_name", ""), rows.get("schema_name", ""), rows.get("database_name", ""),
+                rows.join(("connection_qualified_name", "schema_name", "table_name")),
+                rows.get("connection_qualified_name", ""), rows.get("description", ""), rows.get("tags", ())
+            )
+        ]
+
 class GenericColumn:
     @classmethod
     def get_attributes(cls, obj: Dict[str, Any]) -> Dict[str, Any]:     # Extract column attributes from input dict
@@ -58,10 +162,37 @@ class GenericColumn:
             "custom_attributes": {
                 "description": obj.get("description", ""),
                 "tags": obj.get("tags", []),
-                "constraint_type": obj.get("constraint_type", "")
+                "constraint_type": obj.get("constraint_type", ""),
+                "constraint_types": obj.get("constraint_types", []),
+                "constraints": obj.get("constraints", [])
             }
         }
 
+    @classmethod
+    def get_entities(cls, typename: str, rows: ColumnarRows) -> List[Dict[str, Any]]:       # Batch form of get_attributes, entity per row
+        return [
+            {
+                "typeName": typename,
+                "attributes": {
+                    "name": name, "qualifiedName": qualified_name, "connectionQualifiedName": connection, "tableName": table,
+                    "schemaName": schema, "databaseName": database, "dataType": data_type, "isNullable": is_nullable == "YES", "order": order,
+                },
+                "customAttributes": {
+                    "description": description, "tags": list(tags), "constraint_type": constraint_type,
+                    "constraint_types": list(constraint_types), "constraints": list(constraints),
+                },
+                "status": "ACTIVE",
+            }
+            for (name, qualified_name, connection, table, schema, database, data_type, is_nullable, order, description, tags,
+                 constraint_type, constraint_types, constraints) in zip(
+                rows.get("column_name", ""), rows.join(("connection_qualified_name", "schema_name", "table_name", "column_name")),
+                rows.get("connection_qualified_name", ""), rows.get("table_name", ""), rows.get("schema_name", ""),
+                rows.get("database_name", ""), rows.get("data_type", ""), rows.get("is_nullable", "NO"),
+                rows.get("ordinal_position", 1), rows.get("description", ""), rows.get("tags", ()), rows.get("constraint_type", ""),
+                rows.get("constraint_types", ()), rows.get("constraints", ())
+            )
+        ]
+
 class GenericAtlasTransformer(AtlasTransformer):
     def __init__(self, connector_name: str, tenant_id: str = "default", **kwargs: Any):
         super().__init__(connector_name, tenant_id, **kwargs)       # Map entity types to corresponding attribute extractor classes
@@ -75,16 +206,41 @@ class GenericAtlasTransformer(AtlasTransformer):
         typename = typename.upper()
         creator = self.entity_class_definitions.get(typename)
         if creator:
+            started = time.perf_counter()
             try:
                 entity_attributes = creator.get_attributes(data)
-                return {
+                entity = {
                     "typeName": typename,
                     "attributes": entity_attributes["attributes"],
                     "customAttributes": entity_attributes["custom_attributes"],
                     "status": "ACTIVE",
                 }
+                observe_transform(typename, time.perf_counter() - started, 1)
+                return entity
             except Exception as e:
+                observe_transform(typename, time.perf_counter() - started, 0)
                 logger.error(f"Error transforming {typename} entity: {str(e)}")
                 return None
         logger.error(f"Unknown typename: {typename}")
-        return None
\ No newline at end of file
+        return None
+
+    def transform_batch(self, typename: str, rows: Any) -> List[Optional[Dict[str, Any]]]:
+        """
+        Transform many rows of one type in a single pass; returns the same entities as calling
+        transform_row on each row, in row order. `rows` is anything ColumnarRows accepts.
+        """
+        typename = typename.upper()
+        creator = self.entity_class_definitions.get(typename)
+        if not creator:
+            logger.error(f"Unknown typename: {typename}")
+            return []
+        columnar = ColumnarRows(rows)
+        started = time.perf_counter()
+        try:
+            entities = creator.get_entities(typename, columnar)
+            observe_transform(typename, time.perf_counter() - started, len(entities))
+            return entities
+        except Exception as e:
+            # Fall back to row by row so one malformed row only drops that entity
+            logger.error(f"Batch transform of {typename} entities failed, transforming row by row: {str(e)}")
+            return [self.transform_row(typename, row) for row in columnar.to_dicts()]
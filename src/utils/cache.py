@@ -0,0 +1,188 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from src.utils.config import get_cache_settings
+from src.utils.logger import get_logger
+from src.utils.serialization import dumps, loads
+from src.utils.streaming import Event, append_event
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+logger = get_logger(__name__)
+
+def file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_key(connection_qualified_name: str, *parts: Any) -> str:
+    # Keys start with the connection so a whole connection can be invalidated at once
+    return f"{connection_qualified_name}|" + "|".join(str(part) for part in parts)
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """
+    Two-tier cache of extraction results (the nested `schemas` list).
+    Memory tier: LRU bounded by entry count and encoded size. Disk tier: one JSON file per entry,
+    evicted least-recently-used by mtime once the directory exceeds its byte budget.
+    Both tiers honour the same TTL.
+    """
+    def __init__(self, max_entries: int = 64, max_bytes: int = 512 * 1024 * 1024, ttl: float = 900,
+                 disk_dir: Optional[str] = None, max_disk_bytes: int = 4 * 1024 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()       # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.metrics = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        connection_qualified_name = key.split("|", 1)[0]
+        return os.path.join(self.disk_dir, f"{_hash(connection_qualified_name)[:16]}_{_hash(key)}.json")
+
+    def _drop(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _store_memory(self, key: str, expires_at: float, size: int, value: Any) -> None:
+        if key in self._entries:
+            self._drop(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (expires_at, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.metrics["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.metrics["memory_hits"] += 1
+                    return entry[2]
+                self._drop(key)
+                self.metrics["expirations"] += 1
+
+            if self.disk_dir and os.path.exists(self._disk_path(key)):
+                path = self._disk_path(key)
+                try:
+                    with open(path, "rb") as f:
+                        payload = f.read()
+                    stored = loads(payload)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Discarding unreadable cache file {path}: {str(e)}")
+                    stored = None
+                if stored and stored["key"] == key and stored["expires_at"] > now:
+                    os.utime(path)      # Refresh LRU position on disk
+                    self._store_memory(key, stored["expires_at"], len(payload), stored["value"])
+                    self.metrics["disk_hits"] += 1
+                    return stored["value"]
+                os.remove(path)
+                self.metrics["expirations"] += 1
+
+            self.metrics["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl
+        payload = dumps({"key": key, "expires_at": expires_at, "value": value})
+        with self._lock:
+            self._store_memory(key, expires_at, len(payload), value)
+            if self.disk_dir:
+                path = self._disk_path(key)
+                with open(path + ".tmp", "wb") as f:
+                    f.write(payload)
+                os.replace(path + ".tmp", path)
+                self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        files = [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir) if name.endswith(".json")]
+        stats = sorted(((os.stat(path), path) for path in files), key=lambda item: item[0].st_mtime)
+        total = sum(stat.st_size for stat, _ in stats)
+        for stat, path in stats:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= stat.st_size
+            self.metrics["evictions"] += 1
+
+    def invalidate(self, connection_qualified_name: Optional[str] = None) -> int:
+        # Drop every entry, or only those of one connection; returns the number of entries removed
+        removed = 0
+        with self._lock:
+            for key in list(self._entries):
+                if connection_qualified_name is None or key.startswith(f"{connection_qualified_name}|"):
+                    self._drop(key)
+                    removed += 1
+            if self.disk_dir:
+                prefix = "" if connection_qualified_name is None else _hash(connection_qualified_name)[:16] + "_"
+                for name in os.listdir(self.disk_dir):
+                    if name.startswith(prefix) and name.endswith(".json"):
+                        os.remove(os.path.join(self.disk_dir, name))
+                        removed += 1
+            self.metrics["invalidations"] += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.metrics["memory_hits"] + self.metrics["disk_hits"] + self.metrics["misses"]
+            return {
+                **self.metrics,
+                "hit_ratio": (lookups - self.metrics["misses"]) / lookups if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "memory_bytes": self._bytes,
+                "disk_entries": len([name for name in os.listdir(self.disk_dir) if name.endswith(".json")]) if self.disk_dir else 0,
+            }
+
+def _collect(schemas: List[Dict[str, Any]], typename: str, entity: Dict[str, Any]) -> None:
+    # The consumer appends tables to the schema entities it receives, so the cache keeps its own copies
+    if typename == "SCHEMA":
+        entity = {**entity, "tables": []}
+    append_event(schemas, typename, entity)
+
+def replay_events(schemas: List[Dict[str, Any]]) -> Iterator[Event]:
+    # Turn a cached schemas list back into the extractor event stream
+    for schema_entity in schemas:
+        yield "SCHEMA", {**schema_entity, "tables": []}
+        for table_entity in schema_entity["tables"]:
+            yield "TABLE", table_entity
+
+def cached_events(cache: ResultCache, key: str, events: Iterator[Event]) -> Iterator[Event]:
+    """
+    Serve `key` from the cache, or pass `events` through and store the assembled result once they complete.
+    `events` is only started on a miss.
+    """
+    schemas = cache.get(key)
+    if schemas is not None:
+        yield from replay_events(schemas)
+        return
+    schemas = []
+    for typename, entity in events:
+        _collect(schemas, typename, entity)
+        yield typename, entity
+    cache.put(key, schemas)
+
+async def populate_cache(cache: ResultCache, key: str, events: AsyncIterator[Event]) -> AsyncIterator[Event]:
+    # Async counterpart of the miss path of cached_events; the lookup happens before the extraction starts
+    schemas = []
+    async for typename, entity in events:
+        _collect(schemas, typename, entity)
+        yield typename, entity
+    cache.put(key, schemas)
+
+# Process-wide cache shared by the extraction routes
+result_cache = ResultCache(**get_cache_settings())
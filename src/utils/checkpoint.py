@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.logger import get_logger
+from src.utils.serialization import dumps, loads
+from src.utils.streaming import Event
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+logger = get_logger(__name__)
+
+COMMIT_INTERVAL = 1.0       # Seconds between commits while tables are being recorded
+
+def checkpoint_run_id(connection_qualified_name: str, db_type: str, selection: Optional[Dict[str, Any]], profiled: bool) -> str:
+    # Runs only resume each other when they extract the same tables to the same depth
+    options = hashlib.sha256(json.dumps([selection, profiled], sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return f"{db_type}:{connection_qualified_name}:{options}"
+
+class ExtractionCheckpoint:
+    """
+    SQLite record of an extraction in progress: every completed table entity, keyed by qualifiedName.
+    Tables are committed at most COMMIT_INTERVAL seconds apart and on close, so a run that fails on
+    table 30,000 keeps the 29,999 before it. A resumed run reads those back instead of querying them again.
+    Every SQLite call runs on the checkpoint's own thread, as in CatalogSnapshot. Create it with
+    `await ExtractionCheckpoint.open(...)`.
+    """
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.completed = set()
+        self._last_commit = time.monotonic()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+
+    @classmethod
+    async def open(cls, path: str, run_id: str) -> "ExtractionCheckpoint":
+        checkpoint = cls(run_id)
+        try:
+            await checkpoint._call(checkpoint._open, path)
+        except BaseException:
+            checkpoint.executor.shutdown(wait=False)
+            raise
+        return checkpoint
+
+    async def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def _open(self, path: str) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS checkpoint_runs (
+                run_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS checkpoint_tables (
+                run_id TEXT NOT NULL,
+                table_qualified_name TEXT NOT NULL,
+                body BLOB NOT NULL,
+                PRIMARY KEY (run_id, table_qualified_name)
+            );
+        """)
+
+    async def start(self, resume: bool) -> int:
+        """
+        Begin recording. With resume, an unfinished run with the same id is continued and its completed
+        tables are kept; otherwise (or when the last run finished) recording starts over.
+        Returns the number of tables carried over.
+        """
+        self.completed = await self._call(self._start, resume)
+        if self.completed:
+            logger.info(f"Resuming {self.run_id} with {len(self.completed)} completed tables")
+        return len(self.completed)
+
+    def _start(self, resume: bool) -> Set[str]:
+        completed = set()
+        row = self.db.execute("SELECT status FROM checkpoint_runs WHERE run_id = ?", (self.run_id,)).fetchone()
+        if resume and row and row[0] == "running":
+            rows = self.db.execute("SELECT table_qualified_name FROM checkpoint_tables WHERE run_id = ?", (self.run_id,))
+            completed = {table_qualified_name for table_qualified_name, in rows.fetchall()}
+        else:
+            self.db.execute("DELETE FROM checkpoint_tables WHERE run_id = ?", (self.run_id,))
+            self.db.execute("INSERT OR REPLACE INTO checkpoint_runs VALUES (?, 'running', ?, ?)", (self.run_id, time.time(), time.time()))
+        self.db.commit()
+        return completed
+
+    async def table(self, table_qualified_name: str) -> Optional[Dict[str, Any]]:
+        if table_qualified_name not in self.completed:      # Most tables, when resuming at all; no thread hop
+            return None
+        return await self._call(self._table, table_qualified_name)
+
+    def _table(self, table_qualified_name: str) -> Optional[Dict[str, Any]]:
+        row = self.db.execute("SELECT body FROM checkpoint_tables WHERE run_id = ? AND table_qualified_name = ?",
+                              (self.run_id, table_qualified_name)).fetchone()
+        return loads(row[0]) if row else None
+
+    async def add_table(self, table_entity: Dict[str, Any]) -> None:
+        await self._call(self._add_table, table_entity)
+        self.completed.add(table_entity["attributes"]["qualifiedName"])
+
+    def _add_table(self, table_entity: Dict[str, Any]) -> None:
+        self.db.execute("INSERT OR REPLACE INTO checkpoint_tables VALUES (?, ?, ?)",
+                        (self.run_id, table_entity["attributes"]["qualifiedName"], dumps(table_entity)))
+        if time.monotonic() - self._last_commit >= COMMIT_INTERVAL:
+            self._commit()
+
+    async def record(self, events: AsyncIterator[Event]) -> AsyncIterator[Event]:
+        # Pass events through, recording each new table; the run is marked finished once the stream completes
+        async for typename, entity in events:
+            if typename == "TABLE" and entity["attributes"]["qualifiedName"] not in self.completed:
+                await self.add_table(entity)
+            yield typename, entity
+        await self._call(self._finish)
+
+    def _finish(self) -> None:
+        self.db.execute("UPDATE checkpoint_runs SET status = 'finished', updated_at = ? WHERE run_id = ?", (time.time(), self.run_id))
+        self.db.execute("DELETE FROM checkpoint_tables WHERE run_id = ?", (self.run_id,))        # Nothing left to resume
+        self._commit()
+
+    async def commit(self) -> None:
+        await self._call(self._commit)
+
+    def _commit(self) -> None:
+        self.db.execute("UPDATE checkpoint_runs SET updated_at = ? WHERE run_id = ?", (time.time(), self.run_id))
+        self.db.commit()
+        self._last_commit = time.monotonic()
+
+    async def close(self) -> None:
+        try:
+            await self._call(self._close)
+        finally:
+            self.executor.shutdown(wait=False)
+
+    def _close(self) -> None:
+        self._commit()      # Keep whatever was extracted before a failure
+        self.db.close()
@@ -1,7 +1,8 @@
 from dotenv import load_dotenv
 import os
+import time
 from src.utils.logger import get_logger
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 load_dotenv()
 logger = get_logger(__name__)
@@ -14,7 +15,104 @@ def get_db_credentials(db_type: str) -> Dict[str, Any]:
         "host": os.getenv(f"{db_type}_HOST"),
         "port": os.getenv(f"{db_type}_PORT"),
         "database": os.getenv(f"{db_type}_DATABASE"),
-        "service_name": os.getenv(f"{db_type}_SERVICE") if db_type == "ORACLE" else None  # Oracle uses service_name instead of database
+        "service_name": os.getenv(f"{db_type}_SERVICE")  # Oracle uses service_name instead of database
     }
     logger.info(f"Loaded credentials for {db_type}: {credentials['user']}@{credentials['host']}:{credentials['port']}")
-    return credentials
\ No newline at end of file
+    return credentials
+
+# Local SQLite snapshot used by incremental extraction
+def get_snapshot_path() -> str:
+    return os.getenv("SNAPSHOT_PATH", "./snapshots/catalog.db")
+
+# Change signals of incremental extraction and the result cache; SIGNAL_CHECKSUMS=true uses the full-scan
+# checksum signals where a dialect has them (see CHECKSUM_SIGNAL_QUERIES in src/routes/database.py)
+def get_signal_settings() -> Dict[str, Any]:
+    return {
+        "checksums": os.getenv("SIGNAL_CHECKSUMS", "false").lower() == "true",
+    }
+
+# Result cache limits; CACHE_DIR enables the on-disk tier
+def get_cache_settings() -> Dict[str, Any]:
+    return {
+        "max_entries": int(os.getenv("CACHE_MAX_ENTRIES", "64")),
+        "max_bytes": int(os.getenv("CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+        "ttl": float(os.getenv("CACHE_TTL", "900")),
+        "disk_dir": os.getenv("CACHE_DIR") or None,
+        "max_disk_bytes": int(os.getenv("CACHE_MAX_DISK_BYTES", str(4 * 1024 * 1024 * 1024))),
+    }
+
+# Background extraction jobs; JOB_STORE=sqlite keeps jobs and results in JOB_DB_PATH across restarts
+# and Excel jobs may only read server-side files under JOB_FILE_DIR (unset: uploads and EXCEL_FILE_PATH only)
+def get_job_settings() -> Dict[str, Any]:
+    return {
+        "backend": os.getenv("JOB_STORE", "memory"),
+        "path": os.getenv("JOB_DB_PATH", "./jobs/jobs.db"),
+        "workers": int(os.getenv("JOB_WORKERS", "2")),
+        "file_dir": os.getenv("JOB_FILE_DIR") or None,
+    }
+
+# Response encoding; RESPONSE_COMPRESSION lists encodings in order of preference (empty disables compression)
+def get_serialization_settings() -> Dict[str, Any]:
+    return {
+        "serializer": os.getenv("JSON_SERIALIZER", "orjson"),
+        "compression": [encoding.strip() for encoding in os.getenv("RESPONSE_COMPRESSION", "zstd,gzip").split(",") if encoding.strip()],
+        "compression_min_bytes": int(os.getenv("COMPRESSION_MIN_BYTES", "1024")),
+        "gzip_level": int(os.getenv("GZIP_LEVEL", "6")),
+        "zstd_level": int(os.getenv("ZSTD_LEVEL", "3")),
+    }
+
+# Parquet/Arrow exports are written under EXPORT_DIR/<connection>/<timestamp>/
+def get_export_dir() -> str:
+    return os.getenv("EXPORT_DIR", "./exports")
+
+_credentials_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# get_db_credentials, re-read at most every CREDENTIALS_TTL seconds instead of on every request
+def get_cached_db_credentials(db_type: str) -> Dict[str, Any]:
+    cached = _credentials_cache.get(db_type)
+    if cached and cached[0] > time.monotonic():
+        return dict(cached[1])
+    credentials = get_db_credentials(db_type)
+    _credentials_cache[db_type] = (time.monotonic() + float(os.getenv("CREDENTIALS_TTL", "300")), credentials)
+    return dict(credentials)
+
+# Pooled database clients shared across requests; CLIENT_REGISTRY=false connects a fresh client per extraction
+def get_client_registry_settings() -> Dict[str, Any]:
+    return {
+        "enabled": os.getenv("CLIENT_REGISTRY", "true").lower() != "false",
+        "idle_timeout": float(os.getenv("CLIENT_IDLE_TIMEOUT", "300")),
+        "max_lifetime": float(os.getenv("CLIENT_MAX_LIFETIME", "3600")),
+        "health_check_interval": float(os.getenv("CLIENT_HEALTH_CHECK_INTERVAL", "30")),
+    }
+
+# Column profiling budgets per table; requests may lower or raise them with profile_rows / profile_timeout / profile_top_k
+def get_profiling_settings() -> Dict[str, Any]:
+    return {
+        "rows": int(os.getenv("PROFILE_SAMPLE_ROWS", "10000")),
+        "timeout": float(os.getenv("PROFILE_TIMEOUT", "5")),
+        "top_k": int(os.getenv("PROFILE_TOP_K", "5")),
+    }
+
+# Excel header detection; 1 disables multi-row headers
+def get_excel_settings() -> Dict[str, Any]:
+    return {
+        "max_header_rows": max(1, int(os.getenv("EXCEL_MAX_HEADER_ROWS", "3"))),
+    }
+
+# Multi-source extraction; sources run in parallel, each bounded by FANOUT_SOURCE_TIMEOUT seconds
+def get_fanout_settings() -> Dict[str, Any]:
+    return {
+        "max_parallel": int(os.getenv("FANOUT_MAX_PARALLEL", "8")),
+        "timeout": float(os.getenv("FANOUT_SOURCE_TIMEOUT", "3600")),
+    }
+
+# Resumable extraction; completed tables of checkpointed runs are kept in CHECKPOINT_PATH
+def get_checkpoint_path() -> str:
+    return os.getenv("CHECKPOINT_PATH", "./checkpoints/checkpoints.db")
+
+# Per-table retries of failed catalog queries, waiting RETRY_BACKOFF seconds and doubling after each attempt
+def get_retry_settings() -> Dict[str, Any]:
+    return {
+        "retries": int(os.getenv("EXTRACTION_RETRIES", "3")),
+        "backoff": float(os.getenv("RETRY_BACKOFF", "0.5")),
+    }
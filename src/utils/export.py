@@ -0,0 +1,201 @@
+import asyncio
+import importlib.util
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.logger import get_logger
+from src.utils.streaming import Event
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+logger = get_logger(__name__)
+
+# pyarrow is imported by the first export, not at startup
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+DEFAULT_BATCH_ROWS = 10000
+CHUNK_EVENTS = 64       # Events handed to the writer thread at a time by export_events_async
+
+# One flat file per entity type; children point at their parent through its qualifiedName
+EXPORT_FIELDS: Dict[str, List[Tuple[str, str]]] = {
+    "schemas": [("qualified_name", "string"), ("name", "string"), ("connection_qualified_name", "string"),
+                ("database_name", "string"), ("description", "string"), ("tags", "strings"), ("status", "string")],
+    "tables": [("qualified_name", "string"), ("schema_qualified_name", "string"), ("name", "string"), ("schema_name", "string"),
+               ("database_name", "string"), ("connection_qualified_name", "string"), ("description", "string"),
+               ("tags", "strings"), ("status", "string")],
+    "columns": [("qualified_name", "string"), ("table_qualified_name", "string"), ("name", "string"), ("table_name", "string"),
+                ("schema_name", "string"), ("database_name", "string"), ("connection_qualified_name", "string"),
+                ("data_type", "string"), ("is_nullable", "bool"), ("order", "int64"), ("description", "string"), ("tags", "strings"),
+                ("constraint_type", "string"), ("constraint_types", "strings"), ("status", "string")],
+    "constraints": [("qualified_name", "string"), ("table_qualified_name", "string"), ("name", "string"),
+                    ("constraint_type", "string"), ("columns", "strings")],
+}
+
+def _arrow_schema(pa, fields: List[Tuple[str, str]]):
+    types = {"string": pa.string(), "strings": pa.list_(pa.string()), "bool": pa.bool_(), "int64": pa.int64()}
+    return pa.schema([(name, types[type_name]) for name, type_name in fields])
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+def _texts(values: Any) -> List[str]:
+    return [str(value) for value in values or []]
+
+def _order(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+class CatalogExportWriter:
+    """
+    Writes the extractor event stream as four flat Parquet or Arrow IPC files (schemas, tables, columns,
+    constraints). Rows are buffered per file and written as a record batch every `batch_rows` rows, so
+    memory stays bounded by one batch per file however large the catalog is.
+    """
+    def __init__(self, directory: str, export_format: str = "parquet", batch_rows: int = DEFAULT_BATCH_ROWS):
+        if not HAS_PYARROW:
+            raise RuntimeError("pyarrow is required for Parquet/Arrow export")
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet as pq
+        self._pa = pa
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.export_format = export_format
+        self.batch_rows = batch_rows
+        self.rows = {name: 0 for name in EXPORT_FIELDS}
+        self._schemas = {name: _arrow_schema(pa, fields) for name, fields in EXPORT_FIELDS.items()}
+        self._buffers = {name: [] for name in EXPORT_FIELDS}
+        self._writers = {}
+        self._schema_qualified_name = None
+        for name, schema in self._schemas.items():      # Opened up front so every file exists, even when empty
+            path = self.path(name)
+            if export_format == "parquet":
+                self._writers[name] = pq.ParquetWriter(path, schema, compression="zstd")
+            else:
+                self._writers[name] = pa.ipc.new_file(path, schema)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name + EXPORT_FORMATS[self.export_format])
+
+    def _append(self, name: str, row: Tuple[Any, ...]) -> None:
+        buffer = self._buffers[name]
+        buffer.append(row)
+        if len(buffer) >= self.batch_rows:
+            self._flush(name)
+
+    def _flush(self, name: str) -> None:
+        buffer = self._buffers[name]
+        if not buffer:
+            return
+        schema = self._schemas[name]
+        arrays = [self._pa.array(values, type=field.type) for values, field in zip(zip(*buffer), schema)]
+        self._writers[name].write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=schema))
+        self.rows[name] += len(buffer)
+        buffer.clear()
+
+    def add(self, typename: str, entity: Dict[str, Any]) -> None:
+        attributes = entity["attributes"]
+        custom = entity.get("customAttributes", {})
+        if typename == "SCHEMA":
+            self._schema_qualified_name = attributes["qualifiedName"]
+            self._append("schemas", (attributes["qualifiedName"], _text(attributes.get("name")), _text(attributes.get("connectionQualifiedName")),
+                                     _text(attributes.get("databaseName")), _text(custom.get("description")), _texts(custom.get("tags")),
+                                     _text(entity.get("status"))))
+            return
+        table_qualified_name = attributes["qualifiedName"]
+        self._append("tables", (table_qualified_name, self._schema_qualified_name, _text(attributes.get("name")),
+                                _text(attributes.get("schemaName")), _text(attributes.get("databaseName")),
+                                _text(attributes.get("connectionQualifiedName")), _text(custom.get("description")),
+                                _texts(custom.get("tags")), _text(entity.get("status"))))
+        for column in entity.get("columns", []):
+            column_attributes = column["attributes"]
+            column_custom = column.get("customAttributes", {})
+            self._append("columns", (column_attributes["qualifiedName"], table_qualified_name, _text(column_attributes.get("name")),
+                                     _text(column_attributes.get("tableName")), _text(column_attributes.get("schemaName")),
+                                     _text(column_attributes.get("databaseName")), _text(column_attributes.get("connectionQualifiedName")),
+                                     _text(column_attributes.get("dataType")), bool(column_attributes.get("isNullable")),
+                                     _order(column_attributes.get("order")), _text(column_custom.get("description")),
+                                     _texts(column_custom.get("tags")), _text(column_custom.get("constraint_type")),
+                                     _texts(column_custom.get("constraint_types")), _text(column.get("status"))))
+        for constraint in entity.get("constraints", []):
+            self._append("constraints", (f"{table_qualified_name}/{constraint['constraint_name']}", table_qualified_name,
+                                         _text(constraint["constraint_name"]), _text(constraint.get("constraint_type")),
+                                         _texts(constraint.get("columns"))))
+
+    def add_all(self, events: List[Event]) -> None:
+        for typename, entity in events:
+            self.add(typename, entity)
+
+    def close(self) -> Dict[str, Any]:
+        # Flush the remaining rows and finalize the files; returns the export manifest
+        for name in EXPORT_FIELDS:
+            self._flush(name)
+            self._writers[name].close()
+        return {
+            "directory": self.directory,
+            "format": self.export_format,
+            "files": {name: {"path": self.path(name), "rows": self.rows[name]} for name in EXPORT_FIELDS},
+        }
+
+    def abort(self) -> None:
+        # Drop a partial export
+        for writer in self._writers.values():
+            try:
+                writer.close()
+            except Exception:
+                pass
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def export_directory(base_dir: str, connection_qualified_name: str) -> str:
+    # <base>/<connection>/<timestamp>, so repeated exports of a connection never overwrite each other
+    safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", connection_qualified_name).strip("_") or "export"
+    return os.path.join(base_dir, safe_name, time.strftime("%Y%m%dT%H%M%S") + f"_{time.time_ns() % 1000000:06d}")
+
+def export_events(events: Iterable[Event], directory: str, export_format: str, batch_rows: int = DEFAULT_BATCH_ROWS) -> Dict[str, Any]:
+    writer = CatalogExportWriter(directory, export_format, batch_rows)
+    try:
+        for typename, entity in events:
+            writer.add(typename, entity)
+    except BaseException:
+        writer.abort()
+        raise
+    manifest = writer.close()
+    logger.info(f"Exported {manifest['files']['tables']['rows']} tables to {directory}")
+    return manifest
+
+async def export_events_async(events: AsyncIterator[Event], directory: str, export_format: str, batch_rows: int = DEFAULT_BATCH_ROWS) -> Dict[str, Any]:
+    # The writer (Arrow conversion, compression, file I/O) runs on its own thread, never on the event loop;
+    # events go over in chunks, and the next chunk is collected while the previous one is written
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+    writer = None
+    pending = None
+    try:
+        writer = await loop.run_in_executor(executor, CatalogExportWriter, directory, export_format, batch_rows)
+        chunk = []
+        async for event in events:
+            chunk.append(event)
+            if len(chunk) >= CHUNK_EVENTS:
+                if pending is not None:
+                    await pending
+                pending = loop.run_in_executor(executor, writer.add_all, chunk)
+                chunk = []
+        if pending is not None:
+            await pending
+        pending = None
+        await loop.run_in_executor(executor, writer.add_all, chunk)
+        manifest = await loop.run_in_executor(executor, writer.close)
+    except BaseException:
+        if pending is not None:
+            pending.cancel()
+        if writer is not None:
+            executor.submit(writer.abort)       # Queued behind any chunk still being written
+        raise
+    finally:
+        executor.shutdown(wait=False)
+    logger.info(f"Exported {manifest['files']['tables']['rows']} tables to {directory}")
+    return manifest
@@ -0,0 +1,154 @@
+import datetime
+import numbers
+import re
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple
+
+# Column types reported for spreadsheet data, from the cell values rather than the pandas dtype
+DATA_TYPES = ("boolean", "integer", "float", "date", "datetime", "time", "string", "unknown")
+# Cells holding these are missing values, like empty cells
+NULL_TOKENS = {"", " ", "null", "NULL", "Null", "nan", "NaN", "NAN", "n/a", "N/A", "#N/A"}
+CHUNK_ROWS = 4096
+# Numbers written as text, with or without thousands separators ("1,234,567"); leading zeros (zip codes,
+# account numbers) and other comma patterns ("1,2,3") keep a column a string
+_NUMERIC = re.compile(r"^[+-]?(?:0|[1-9]\d{0,2}(?:,\d{3})+|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?$|^[+-]?\.\d+$")
+_BOOLEAN = {"true", "false"}
+# Merged type of two chunks; anything not listed widens to string
+_WIDENED = {frozenset(("integer", "float")): "float", frozenset(("date", "datetime")): "datetime"}
+
+def _merge(first: str, second: str) -> str:
+    if first == second or second == "unknown":
+        return first
+    if first == "unknown":
+        return second
+    return _WIDENED.get(frozenset((first, second)), "string")
+
+def _temporal_type(values: pd.Series) -> str:
+    # date when every timestamp falls on midnight
+    timestamps = values.to_numpy()
+    return "date" if (timestamps == timestamps.astype("datetime64[D]")).all() else "datetime"
+
+def _text_type(text: pd.Series) -> str:
+    # Each whole-chunk test only runs when the first value passes it, so plain text columns cost one probe each
+    first = text.iloc[0].strip()
+    if first.lower() in _BOOLEAN and text.str.strip().str.lower().isin(_BOOLEAN).all():
+        return "boolean"
+    if _NUMERIC.match(first) and text.str.strip().str.match(_NUMERIC).all():
+        parsed = pd.to_numeric(text.str.strip().str.replace(",", "", regex=False), errors="coerce")
+        return "integer" if (parsed % 1 == 0).all() else "float"
+    if first[:1].isdigit():         # ISO 8601 dates start with the year
+        dates = pd.to_datetime(text.str.strip(), errors="coerce", format="ISO8601")
+        if dates.notna().all():
+            return _temporal_type(dates)
+    return "string"
+
+def _chunk_type(values: pd.Series) -> str:
+    """Type of the non-null values of one chunk of a column."""
+    if not len(values):
+        return "unknown"
+    if pd.api.types.is_bool_dtype(values):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(values):
+        return "integer"
+    if pd.api.types.is_float_dtype(values):
+        return "integer" if (values % 1 == 0).all() else "float"
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return _temporal_type(values)
+    if isinstance(values.dtype, pd.StringDtype):
+        return _text_type(values)
+    kinds = set(values.map(type).unique())
+    if all(issubclass(kind, (bool, np.bool_)) for kind in kinds):
+        return "boolean"
+    if all(issubclass(kind, numbers.Number) and not issubclass(kind, (bool, np.bool_)) for kind in kinds):
+        return "integer" if (pd.to_numeric(values) % 1 == 0).all() else "float"
+    if all(issubclass(kind, datetime.datetime) for kind in kinds):
+        return _temporal_type(pd.to_datetime(values))
+    if all(issubclass(kind, datetime.date) for kind in kinds):
+        return "date"
+    if all(issubclass(kind, datetime.time) for kind in kinds):
+        return "time"
+    if all(issubclass(kind, str) for kind in kinds):
+        return _text_type(values)
+    if all(issubclass(kind, (str, numbers.Number)) and not issubclass(kind, (bool, np.bool_)) for kind in kinds):
+        return _text_type(values.astype(str))      # Numbers mixed with numbers typed as text
+    return "string"
+
+def null_mask(values: pd.Series) -> pd.Series:
+    mask = values.isna()
+    if values.dtype == object or isinstance(values.dtype, pd.StringDtype):
+        mask |= values.isin(NULL_TOKENS)
+    return mask
+
+def infer_column(values: pd.Series, chunk_rows: int = CHUNK_ROWS) -> Dict[str, Any]:
+    """
+    Infer a column's type from its sampled values, chunk by chunk, stopping as soon as it widens to string.
+    Returns data_type, is_nullable ("YES" when a sampled value is missing) and unique (no nulls, no repeats).
+    """
+    values = values.infer_objects()     # Typed columns (read below a text header) take the dtype fast paths
+    nulls = null_mask(values)
+    present = values[~nulls]
+    data_type = "unknown"
+    for start in range(0, len(present), chunk_rows):
+        data_type = _merge(data_type, _chunk_type(present.iloc[start:start + chunk_rows].infer_objects()))
+        if data_type == "string":
+            break
+    unique = bool(len(present) > 1 and not nulls.any() and data_type in ("integer", "string") and present.is_unique)
+    return {"data_type": data_type, "is_nullable": "YES" if nulls.any() else "NO", "unique": unique}
+
+def _is_label_row(row: pd.Series) -> bool:
+    # A header row holds only text that does not read as a number
+    labels = row[~null_mask(row)]
+    return len(labels) > 0 and all(isinstance(value, str) and not _NUMERIC.match(value.strip()) for value in labels)
+
+def _is_banner_row(row: pd.Series) -> bool:
+    # A title over the whole sheet: one populated cell, in the first column, and the rest blank
+    present = ~null_mask(row)
+    return len(row) > 1 and bool(present.iloc[0]) and int(present.sum()) == 1
+
+def header_row_count(raw: pd.DataFrame, max_header_rows: int) -> int:
+    """
+    Number of header rows at the top of a sheet read without a header: the leading text-only rows, as long as
+    data rows follow within max_header_rows. Rows above the last header row must have gaps (merged group
+    labels), so a text-only data row under a single header is not mistaken for a second header row.
+    """
+    rows = 0
+    while rows < min(max_header_rows, len(raw)) and _is_label_row(raw.iloc[rows]):
+        rows += 1
+    if rows == len(raw) or (rows == max_header_rows and len(raw) > rows and _is_label_row(raw.iloc[rows])):
+        return 1        # Text all the way down: a single header over text data
+    while rows > 1 and not null_mask(raw.iloc[rows - 2]).any():
+        rows -= 1
+    return max(rows, 1)
+
+def split_header(raw: pd.DataFrame, max_header_rows: int) -> Tuple[List[str], pd.DataFrame]:
+    """
+    Column names and data rows of a sheet read with header=None. Group labels of a multi-row header are
+    carried across the cells they were merged over and joined with the labels below: "Sales / Q1".
+    A title row above the header (one cell over the whole sheet) is dropped rather than joined onto every
+    name. Header text is kept as written, like pandas' own header, so names match a single-row read.
+    """
+    if raw.empty:
+        return [str(column) for column in raw.columns], raw
+    header_rows = header_row_count(raw, max_header_rows)
+    header = raw.iloc[:header_rows].astype(object)
+    header = header.iloc[[row for row in range(header_rows - 1) if not _is_banner_row(header.iloc[row])] + [header_rows - 1]]
+    if len(header) > 1:
+        header.iloc[:-1] = header.iloc[:-1].ffill(axis=1)
+    names = []
+    seen = {}
+    for index, column in enumerate(header.columns):
+        parts = []
+        for value in header[column]:
+            if not pd.isna(value) and str(value).strip() and (not parts or parts[-1] != str(value)):
+                parts.append(str(value))
+        name = " / ".join(parts) or f"Unnamed: {index}"
+        if name in seen:        # Same suffixing as pandas for repeated headers
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    data = raw.iloc[header_rows:].reset_index(drop=True)
+    data.columns = names
+    return names, data
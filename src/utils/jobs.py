@@ -0,0 +1,304 @@
+import json
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from src.utils.logger import get_logger
+from src.utils.serialization import dumps, loads
+from src.utils.streaming import Event, append_event
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = get_logger(__name__)
+
+# queued -> running -> succeeded | failed | cancelled (a queued job can also go straight to cancelled)
+FINISHED_STATES = ("succeeded", "failed", "cancelled")
+PROGRESS_INTERVAL = 0.5     # Seconds between progress writes while a job runs
+
+class JobCancelled(Exception):
+    pass
+
+def _new_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": uuid.uuid4().hex,
+        "status": "queued",
+        "params": params,
+        "progress": {"schemas": 0, "tables": 0, "columns": 0},
+        "error": None,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "owner": None,
+    }
+
+def _owner() -> str:
+    # Worker process running a job; read per call since servers may fork after import
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _owner_gone(owner: Optional[str]) -> bool:
+    # True once the process that was running a job has exited; processes on other hosts are assumed alive
+    host, _, pid = (owner or "").rpartition(":")
+    if not owner or not pid.isdigit():
+        return True
+    if host != socket.gethostname():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+class MemoryJobStore:
+    """
+    Jobs and results held in process memory; lost on restart.
+    """
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._jobs[job["job_id"]] = {**job, "progress": dict(job["progress"])}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return {**job, "progress": dict(job["progress"])} if job else None
+
+    def list(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda job: job["created_at"], reverse=True)[:limit]
+            return [{**job, "progress": dict(job["progress"])} for job in jobs]
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def transition(self, job_id: str, from_status: str, **fields: Any) -> bool:
+        # Apply `fields` only if the job is still in `from_status`; guards against a concurrent cancel
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["status"] != from_status:
+                return False
+            job.update(fields)
+            return True
+
+    def set_result(self, job_id: str, result: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._results[job_id] = result
+
+    def result(self, job_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            return self._results.get(job_id)
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._results.pop(job_id, None)
+
+    def queued(self) -> List[str]:
+        return []       # Nothing survives a restart
+
+    def recover(self) -> int:
+        return 0
+
+class SQLiteJobStore:
+    """
+    Jobs and results in a local SQLite file, so status and results survive restarts.
+    Jobs still queued at startup are picked up again; jobs whose worker process has exited are marked failed.
+    """
+    def __init__(self, path: str):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                params TEXT NOT NULL,
+                progress TEXT NOT NULL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                owner TEXT
+            );
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT PRIMARY KEY,
+                result TEXT NOT NULL
+            );
+        """)
+        if "owner" not in [row[1] for row in self.db.execute("PRAGMA table_info(jobs)")]:        # Files written before jobs had owners
+            with self.db:
+                self.db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+
+    _COLUMNS = ("job_id", "status", "params", "progress", "error", "created_at", "started_at", "finished_at", "owner")
+
+    def _row_to_job(self, row: tuple) -> Dict[str, Any]:
+        job = dict(zip(self._COLUMNS, row))
+        job["params"] = json.loads(job["params"])
+        job["progress"] = json.loads(job["progress"])
+        return job
+
+    def _encode(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: json.dumps(value) if key in ("params", "progress") else value for key, value in fields.items()}
+
+    def create(self, job: Dict[str, Any]) -> None:
+        row = self._encode(job)
+        with self._lock, self.db:
+            self.db.execute(f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) VALUES ({', '.join('?' * len(self._COLUMNS))})",
+                            [row[column] for column in self._COLUMNS])
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.db.execute(f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.db.execute(f"SELECT {', '.join(self._COLUMNS)} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def _set(self, job_id: str, fields: Dict[str, Any], where: str = "", args: tuple = ()) -> int:
+        fields = self._encode(fields)
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock, self.db:
+            return self.db.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?{where}", (*fields.values(), job_id, *args)).rowcount
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        self._set(job_id, fields)
+
+    def transition(self, job_id: str, from_status: str, **fields: Any) -> bool:
+        return self._set(job_id, fields, " AND status = ?", (from_status,)) == 1
+
+    def set_result(self, job_id: str, result: List[Dict[str, Any]]) -> None:
+        payload = dumps(result)
+        with self._lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO job_results VALUES (?, ?)", (job_id, payload))
+
+    def result(self, job_id: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            row = self.db.execute("SELECT result FROM job_results WHERE job_id = ?", (job_id,)).fetchone()
+        return loads(row[0]) if row else None
+
+    def delete(self, job_id: str) -> None:
+        with self._lock, self.db:
+            self.db.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+            self.db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def queued(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self.db.execute("SELECT job_id FROM jobs WHERE status = 'queued' ORDER BY created_at")]
+
+    def recover(self) -> int:
+        # Fail running jobs whose worker process is gone; jobs of other live workers sharing the file are left alone
+        with self._lock:
+            running = self.db.execute("SELECT job_id, owner FROM jobs WHERE status = 'running'").fetchall()
+        lost = [job_id for job_id, owner in running if _owner_gone(owner)]
+        for job_id in lost:
+            self.transition(job_id, "running", status="failed", error="Interrupted by restart", finished_at=time.time())
+        return len(lost)
+
+def create_job_store(backend: str = "memory", path: Optional[str] = None):
+    if backend == "sqlite":
+        return SQLiteJobStore(path)
+    if backend == "memory":
+        return MemoryJobStore()
+    raise ValueError(f"Unsupported job store: {backend}")
+
+class JobManager:
+    """
+    Runs extraction jobs on a fixed set of background worker threads.
+    `runner(params)` returns the job's event stream; workers assemble it into the nested result, publish
+    schema/table/column counts as progress and stop between tables once the job is cancelled.
+    """
+    def __init__(self, store, runner: Callable[[Dict[str, Any]], Iterator[Event]], workers: int = 2):
+        self.store = store
+        self.runner = runner
+        self.workers = max(1, int(workers))
+        self._queue = queue.Queue()
+        self._cancelled = set()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            lost = self.store.recover()
+            if lost:
+                logger.warning(f"Marked {lost} interrupted jobs as failed")
+            for job_id in self.store.queued():      # Resume jobs queued before a restart
+                self._queue.put(job_id)
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            logger.info(f"Started {self.workers} job workers")
+
+    def submit(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.start()
+        job = _new_job(params)
+        self.store.create(job)
+        self._queue.put(job["job_id"])
+        logger.info(f"Queued job {job['job_id']} for {params.get('source')}")
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if self.store.transition(job_id, "queued", status="cancelled", finished_at=time.time()):
+            logger.info(f"Cancelled queued job {job_id}")
+        else:
+            with self._lock:
+                self._cancelled.add(job_id)     # Picked up by the worker at the next table
+        return self.store.get(job_id)
+
+    def _is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancelled
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if not self.store.transition(job_id, "queued", status="running", started_at=time.time(), owner=_owner()):
+                continue        # Cancelled (or deleted) while waiting in the queue
+            try:
+                self._run(job_id)
+            finally:
+                with self._lock:
+                    self._cancelled.discard(job_id)
+
+    def _run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        progress = job["progress"]
+        result = []
+        events = None
+        last_update = 0.0      # The first event is published right away
+        try:
+            events = self.runner(job["params"])
+            for typename, entity in events:
+                if self._is_cancelled(job_id):
+                    raise JobCancelled()
+                append_event(result, typename, entity)
+                progress["schemas" if typename == "SCHEMA" else "tables"] += 1
+                progress["columns"] += len(entity.get("columns", []))
+                if time.monotonic() - last_update >= PROGRESS_INTERVAL:
+                    self.store.update(job_id, progress=progress)
+                    last_update = time.monotonic()
+            self.store.set_result(job_id, result)
+            self.store.update(job_id, status="succeeded", progress=progress, finished_at=time.time())
+            logger.info(f"Job {job_id} succeeded: {progress['schemas']} schemas, {progress['tables']} tables")
+        except JobCancelled:
+            self.store.update(job_id, status="cancelled", progress=progress, finished_at=time.time())
+            logger.info(f"Job {job_id} cancelled after {progress['tables']} tables")
+        except Exception as e:
+            self.store.update(job_id, status="failed", progress=progress, error=str(e), finished_at=time.time())
+            logger.error(f"Job {job_id} failed: {str(e)}")
+        finally:
+            if hasattr(events, "close"):        # Stops the extraction and releases its connection on cancel or failure
+                events.close()
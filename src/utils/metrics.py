@@ -0,0 +1,147 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Seconds; spans sub-millisecond catalog lookups up to multi-second bulk queries and large encodes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: Any) -> str:
+    # Label values escape backslash, double quote and newline in the text exposition format
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List[float]] = {}     # labels -> per-bucket counts, then sum and count
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    bucket_labels = _format_labels(self.labels, labels, 'le="%s"' % bound)
+                    lines.append(f"{self.name}_bucket{bucket_labels} {int(cumulative)}")
+                bucket_labels = _format_labels(self.labels, labels, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {int(series[-1])}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {series[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {int(series[-1])}")
+        return lines
+
+QUERY_SECONDS = Histogram("extractor_query_seconds", "Catalog query latency", ("source", "kind"))
+QUERY_ROWS = Counter("extractor_query_rows_total", "Rows returned by catalog queries", ("source", "kind"))
+QUERY_ERRORS = Counter("extractor_query_errors_total", "Failed catalog queries", ("source", "kind"))
+TRANSFORM_SECONDS = Counter("extractor_transform_seconds_total", "Time spent building entities", ("type",))
+ENTITIES = Counter("extractor_entities_total", "Entities produced by the transformer", ("type",))
+SERIALIZE_SECONDS = Histogram("extractor_serialize_seconds", "Response encoding time (per response, or per entity when streaming)", ("format",))
+RESPONSE_BYTES = Counter("extractor_response_bytes_total", "Encoded response bytes", ("format",))
+METRICS = (QUERY_SECONDS, QUERY_ROWS, QUERY_ERRORS, TRANSFORM_SECONDS, ENTITIES, SERIALIZE_SECONDS, RESPONSE_BYTES)
+
+# Query text -> kind label (schema, table, column, constraint, ...); registered by the modules that own the queries
+_query_kinds: Dict[str, str] = {}
+
+def register_query_kind(query: str, kind: str) -> None:
+    _query_kinds[query] = kind
+
+def _query_kind(query: str) -> str:
+    # Queries generated per table are not registered; they carry their kind as a leading "/* kind */" comment
+    kind = _query_kinds.get(query)
+    if kind is None and query.startswith("/* "):
+        end = query.find(" */")
+        kind = query[3:end] if end > 3 else None
+    return kind or "other"
+
+# Per-request totals, enabled by collect_timings(); a mutable dict so tasks spawned by the request add to the same summary
+_request_timings: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("request_timings", default=None)
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, Any]]:
+    timings = {"queries": 0, "query_seconds": 0.0, "rows": 0, "entities": 0, "transform_seconds": 0.0}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+def observe_query(source: str, query: str, seconds: float, rows: Optional[int]) -> None:
+    # rows is None when the query failed
+    labels = (source, _query_kind(query))
+    QUERY_SECONDS.observe(seconds, labels)
+    if rows is None:
+        QUERY_ERRORS.inc(labels)
+        return
+    QUERY_ROWS.inc(labels, rows)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings["queries"] += 1
+        timings["query_seconds"] += seconds
+        timings["rows"] += rows
+
+def observe_transform(typename: str, seconds: float, entities: int) -> None:
+    TRANSFORM_SECONDS.inc((typename,), seconds)
+    ENTITIES.inc((typename,), entities)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings["entities"] += entities
+        timings["transform_seconds"] += seconds
+
+def observe_serialization(output_format: str, seconds: float, size: int) -> None:
+    SERIALIZE_SECONDS.observe(seconds, (output_format,))
+    RESPONSE_BYTES.inc((output_format,), size)
+
+def server_timing(timings: Dict[str, Any], serialize_seconds: float) -> str:
+    # Server-Timing header value (milliseconds), readable in browser dev tools
+    return ", ".join([
+        f"query;dur={timings['query_seconds'] * 1000:.1f};desc=\"{timings['queries']} queries\"",
+        f"transform;dur={timings['transform_seconds'] * 1000:.1f};desc=\"{timings['entities']} entities\"",
+        f"serialize;dur={serialize_seconds * 1000:.1f}",
+    ])
+
+def render_metrics() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,103 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from src.utils.logger import get_logger
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Union
+
+logger = get_logger(__name__)
+
+MAX_RETRY_DELAY = 60.0      # Seconds; caps the exponential backoff
+
+class RateLimiter:
+    """
+    Token bucket shared by every extraction against the same source.
+    Uses a thread lock rather than an asyncio primitive because Flask runs each async view on its own event loop.
+    """
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:        # Take a token, returning how long the caller must wait for it
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(source: str, rate: float) -> RateLimiter:
+    # One limiter per source (and rate), so concurrent requests against the same catalog share the budget
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(source)
+        if limiter is None or limiter.rate != rate:
+            limiter = _rate_limiters[source] = RateLimiter(rate)
+        return limiter
+
+async def _iterate(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+class QueryScheduler:
+    """
+    Bounded fan-out for catalog queries.
+    `run` caps the number of in-flight queries and applies the per-source rate limit,
+    `map` yields results in input order while keeping at most `max_pending` tasks alive (backpressure); its items
+    may also come from an async iterator, such as an event stream,
+    `retrying` re-runs a failed unit of work (one table's queries) up to `retries` times with exponential backoff.
+    """
+    def __init__(self, concurrency: int = 1, rate_limit: Optional[float] = None, source: str = "default", max_pending: Optional[int] = None,
+                 retries: int = 0, retry_backoff: float = 1.0):
+        self.concurrency = max(1, int(concurrency))
+        self.max_pending = max_pending or self.concurrency * 2
+        self.retries = max(0, int(retries))
+        self.retry_backoff = retry_backoff
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiter = get_rate_limiter(source, rate_limit) if rate_limit else None
+
+    async def run(self, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        async with self._semaphore:
+            if self._limiter:
+                await self._limiter.acquire()
+            return await func(*args)
+
+    async def retrying(self, what: str, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        for attempt in range(self.retries + 1):
+            try:
+                return await func(*args)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                # retry_backoff, then doubling, with jitter so retries against a recovering source spread out
+                delay = min(MAX_RETRY_DELAY, self.retry_backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                logger.warning(f"{what} failed, retry {attempt + 1}/{self.retries} in {delay:.2f}s: {str(e)}")
+                await asyncio.sleep(delay)      # Outside `run`, so a waiting retry holds no query slot
+
+    async def map(self, func: Callable[[Any], Awaitable[Any]], items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+        pending = deque()
+        try:
+            async for item in _iterate(items):
+                pending.append(asyncio.ensure_future(func(item)))
+                if len(pending) >= self.max_pending:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:        # Drop the remaining window on error or early exit
+                task.cancel()
@@ -0,0 +1,119 @@
+import datetime
+import decimal
+import gzip
+import importlib.util
+import json
+import time
+import zlib
+from flask import Response, has_request_context, request
+from src.utils.config import get_serialization_settings
+from src.utils.logger import get_logger
+from src.utils.metrics import observe_serialization, server_timing
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+logger = get_logger(__name__)
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+HAS_ZSTD = importlib.util.find_spec("zstandard") is not None
+if HAS_ORJSON:
+    import orjson
+if HAS_ZSTD:
+    import zstandard
+
+def _default(obj: Any) -> Any:
+    # Catalog values the encoders do not handle natively
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)     # Exact, as the previous encoder produced it
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "items"):       # asyncpg.Record, src.clients.rows.Row
+        return dict(obj.items())
+    if hasattr(obj, "item"):        # numpy scalars from pandas-backed Excel rows
+        return obj.item()
+    return str(obj)
+
+def _orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=_default).encode("utf-8")
+
+SERIALIZERS: Dict[str, Callable[[Any], bytes]] = {"json": _json_dumps}
+if HAS_ORJSON:
+    SERIALIZERS["orjson"] = _orjson_dumps
+
+settings = get_serialization_settings()
+if settings["serializer"] not in SERIALIZERS:
+    logger.warning(f"JSON serializer {settings['serializer']} is not available, using json")
+dumps: Callable[[Any], bytes] = SERIALIZERS.get(settings["serializer"], _json_dumps)
+loads: Callable[[Any], Any] = orjson.loads if HAS_ORJSON else json.loads
+
+def _negotiate(accept_encoding: str) -> Optional[str]:
+    # Preferred response encoding the client accepts; q=0 disables an encoding
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    for encoding in settings["compression"]:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0 and (encoding != "zstd" or HAS_ZSTD):
+            return encoding
+    return None
+
+def _request_encoding() -> Optional[str]:
+    return _negotiate(request.headers.get("Accept-Encoding", "")) if has_request_context() else None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings["zstd_level"]).compress(body)
+    return gzip.compress(body, compresslevel=settings["gzip_level"])
+
+def compress_chunks(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    # Incremental compression for streamed bodies; output is emitted as the compressor fills its buffer
+    if encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=settings["zstd_level"]).compressobj()
+    else:
+        compressor = zlib.compressobj(settings["gzip_level"], zlib.DEFLATED, 31)      # wbits 31: gzip container
+    for chunk in chunks:
+        block = compressor.compress(chunk)
+        if block:
+            yield block
+    yield compressor.flush()
+
+def json_response(payload: Dict[str, Any], status: int = 200, timings: Optional[Dict[str, Any]] = None):
+    """
+    Encode `payload` with the configured serializer, compressing it when the client accepts gzip or zstd.
+    Encoding time and size are recorded; with `timings` (from collect_timings) the summary is added to
+    the payload under "timings" and a Server-Timing header is set.
+    """
+    if timings is not None:
+        payload = {**payload, "timings": {key: round(value, 6) if isinstance(value, float) else value for key, value in timings.items()}}
+    started = time.perf_counter()
+    body = dumps(payload)
+    seconds = time.perf_counter() - started
+    observe_serialization("json", seconds, len(body))
+    response = Response(body, status=status, mimetype="application/json")
+    encoding = _request_encoding()
+    if encoding and len(body) >= settings["compression_min_bytes"]:
+        response.set_data(compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+    if timings is not None:
+        response.headers["Server-Timing"] = server_timing(timings, seconds)
+    return response, status
+
+def stream_response(chunks: Iterable[bytes], mimetype: str):
+    encoding = _request_encoding()
+    if encoding:
+        response = Response(compress_chunks(chunks, encoding), mimetype=mimetype)
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response, 200
+    return Response(chunks, mimetype=mimetype), 200
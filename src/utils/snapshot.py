@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+def entity_hash(entity: Dict[str, Any]) -> str:
+    # Content hash of one flat entity (children are hashed separately)
+    return hashlib.sha256(json.dumps(entity, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class CatalogSnapshot:
+    """
+    SQLite record of the last extraction of one connection: a change signal per table and a
+    content hash per entity keyed by qualifiedName. Writes stay in an open transaction until
+    `commit`, so a failed or abandoned run leaves the previous snapshot untouched.
+    Every SQLite call runs on the snapshot's own thread, so extractions sharing an event loop never wait on disk I/O.
+    Create it with `await CatalogSnapshot.open(...)`.
+    """
+    def __init__(self, connection_qualified_name: str):
+        self.connection_qualified_name = connection_qualified_name
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot")
+
+    @classmethod
+    async def open(cls, path: str, connection_qualified_name: str) -> "CatalogSnapshot":
+        snapshot = cls(connection_qualified_name)
+        try:
+            await snapshot._call(snapshot._open, path)
+        except BaseException:
+            snapshot.executor.shutdown(wait=False)
+            raise
+        return snapshot
+
+    async def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def _open(self, path: str) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS table_signals (
+                table_qualified_name TEXT PRIMARY KEY,
+                connection_qualified_name TEXT NOT NULL,
+                signal TEXT
+            );
+            CREATE TABLE IF NOT EXISTS entities (
+                qualified_name TEXT PRIMARY KEY,
+                connection_qualified_name TEXT NOT NULL,
+                table_qualified_name TEXT,
+                type_name TEXT NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entities_by_table ON entities (table_qualified_name);
+            CREATE INDEX IF NOT EXISTS entities_by_connection ON entities (connection_qualified_name, type_name);
+        """)
+
+    async def table_signals(self) -> Dict[str, str]:
+        return await self._call(self._table_signals)
+
+    def _table_signals(self) -> Dict[str, str]:
+        rows = self.db.execute("SELECT table_qualified_name, signal FROM table_signals WHERE connection_qualified_name = ?",
+                               (self.connection_qualified_name,))
+        return dict(rows.fetchall())
+
+    async def schema_hashes(self) -> Dict[str, str]:
+        return await self._call(self._schema_hashes)
+
+    def _schema_hashes(self) -> Dict[str, str]:
+        rows = self.db.execute("SELECT qualified_name, content_hash FROM entities WHERE connection_qualified_name = ? AND type_name = 'SCHEMA'",
+                               (self.connection_qualified_name,))
+        return dict(rows.fetchall())
+
+    async def table_entities(self, table_qualified_name: str) -> Dict[str, Tuple[str, str]]:
+        # qualifiedName -> (typeName, content hash) for a table and its columns
+        return await self._call(self._table_entities, table_qualified_name)
+
+    def _table_entities(self, table_qualified_name: str) -> Dict[str, Tuple[str, str]]:
+        rows = self.db.execute("SELECT qualified_name, type_name, content_hash FROM entities WHERE table_qualified_name = ?",
+                               (table_qualified_name,))
+        return {qualified_name: (type_name, content_hash) for qualified_name, type_name, content_hash in rows.fetchall()}
+
+    async def replace_schemas(self, hashes: Dict[str, str]) -> None:
+        await self._call(self._replace_schemas, hashes)
+
+    def _replace_schemas(self, hashes: Dict[str, str]) -> None:
+        self.db.execute("DELETE FROM entities WHERE connection_qualified_name = ? AND type_name = 'SCHEMA'", (self.connection_qualified_name,))
+        self.db.executemany("INSERT INTO entities VALUES (?, ?, NULL, 'SCHEMA', ?)",
+                            [(qualified_name, self.connection_qualified_name, content_hash) for qualified_name, content_hash in hashes.items()])
+
+    async def replace_table(self, table_qualified_name: str, signal: str, entities: Iterable[Tuple[str, str, str]]) -> None:
+        # entities: (qualifiedName, typeName, content hash)
+        await self._call(self._replace_table, table_qualified_name, signal, list(entities))
+
+    def _replace_table(self, table_qualified_name: str, signal: str, entities: Iterable[Tuple[str, str, str]]) -> None:
+        self._delete_table(table_qualified_name)
+        self.db.execute("INSERT INTO table_signals VALUES (?, ?, ?)", (table_qualified_name, self.connection_qualified_name, signal))
+        self.db.executemany("INSERT INTO entities VALUES (?, ?, ?, ?, ?)",
+                            [(qualified_name, self.connection_qualified_name, table_qualified_name, type_name, content_hash)
+                             for qualified_name, type_name, content_hash in entities])
+
+    async def delete_table(self, table_qualified_name: str) -> None:
+        await self._call(self._delete_table, table_qualified_name)
+
+    def _delete_table(self, table_qualified_name: str) -> None:
+        self.db.execute("DELETE FROM table_signals WHERE table_qualified_name = ?", (table_qualified_name,))
+        self.db.execute("DELETE FROM entities WHERE table_qualified_name = ?", (table_qualified_name,))
+
+    async def commit(self) -> None:
+        await self._call(self.db.commit)
+
+    async def close(self) -> None:
+        try:
+            await self._call(self.db.close)
+        finally:
+            self.executor.shutdown(wait=False)
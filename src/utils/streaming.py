@@ -0,0 +1,126 @@
+import asyncio
+import queue
+import threading
+import time
+from src.utils.logger import get_logger
+from src.utils.metrics import observe_serialization
+from src.utils.serialization import dumps
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = get_logger(__name__)
+
+# Extractors produce a flat event stream: ("SCHEMA", schema_entity) followed by ("TABLE", table_entity)
+# for each of its tables. Table entities carry their columns and constraints, so a consumer only ever
+# holds one table's worth of metadata.
+Event = Tuple[str, Dict[str, Any]]
+
+_DONE = object()
+
+def append_event(schemas: List[Dict[str, Any]], typename: str, entity: Dict[str, Any]) -> None:
+    # Rebuild the nested schema -> table tree returned by the non-streaming endpoints
+    if typename == "SCHEMA":
+        schemas.append(entity)
+    else:
+        schemas[-1]["tables"].append(entity)
+
+def flatten_table(table_entity: Dict[str, Any], schema_qualified_name: str) -> Iterator[Dict[str, Any]]:
+    # The table without its columns, then each column, all pointing at their parent's qualifiedName
+    table_qualified_name = table_entity["attributes"]["qualifiedName"]
+    yield {**{k: v for k, v in table_entity.items() if k != "columns"}, "parentQualifiedName": schema_qualified_name}
+    for column in table_entity.get("columns", []):
+        yield {**column, "parentQualifiedName": table_qualified_name}
+
+def flatten_events(events: Iterable[Event]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield schema, table and column entities one by one, each child carrying its parent's qualifiedName.
+    """
+    schema_qualified_name = None
+    for typename, entity in events:
+        if typename == "SCHEMA":
+            schema_qualified_name = entity["attributes"]["qualifiedName"]
+            yield {k: v for k, v in entity.items() if k != "tables"}
+        else:
+            yield from flatten_table(entity, schema_qualified_name)
+
+def ndjson_chunks(events: Iterable[Event]) -> Iterator[bytes]:
+    for entity in flatten_events(events):
+        started = time.perf_counter()
+        line = dumps(entity) + b"\n"
+        observe_serialization("ndjson", time.perf_counter() - started, len(line))
+        yield line
+
+def nested_json_chunks(events: Iterable[Event]) -> Iterator[bytes]:
+    # Same document as {"schemas": [...]}, encoded one table at a time
+    yield b'{"schemas":['
+    first_schema = True
+    first_table = True
+    for typename, entity in events:
+        started = time.perf_counter()
+        if typename == "SCHEMA":
+            head = dumps({k: v for k, v in entity.items() if k != "tables"})
+            chunk = (b"" if first_schema else b"]},") + head[:-1] + b',"tables":['
+            first_schema = False
+            first_table = True
+        else:
+            chunk = (b"" if first_table else b",") + dumps(entity)
+            first_table = False
+        observe_serialization("json_stream", time.perf_counter() - started, len(chunk))
+        yield chunk
+    yield (b"]}" if not first_schema else b"") + b"]}"
+
+STREAM_FORMATS: Dict[str, Tuple[Callable[[Iterable[Event]], Iterator[bytes]], str]] = {
+    "ndjson": (ndjson_chunks, "application/x-ndjson"),
+    "json_stream": (nested_json_chunks, "application/json"),
+}
+
+def iterate_async(factory: Callable[[], AsyncIterator[Any]], maxsize: int = 16,
+                  loop: Optional[asyncio.AbstractEventLoop] = None) -> Iterator[Any]:
+    """
+    Drive an async generator on a private event loop thread and hand its items to a sync consumer
+    (a WSGI response body). The bounded queue applies backpressure: the producer pauses when the
+    client reads slowly, and stops when the consumer goes away.
+    With `loop`, the generator runs on that already running loop instead (the client registry's, whose
+    pooled connections are bound to it).
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    async def put(item: Any) -> bool:
+        while not stopped.is_set():     # Polls rather than blocking, so a shared loop keeps serving other streams
+            try:
+                items.put_nowait(item)
+                return True
+            except queue.Full:
+                await asyncio.sleep(0.005)
+        return False
+
+    async def produce():
+        agen = factory()
+        try:
+            async for item in agen:
+                if not await put(item):
+                    break
+        finally:
+            await agen.aclose()
+
+    async def run():
+        try:
+            await produce()
+            await put(_DONE)
+        except BaseException as e:
+            await put(e)
+
+    if loop is None:
+        threading.Thread(target=asyncio.run, args=(run(),), name="stream-producer", daemon=True).start()
+    else:
+        asyncio.run_coroutine_threadsafe(run(), loop)
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
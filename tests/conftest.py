@@ -0,0 +1,42 @@
+import os
+import sys
+import zlib
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.catalog import SyntheticCatalogClient
+
+
+class Catalog(SyntheticCatalogClient):
+    """
+    Synthetic catalog whose change signal follows each table's columns and constraints, like the real
+    signal queries, and which can return catalog rows in reverse order.
+    """
+    def __init__(self, *args, reverse: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reverse = reverse
+
+    def _answer(self, query, args):
+        mode, kind = self._kinds.get(query, (None, None))      # Profiling queries are answered by the base class
+        if kind == "signal":
+            return [{"schema_name": schema_name, "table_name": row["table_name"],
+                     "signal": str(zlib.crc32(repr((self.column_rows.get((schema_name, row["table_name"])),
+                                                    self.constraint_rows.get((schema_name, row["table_name"])))).encode()))}
+                    for schema_name, rows in self.table_rows.items() for row in rows]
+        rows = super()._answer(query, args)
+        return rows[::-1] if self.reverse and kind in ("column", "constraint") else rows
+
+
+@pytest.fixture
+def catalog():
+    return Catalog
+
+
+@pytest.fixture(autouse=True)
+def state_paths(tmp_path, monkeypatch):
+    # Checkpoints and snapshots of each test stay in its own directory
+    monkeypatch.setenv("CHECKPOINT_PATH", str(tmp_path / "checkpoints.db"))
+    monkeypatch.setenv("SNAPSHOT_PATH", str(tmp_path / "snapshots.db"))
+    return tmp_path
@@ -0,0 +1,138 @@
+import asyncio
+import io
+import os
+
+import pytest
+from flask import Flask
+
+from benchmarks.workbook import write_workbook
+from src.routes import database, excel
+from src.routes.excel import fetch_excel_metadata
+from src.utils import cache as cache_module
+from src.utils.cache import ResultCache, cache_key, cached_events
+
+SCHEMAS = [{"attributes": {"qualifiedName": "c/s"}, "tables": [{"attributes": {"qualifiedName": "c/s/t"}}]}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResultCache(ttl=10)
+    cache.put("c|a", SCHEMAS)
+    clock[0] += 9
+    assert cache.get("c|a") == SCHEMAS
+    clock[0] += 2
+    assert cache.get("c|a") is None
+    assert cache.stats()["expirations"] == 1 and cache.stats()["memory_entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResultCache(max_entries=2)
+    cache.put("c|a", [1])
+    cache.put("c|b", [2])
+    assert cache.get("c|a") == [1]      # b is now the least recently used
+    cache.put("c|c", [3])
+    assert cache.get("c|b") is None
+    assert cache.get("c|a") == [1] and cache.get("c|c") == [3]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_budget_evicts_and_skips_oversized_entries():
+    cache = ResultCache(max_bytes=200)
+    cache.put("c|a", ["x" * 60])
+    cache.put("c|b", ["x" * 60])
+    assert cache.stats()["memory_entries"] == 1 and cache.get("c|b") is not None
+    cache.put("c|huge", ["x" * 500])
+    assert cache.get("c|huge") is None and cache.get("c|b") is not None
+
+
+def test_disk_entries_are_promoted_to_memory(tmp_path, clock):
+    ResultCache(ttl=10, disk_dir=str(tmp_path)).put("c|a", SCHEMAS)
+    restarted = ResultCache(ttl=10, disk_dir=str(tmp_path))
+    assert restarted.get("c|a") == SCHEMAS
+    assert restarted.get("c|a") == SCHEMAS
+    stats = restarted.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["memory_entries"]) == (1, 1, 1)
+
+    clock[0] += 11      # Expiry is stored with the entry, so the disk tier honours the TTL too
+    assert ResultCache(ttl=10, disk_dir=str(tmp_path)).get("c|a") is None
+    assert not os.listdir(tmp_path)
+
+
+def test_disk_budget_evicts_oldest_files(tmp_path):
+    cache = ResultCache(disk_dir=str(tmp_path), max_disk_bytes=250)
+    for index, name in enumerate(["a", "b", "c"]):
+        cache.put(f"c|{name}", ["x" * 50])
+        path = cache._disk_path(f"c|{name}")
+        os.utime(path, (index, index))      # Distinct mtimes, oldest first
+    cache.put("c|d", ["x" * 50])
+    assert len(os.listdir(tmp_path)) < 4
+    assert not os.path.exists(cache._disk_path("c|a"))
+    assert os.path.exists(cache._disk_path("c|d"))
+
+
+def test_invalidate_one_connection(tmp_path):
+    cache = ResultCache(disk_dir=str(tmp_path))
+    cache.put(cache_key("c1", "x"), [1])
+    cache.put(cache_key("c2", "x"), [2])
+    assert cache.invalidate("c1") == 2      # Memory and disk copies
+    assert ResultCache(disk_dir=str(tmp_path)).get(cache_key("c2", "x")) == [2]
+    assert cache.get(cache_key("c1", "x")) is None
+
+
+def test_cached_events_only_extract_on_a_miss():
+    cache = ResultCache()
+    started = []
+
+    def events():
+        started.append(True)
+        yield "SCHEMA", {"attributes": {"qualifiedName": "c/s"}, "tables": []}
+        yield "TABLE", {"attributes": {"qualifiedName": "c/s/t"}}
+
+    first = list(cached_events(cache, "c|k", events()))
+    second = list(cached_events(cache, "c|k", events()))
+    assert first == second and len(started) == 1
+
+
+def test_excel_cache_is_keyed_by_content(tmp_path):
+    path = write_workbook(str(tmp_path / "book.xlsx"), sheets=1, columns=2, rows=5)
+    cache = ResultCache()
+    first = fetch_excel_metadata(path, "default/excel", cache=cache)
+    assert fetch_excel_metadata(path, "default/excel", cache=cache) == first
+    write_workbook(path, sheets=2, columns=2, rows=5)
+    assert len(fetch_excel_metadata(path, "default/excel", cache=cache)) == 2
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_database_cache_follows_change_signals(catalog):
+    cache = ResultCache()
+    client = catalog(schemas=2, tables=3)
+
+    def fetch():
+        return asyncio.run(database.fetch_db_metadata(client, {"database": "d"}, "test/connection", "postgresql", cache=cache))
+
+    first = fetch()
+    queries = client.query_count
+    assert fetch() == first
+    assert client.query_count - queries == 2        # Schemas and signals only
+    client.column_rows[("schema_0", "table_0")][0]["data_type"] = "bigint"
+    assert fetch() != first
+
+
+@pytest.mark.parametrize("form, hits", [({}, 0), ({"cache": "false"}, 0), ({"cache": "true"}, 1)])
+def test_excel_endpoint_caches_only_on_request(tmp_path, monkeypatch, form, hits):
+    cache = ResultCache()
+    monkeypatch.setattr(excel, "result_cache", cache)
+    app = Flask(__name__)
+    excel.register_excel_route(app)
+    with open(write_workbook(str(tmp_path / "book.xlsx"), sheets=1, columns=2, rows=5), "rb") as f:
+        body = f.read()
+    for _ in range(2):
+        response = app.test_client().post("/extract_excel", data={**form, "file": (io.BytesIO(body), "book.xlsx")})
+        assert response.status_code == 200
+    assert cache.stats()["memory_hits"] == hits
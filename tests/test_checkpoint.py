@@ -0,0 +1,115 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from src.routes import database
+from src.utils import checkpoint as checkpoint_module
+from src.utils.checkpoint import ExtractionCheckpoint, checkpoint_run_id
+
+CREDENTIALS = {"database": "catalog"}
+CONNECTION = "test/connection"
+
+
+def fetch(client, db_type="postgresql", **options):
+    return asyncio.run(database.fetch_db_metadata(client, CREDENTIALS, CONNECTION, db_type, **options))
+
+
+class Flaky:
+    """Makes the column query of some tables fail a number of times."""
+    def __init__(self, client, tables, times):
+        self.client, self.tables, self.times = client, set(tables), times
+        self.failures, self.column_queries = {}, 0
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    async def execute_query(self, query, *args, timeout=None):
+        if self.client._kinds.get(query) == ("per_table", "column"):
+            self.column_queries += 1
+            if args[:2] in self.tables and self.failures.get(args[:2], 0) < self.times:
+                self.failures[args[:2]] = self.failures.get(args[:2], 0) + 1
+                raise ConnectionError(f"dropped on {args[:2]}")
+        return await self.client.execute_query(query, *args)
+
+
+def test_transient_failures_are_retried(catalog):
+    full = fetch(catalog(schemas=2, tables=5))
+    client = Flaky(catalog(schemas=2, tables=5), [("schema_0", "table_3")], times=2)
+    assert fetch(client, retries=3, retry_backoff=0.001) == full
+    assert client.column_queries == 12
+
+
+def test_checkpoint_resume_matches_full_run(catalog):
+    full = fetch(catalog(schemas=2, tables=5))
+    client = Flaky(catalog(schemas=2, tables=5), [("schema_1", "table_2")], times=99)
+    with pytest.raises(ConnectionError):
+        fetch(client, retries=1, retry_backoff=0.001, checkpoint=True)
+
+    resumed = Flaky(catalog(schemas=2, tables=5), [], times=0)
+    assert fetch(resumed, checkpoint=True, resume=True) == full
+    assert resumed.column_queries == 3      # Only schema_1.table_2 to table_4 are queried again
+
+    again = Flaky(catalog(schemas=2, tables=5), [], times=0)
+    assert fetch(again, checkpoint=True, resume=True) == full
+    assert again.column_queries == 10       # The finished run is not resumed
+
+
+def test_failed_run_keeps_completed_tables_on_disk(catalog, state_paths):
+    client = Flaky(catalog(schemas=1, tables=4), [("schema_0", "table_2")], times=99)
+    with pytest.raises(ConnectionError):
+        fetch(client, checkpoint=True)
+    db = sqlite3.connect(str(state_paths / "checkpoints.db"))
+    (status,), = db.execute("SELECT status FROM checkpoint_runs").fetchall()
+    tables = sorted(name for name, in db.execute("SELECT table_qualified_name FROM checkpoint_tables"))
+    assert status == "running"
+    assert tables == [f"{CONNECTION}/schema_0/table_0", f"{CONNECTION}/schema_0/table_1"]
+
+
+def test_resume_only_continues_the_same_run_options(catalog):
+    client = Flaky(catalog(schemas=2, tables=3), [("schema_1", "table_0")], times=99)
+    with pytest.raises(ConnectionError):
+        fetch(client, checkpoint=True)
+    narrowed = Flaky(catalog(schemas=2, tables=3), [], times=0)
+    fetch(narrowed, checkpoint=True, resume=True, profile={"rows": 10, "timeout": 5.0, "top_k": 1})
+    assert narrowed.column_queries == 6     # A different run id: nothing carried over
+    assert checkpoint_run_id(CONNECTION, "postgresql", None, False) != checkpoint_run_id(CONNECTION, "postgresql", None, True)
+
+
+def test_sqlite_calls_run_on_the_checkpoint_thread(catalog, state_paths, monkeypatch):
+    threads = set()
+    for name in ("_open", "_start", "_add_table", "_finish", "_close"):
+        original = getattr(ExtractionCheckpoint, name)
+
+        def recording(self, *args, _original=original):
+            threads.add(threading.current_thread().name)
+            return _original(self, *args)
+        monkeypatch.setattr(ExtractionCheckpoint, name, recording)
+
+    async def run():
+        loop_thread = threading.current_thread().name
+        result = [event async for event in database.iter_db_metadata(catalog(schemas=1, tables=3), CREDENTIALS, CONNECTION,
+                                                                     "postgresql", checkpoint=True)]
+        return loop_thread, result
+    loop_thread, events = asyncio.run(run())
+    assert len(events) == 4
+    assert threads and loop_thread not in threads
+    assert all(name.startswith("checkpoint") for name in threads)
+
+
+def test_tables_are_committed_between_intervals(state_paths, monkeypatch):
+    monkeypatch.setattr(checkpoint_module, "COMMIT_INTERVAL", 0)
+    path = str(state_paths / "checkpoints.db")
+
+    async def run():
+        store = await ExtractionCheckpoint.open(path, "run")
+        assert await store.start(resume=False) == 0
+        await store.add_table({"attributes": {"qualifiedName": "c/s/t"}, "columns": []})
+        reader = sqlite3.connect(path)      # Another connection sees the table before close
+        visible = reader.execute("SELECT COUNT(*) FROM checkpoint_tables").fetchone()[0]
+        assert await store.table("c/s/t") == {"attributes": {"qualifiedName": "c/s/t"}, "columns": []}
+        assert await store.table("c/s/other") is None
+        await store.close()
+        return visible
+    assert asyncio.run(run()) == 1
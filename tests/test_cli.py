@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.workbook import write_workbook
+from src import cli
+from src.cli import EXIT_FAILED, EXIT_INTERRUPTED, EXIT_OK, EXIT_USAGE, main
+from src.routes import database
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class BrokenCatalog:
+    async def connect(self, credentials):
+        raise ConnectionError("connection refused")
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def postgres(monkeypatch, catalog):
+    def use(client_factory):
+        monkeypatch.setitem(database.DB_SOURCES, "postgres", (client_factory, "PG", "default/postgresql", "postgresql"))
+    use(lambda: catalog(schemas=2, tables=3))
+    return use
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / "small.xlsx")
+    write_workbook(path, sheets=2, columns=4, rows=10)
+    return path
+
+
+def test_database_writes_output(postgres, tmp_path):
+    output = tmp_path / "postgres.json"
+    assert main(["postgres", "--output", str(output)]) == EXIT_OK
+    schemas = json.loads(output.read_text())["schemas"]
+    assert [schema["attributes"]["qualifiedName"] for schema in schemas] == ["default/postgresql/schema_0", "default/postgresql/schema_1"]
+
+
+def test_database_usage_errors(postgres, tmp_path):
+    assert main(["postgres"]) == EXIT_USAGE       # json needs --output
+    assert main(["postgres", "--concurrency", "0", "--output", str(tmp_path / "out.json")]) == EXIT_USAGE
+
+
+def test_database_failure(postgres, tmp_path):
+    postgres(BrokenCatalog)
+    output = tmp_path / "postgres.json"
+    assert main(["postgres", "--output", str(output)]) == EXIT_FAILED
+    assert not output.exists()
+
+
+def test_excel(workbook, tmp_path):
+    output = tmp_path / "excel.json"
+    assert main(["excel", workbook, "--output", str(output)]) == EXIT_OK
+    assert len(json.loads(output.read_text())["schemas"]) == 2      # One per sheet
+    assert main(["excel", str(tmp_path / "missing.xlsx"), "--output", str(output)]) == EXIT_USAGE
+
+
+def test_database_streamed_formats_match_json(postgres, tmp_path):
+    assert main(["postgres", "--output", str(tmp_path / "full.json")]) == EXIT_OK
+    assert main(["postgres", "--format", "json_stream", "--output", str(tmp_path / "stream.json")]) == EXIT_OK
+    assert json.loads((tmp_path / "stream.json").read_text()) == json.loads((tmp_path / "full.json").read_text())
+    assert main(["postgres", "--format", "ndjson", "--output", str(tmp_path / "out.ndjson")]) == EXIT_OK
+    lines = (tmp_path / "out.ndjson").read_text().splitlines()
+    assert len(lines) == 2 + 2 * 3 + 2 * 3 * 10
+    assert not list(tmp_path.glob("*.partial"))
+
+
+def test_database_export(postgres, tmp_path):
+    assert main(["postgres", "--bulk", "--format", "parquet", "--output", str(tmp_path / "exports")]) == EXIT_OK
+    export, = (tmp_path / "exports" / "default_postgresql").iterdir()
+    assert sorted(path.name for path in export.iterdir()) == ["columns.parquet", "constraints.parquet", "schemas.parquet", "tables.parquet"]
+
+
+def test_excel_batch_and_usage_errors(workbook, tmp_path):
+    second = write_workbook(str(tmp_path / "second.xlsx"), sheets=1, columns=3, rows=5)
+    output = tmp_path / "excel.json"
+    assert main(["excel", workbook, second, "--max-workers", "2", "--output", str(output)]) == EXIT_OK
+    assert len(json.loads(output.read_text())["schemas"]) == 3
+    assert main(["excel", workbook]) == EXIT_USAGE      # json needs --output
+    assert main(["excel", str(tmp_path / "notes.txt"), "--output", str(output)]) == EXIT_USAGE
+
+
+@pytest.mark.parametrize("argv", [["postgres", "--format", "xml"], ["excel", "a.xlsx", "--sample-rows", "many"], ["sources"], []])
+def test_bad_arguments_exit_with_usage(argv):
+    with pytest.raises(SystemExit) as exit_info:
+        main(argv)
+    assert exit_info.value.code == EXIT_USAGE
+
+
+def test_interrupt(monkeypatch, tmp_path):
+    def interrupted(args):
+        raise KeyboardInterrupt()
+    monkeypatch.setitem(cli.COMMANDS, "excel", interrupted)
+    assert main(["excel", "a.xlsx", "--output", str(tmp_path / "out.json")]) == EXIT_INTERRUPTED
+
+
+def test_excel_run_loads_no_database_driver(workbook, tmp_path):
+    script = (f"import sys; from src.cli import main; "
+              f"code = main(['excel', {workbook!r}, '--output', {str(tmp_path / 'out.json')!r}]); "
+              f"print(code, sorted(m for m in ('asyncpg', 'mysql.connector', 'oracledb') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=120)
+    assert result.stdout.strip().splitlines()[-1] == "0 []"
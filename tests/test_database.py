@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from src.routes import database
+
+CREDENTIALS = {"database": "catalog"}
+CONNECTION = "test/connection"
+
+
+def fetch(client, db_type="postgresql", **options):
+    return asyncio.run(database.fetch_db_metadata(client, CREDENTIALS, CONNECTION, db_type, **options))
+
+
+@pytest.mark.parametrize("db_type", ["postgresql", "mysql", "oracle"])
+def test_bulk_matches_per_table(catalog, db_type):
+    per_table = fetch(catalog(db_type, schemas=3, tables=4, columns=5, constraints=3), db_type)
+    bulk = fetch(catalog(db_type, schemas=3, tables=4, columns=5, constraints=3), db_type, bulk=True)
+    concurrent = fetch(catalog(db_type, schemas=3, tables=4, columns=5, constraints=3), db_type, concurrency=8)
+    assert bulk == per_table
+    assert concurrent == per_table
+    assert sum(len(schema["tables"]) for schema in per_table) == 12
+
+
+def test_catalog_row_order_does_not_change_output(catalog):
+    ordered = fetch(catalog(schemas=2, tables=3, columns=6, constraints=4))
+    reversed_rows = fetch(catalog(schemas=2, tables=3, columns=6, constraints=4, reverse=True))
+    reversed_bulk = fetch(catalog(schemas=2, tables=3, columns=6, constraints=4, reverse=True), bulk=True)
+    assert reversed_rows == ordered
+    assert reversed_bulk == ordered
+    columns = ordered[0]["tables"][0]["columns"]
+    assert [column["attributes"]["order"] for column in columns] == list(range(1, 7))
@@ -0,0 +1,104 @@
+import io
+import os
+
+import openpyxl
+import pytest
+from flask import Flask
+
+from benchmarks.workbook import write_workbook
+from src.routes import excel
+from src.routes.excel import DEFAULT_SAMPLE_ROWS, _sample_rows, fetch_excel_batch_metadata, fetch_excel_metadata, register_excel_route
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return write_workbook(str(tmp_path / "small.xlsx"), sheets=2, columns=5, rows=20)
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    register_excel_route(app)
+    return app.test_client()
+
+
+def test_sheets_become_schemas_with_inferred_columns(workbook):
+    schemas = fetch_excel_metadata(workbook, "default/excel")
+    assert [schema["attributes"]["name"] for schema in schemas] == ["Sheet_0", "Sheet_1"]
+    table, = schemas[0]["tables"]
+    columns = {column["attributes"]["name"]: column["attributes"] for column in table["columns"]}
+    assert list(columns) == [f"column_{c}" for c in range(5)]
+    assert [columns[f"column_{c}"]["order"] for c in range(5)] == [1, 2, 3, 4, 5]
+    assert not any(column["isNullable"] for column in columns.values())
+
+
+def test_sample_rows_bounds_the_rows_read(tmp_path):
+    path = str(tmp_path / "late_null.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["id"])
+    for row in range(50):
+        sheet.append([row if row != 40 else None])
+    workbook.save(path)
+
+    def nullable(sample_rows):
+        return fetch_excel_metadata(path, "default/excel", sample_rows)[0]["tables"][0]["columns"][0]["attributes"]["isNullable"]
+    assert nullable(10) is False
+    assert nullable(None) is True
+
+
+@pytest.mark.parametrize("data, expected", [
+    ({}, DEFAULT_SAMPLE_ROWS),
+    ({"sample_rows": ""}, DEFAULT_SAMPLE_ROWS),
+    ({"sample_rows": "25"}, 25),
+    ({"sample_rows": 25}, 25),
+    ({"sample_rows": "0"}, None),
+    ({"sample_rows": 0}, None),     # Every row, also from JSON bodies and the CLI
+    ({"sample_rows": -1}, None),
+])
+def test_sample_rows(data, expected):
+    assert _sample_rows(data) == expected
+
+
+@pytest.mark.parametrize("value", ["abc", "1.5", [10]])
+def test_invalid_sample_rows(value):
+    with pytest.raises(ValueError, match="sample_rows must be"):
+        _sample_rows({"sample_rows": value})
+
+
+@pytest.mark.parametrize("path", ["/extract_excel", "/extract_excel_batch"])
+def test_invalid_sample_rows_is_a_bad_request(client, workbook, path):
+    with open(workbook, "rb") as f:
+        body = f.read()
+    field = "file" if path == "/extract_excel" else "files"
+    response = client.post(path, data={"sample_rows": "abc", field: (io.BytesIO(body), "small.xlsx")})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "sample_rows must be an integer, got 'abc'"}
+
+
+def test_batch_matches_workbooks_extracted_in_turn(tmp_path):
+    paths = [write_workbook(str(tmp_path / f"book_{index}.xlsx"), sheets=index + 1, columns=3, rows=10) for index in range(3)]
+    expected = [schema for path in paths for schema in fetch_excel_metadata(path, "default/excel")]
+    assert fetch_excel_batch_metadata(paths, "default/excel", max_workers=2) == expected
+
+
+def test_batch_failure_is_raised(tmp_path, workbook):
+    broken = tmp_path / "broken.xlsx"
+    broken.write_bytes(b"not a workbook")
+    with pytest.raises(Exception):
+        fetch_excel_batch_metadata([workbook, str(broken)], "default/excel")
+
+
+def test_available_cores_without_affinity(monkeypatch):
+    monkeypatch.delattr(os, "sched_getaffinity", raising=False)      # macOS and Windows
+    monkeypatch.setattr(os, "cpu_count", lambda: 6)
+    assert excel._available_cores() == 6
+    monkeypatch.setattr(os, "cpu_count", lambda: None)
+    assert excel._available_cores() == 1
+
+
+def test_invalid_max_workers_is_a_bad_request(client, workbook):
+    with open(workbook, "rb") as f:
+        response = client.post("/extract_excel_batch", data={"max_workers": "all", "files": (io.BytesIO(f.read()), "small.xlsx")})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "max_workers must be an integer, got 'all'"}
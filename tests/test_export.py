@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.routes import database
+from src.utils import export
+from src.utils.export import EXPORT_FIELDS, export_events, export_events_async
+
+CREDENTIALS = {"database": "catalog"}
+CONNECTION = "test/connection"
+
+
+def events(client):
+    async def collect():
+        return [event async for event in database.iter_db_metadata(client, CREDENTIALS, CONNECTION, "postgresql")]
+    return asyncio.run(collect())
+
+
+def read(path):
+    if path.endswith(".parquet"):
+        return pq.read_table(path)
+    with pa.ipc.open_file(path) as reader:
+        return reader.read_all()
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_exported_files_read_back_as_the_extracted_catalog(catalog, tmp_path, export_format):
+    extracted = events(catalog(schemas=2, tables=3, columns=4))
+    manifest = export_events(extracted, str(tmp_path / "out"), export_format, batch_rows=5)
+    tables = {name: read(manifest["files"][name]["path"]) for name in EXPORT_FIELDS}
+    for name, fields in EXPORT_FIELDS.items():
+        assert tables[name].column_names == [field for field, _ in fields]
+        assert tables[name].num_rows == manifest["files"][name]["rows"]
+
+    schemas = [entity for typename, entity in extracted if typename == "SCHEMA"]
+    table_entities = [entity for typename, entity in extracted if typename != "SCHEMA"]
+    assert tables["schemas"].column("qualified_name").to_pylist() == [schema["attributes"]["qualifiedName"] for schema in schemas]
+    assert tables["tables"].column("qualified_name").to_pylist() == [table["attributes"]["qualifiedName"] for table in table_entities]
+    columns = tables["columns"].to_pylist()
+    expected = [(table["attributes"]["qualifiedName"], column) for table in table_entities for column in table["columns"]]
+    assert len(columns) == len(expected) == 2 * 3 * 4
+    for row, (table_qualified_name, column) in zip(columns, expected):
+        assert row["qualified_name"] == column["attributes"]["qualifiedName"]
+        assert row["table_qualified_name"] == table_qualified_name
+        assert row["data_type"] == column["attributes"]["dataType"]
+        assert row["order"] == int(column["attributes"]["order"])
+        assert row["is_nullable"] == bool(column["attributes"]["isNullable"])
+    assert set(tables["tables"].column("schema_qualified_name").to_pylist()) == set(tables["schemas"].column("qualified_name").to_pylist())
+
+
+def test_empty_export_still_writes_every_file(tmp_path):
+    manifest = export_events([], str(tmp_path / "out"), "parquet")
+    for name in EXPORT_FIELDS:
+        assert read(manifest["files"][name]["path"]).num_rows == 0
+
+
+def test_async_export_matches_sync_and_writes_off_the_event_loop(catalog, tmp_path, monkeypatch):
+    extracted = events(catalog(schemas=3, tables=5, columns=2))
+    expected = export_events(extracted, str(tmp_path / "sync"), "parquet")
+    monkeypatch.setattr(export, "CHUNK_EVENTS", 4)
+    writer_threads = set()
+    add = export.CatalogExportWriter.add
+
+    def recording_add(self, typename, entity):
+        writer_threads.add(threading.current_thread().name)
+        add(self, typename, entity)
+    monkeypatch.setattr(export.CatalogExportWriter, "add", recording_add)
+
+    async def run():
+        return threading.current_thread().name, await export_events_async(_aiter(extracted), str(tmp_path / "async"), "parquet")
+    loop_thread, manifest = asyncio.run(run())
+    assert writer_threads and loop_thread not in writer_threads
+    assert all(name.startswith("export") for name in writer_threads)
+    for name in EXPORT_FIELDS:
+        assert read(manifest["files"][name]["path"]).equals(read(expected["files"][name]["path"]))
+
+
+def test_failed_async_export_removes_the_partial_export(catalog, tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_EVENTS", 2)
+    extracted = events(catalog(schemas=2, tables=3))
+
+    async def failing():
+        for event in extracted[:5]:
+            yield event
+        raise RuntimeError("connection lost")
+
+    directory = str(tmp_path / "out")
+    with pytest.raises(RuntimeError, match="connection lost"):
+        asyncio.run(export_events_async(failing(), directory, "arrow"))
+    for _ in range(100):        # The abort is queued on the writer thread
+        if not os.path.exists(directory):
+            break
+        threading.Event().wait(0.01)
+    assert not os.path.exists(directory)
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from src.routes import database
+from src.routes.database import CHECKSUM_SIGNAL_QUERIES, SIGNAL_QUERIES, iter_db_changes, signal_query
+
+CREDENTIALS = {"database": "catalog"}
+CONNECTION = "test/connection"
+NO_CHANGES = {"created": set(), "updated": set(), "deleted": set()}
+
+
+def changes(client, snapshot_path, db_type="postgresql", **options):
+    async def collect():
+        result = {"created": set(), "updated": set(), "deleted": set()}
+        async for change, entity in iter_db_changes(client, CREDENTIALS, CONNECTION, db_type, snapshot_path, **options):
+            result[change].add(entity["attributes"]["qualifiedName"])
+        return result
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("db_type", ["postgresql", "mysql", "oracle"])
+def test_incremental_changes(catalog, state_paths, db_type):
+    snapshot_path = str(state_paths / "incremental.db")
+    client = catalog(db_type, schemas=2, tables=3, columns=2, constraints=1)
+    first = changes(client, snapshot_path, db_type)
+    # 2 schemas, 6 tables of 2 columns each
+    assert (len(first["created"]), first["updated"], first["deleted"]) == (2 + 6 + 12, set(), set())
+    assert changes(client, snapshot_path, db_type) == NO_CHANGES
+
+    client.column_rows[("schema_0", "table_1")].append(
+        {"column_name": "added", "data_type": "text", "is_nullable": "YES", "ordinal_position": 3, "description": None})
+    client.column_rows[("schema_0", "table_2")][1]["data_type"] = "bigint"
+    client.table_rows["schema_1"] = [row for row in client.table_rows["schema_1"] if row["table_name"] != "table_0"]
+    client.table_rows["schema_1"].append({"table_name": "table_new", "description": None})
+    client.column_rows[("schema_1", "table_new")] = [
+        {"column_name": "id", "data_type": "integer", "is_nullable": "NO", "ordinal_position": 1, "description": None}]
+    client.constraint_rows[("schema_1", "table_new")] = []
+
+    queries = client.query_count
+    assert changes(client, snapshot_path, db_type) == {
+        "created": {f"{CONNECTION}/schema_0/table_1/added", f"{CONNECTION}/schema_1/table_new", f"{CONNECTION}/schema_1/table_new/id"},
+        "updated": {f"{CONNECTION}/schema_0/table_2/column_1"},
+        "deleted": {f"{CONNECTION}/schema_1/table_0", f"{CONNECTION}/schema_1/table_0/column_0", f"{CONNECTION}/schema_1/table_0/column_1"},
+    }
+    # Schemas, signals, the tables of schema_0 and schema_1, then columns and constraints of the 3 changed tables
+    assert client.query_count - queries == 2 + 2 + 3 * 2
+    assert changes(client, snapshot_path, db_type) == NO_CHANGES
+
+
+def test_failed_run_leaves_snapshot_untouched(catalog, state_paths):
+    snapshot_path = str(state_paths / "incremental.db")
+    client = catalog(schemas=1, tables=2, columns=1)
+    changes(client, snapshot_path)
+    client.column_rows[("schema_0", "table_0")][0]["data_type"] = "bigint"
+
+    original = client.execute_query
+
+    async def execute_query(query, *args, timeout=None):
+        if client._kinds[query] == ("per_table", "column"):
+            raise ConnectionError("dropped")
+        return await original(query, *args)
+
+    client.execute_query = execute_query
+    with pytest.raises(ConnectionError):
+        changes(client, snapshot_path)
+    del client.execute_query
+    assert changes(client, snapshot_path) == {**NO_CHANGES, "updated": {f"{CONNECTION}/schema_0/table_0/column_0"}}
+
+
+def test_catalog_queries_are_retried(catalog, state_paths):
+    client = catalog(schemas=1, tables=2)
+    original = client.execute_query
+    failures = {"schema": 1, "signal": 1}
+
+    async def execute_query(query, *args, timeout=None):
+        kind = client._kinds[query][1]
+        if failures.get(kind):
+            failures[kind] -= 1
+            raise ConnectionError(f"{kind} query dropped")
+        return await original(query, *args)
+
+    client.execute_query = execute_query
+    result = changes(client, str(state_paths / "incremental.db"), retries=1, retry_backoff=0.001)
+    assert len(result["created"]) == 1 + 2 + 2 * 10
+    assert failures == {"schema": 0, "signal": 0}
+
+
+def test_checksum_signals_are_opt_in(monkeypatch):
+    assert signal_query("mysql") == SIGNAL_QUERIES["mysql"]
+    assert "information_schema.COLUMNS" not in signal_query("mysql")
+    monkeypatch.setenv("SIGNAL_CHECKSUMS", "true")
+    assert signal_query("mysql") == CHECKSUM_SIGNAL_QUERIES["mysql"]
+    assert signal_query("postgresql") == SIGNAL_QUERIES["postgresql"]
+    query, *args = database.selective_query("signal", "mysql", database.parse_selection({"include_schemas": "sales"}))
+    assert query.startswith(CHECKSUM_SIGNAL_QUERIES["mysql"].rstrip()) and args == ["sales"]
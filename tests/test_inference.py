@@ -0,0 +1,113 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.inference import header_row_count, infer_column, split_header
+
+
+def infer(values, **kwargs):
+    return infer_column(pd.Series(values, dtype=object), **kwargs)
+
+
+@pytest.mark.parametrize("values, data_type", [
+    (["00123", "00456", "01000"], "string"),           # Zip codes and account numbers keep their zeros
+    (["0", "12", "-7"], "integer"),
+    (["0.5", "12", ".25"], "float"),
+    (["1,234", "12,345,678", "999"], "integer"),
+    (["1,234.50", "2,000"], "float"),
+    (["1,2,3", "4"], "string"),                         # Not thousands grouping
+    (["12,34"], "string"),
+    ([" 42 ", "7"], "integer"),
+    (["true", "False", " TRUE "], "boolean"),
+    (["2024-01-31", "2024-02-29"], "date"),
+    (["2024-01-31T10:15:00", "2024-02-01 00:00:00"], "datetime"),
+    (["2024-13-01", "2024-01-01"], "string"),
+    (["12/31/2024"], "string"),
+    ([datetime.date(2024, 1, 1), datetime.date(2024, 6, 1)], "date"),
+    ([datetime.datetime(2024, 1, 1), datetime.datetime(2024, 1, 2)], "date"),
+    ([datetime.datetime(2024, 1, 1, 9, 30)], "datetime"),
+    ([datetime.time(9, 30), datetime.time(17, 0)], "time"),
+    ([1, "2", 3.0], "integer"),                         # Numbers mixed with numbers typed as text
+    ([1, "two"], "string"),
+    ([None, "N/A", ""], "unknown"),
+])
+def test_inferred_types(values, data_type):
+    assert infer(values)["data_type"] == data_type
+
+
+def test_typed_columns_take_the_dtype_paths():
+    assert infer_column(pd.Series([1, 2, 3]))["data_type"] == "integer"
+    assert infer_column(pd.Series([1.0, 2.0, np.nan]))["data_type"] == "integer"
+    assert infer_column(pd.Series([1.5, 2.0]))["data_type"] == "float"
+    assert infer_column(pd.Series([True, False]))["data_type"] == "boolean"
+    assert infer_column(pd.Series(pd.to_datetime(["2024-01-01", "2024-01-02 12:00"], format="ISO8601")))["data_type"] == "datetime"
+    assert infer_column(pd.Series(["a", "b"], dtype="string"))["data_type"] == "string"
+
+
+def test_chunks_widen_to_a_common_type():
+    assert infer([1, 2, 3, 4, 2.5], chunk_rows=2)["data_type"] == "float"
+    assert infer(["2024-01-01", "2024-01-02", "2024-01-03 10:00"], chunk_rows=2)["data_type"] == "datetime"
+    assert infer([1, 2, "x", 4], chunk_rows=2)["data_type"] == "string"
+
+
+def test_nullability_and_unique():
+    assert infer(["a", "N/A", "b"]) == {"data_type": "string", "is_nullable": "YES", "unique": False}
+    assert infer(["a", "b", "c"]) == {"data_type": "string", "is_nullable": "NO", "unique": True}
+    assert infer([1, 1, 2])["unique"] is False
+    assert infer([1.5, 2.5])["unique"] is False         # Only integer and string columns are key candidates
+    assert infer(["x"])["unique"] is False
+
+
+def frame(rows):
+    return pd.DataFrame(rows, dtype=object)
+
+
+def test_single_header_row():
+    names, data = split_header(frame([["id", "name"], [1, "a"], [2, "b"]]), max_header_rows=3)
+    assert names == ["id", "name"]
+    assert data.to_dict("records") == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+
+def test_text_data_under_a_single_header_is_not_a_second_header():
+    raw = frame([["city", "country"], ["Paris", "France"], ["Lima", "Peru"]])
+    assert header_row_count(raw, 3) == 1
+    assert split_header(raw, 3)[0] == ["city", "country"]
+
+
+def test_multi_row_header_carries_group_labels_across_merged_cells():
+    raw = frame([
+        ["Region", "Sales", None, "Costs", None],
+        [None, "Q1", "Q2", "Q1", "Q2"],
+        ["EU", 10, 20, 5, 6],
+        ["US", 30, 40, 7, 8],
+    ])
+    names, data = split_header(raw, max_header_rows=3)
+    assert names == ["Region", "Sales / Q1", "Sales / Q2", "Costs / Q1", "Costs / Q2"]
+    assert len(data) == 2 and data.iloc[1]["Costs / Q2"] == 8
+
+
+def test_banner_row_is_dropped_from_names():
+    raw = frame([
+        ["Quarterly report 2024", None, None],
+        ["Region", "Sales", None],
+        [None, "Q1", "Q2"],
+        ["EU", 10, 20],
+    ])
+    names, data = split_header(raw, max_header_rows=4)
+    assert names == ["Region", "Sales / Q1", "Sales / Q2"]
+    assert data.to_dict("records") == [{"Region": "EU", "Sales / Q1": 10, "Sales / Q2": 20}]
+
+
+def test_banner_over_a_single_header_row():
+    raw = frame([["Customer list", None], ["id", "email"], [1, "a@example.com"]])
+    names, data = split_header(raw, max_header_rows=3)
+    assert names == ["id", "email"]
+    assert len(data) == 1
+
+
+def test_header_text_is_kept_and_repeats_are_suffixed_like_pandas():
+    names, _ = split_header(frame([[" Amount ", "Amount", "Amount", None], [1, 2, 3, 4]]), max_header_rows=2)
+    assert names == [" Amount ", "Amount", "Amount.1", "Unnamed: 3"]
+
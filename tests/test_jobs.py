@@ -0,0 +1,210 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from benchmarks.workbook import write_workbook
+from src.routes import jobs as job_routes
+from src.utils import jobs
+from src.utils.jobs import JobManager, MemoryJobStore, SQLiteJobStore, _new_job
+
+
+def _schema(name):
+    return "SCHEMA", {"attributes": {"name": name, "qualifiedName": f"db/{name}"}, "tables": []}
+
+
+def _table(name, columns=3):
+    return "TABLE", {"attributes": {"name": name, "qualifiedName": f"db/s/{name}"}, "columns": [{"name": c} for c in range(columns)]}
+
+
+def _wait(store, job_id, *states, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job["status"] in states:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} stuck in {store.get(job_id)['status']}")
+
+
+class Runner:
+    # Yields one schema and `tables` tables; blocks after the first table until released
+    def __init__(self, tables=2, fail=None):
+        self.tables = tables
+        self.fail = fail
+        self.release = threading.Event()
+        self.paused = threading.Event()
+        self.calls = 0
+        self.closed = False
+
+    def __call__(self, params):
+        self.calls += 1
+        return self._events()
+
+    def _events(self):
+        try:
+            yield _schema("s")
+            for index in range(self.tables):
+                yield _table(f"t{index}")
+                if index == 0:
+                    self.paused.set()
+                    assert self.release.wait(10)
+            if self.fail:
+                raise RuntimeError(self.fail)
+        finally:
+            self.closed = True
+
+
+@pytest.fixture
+def manager():
+    return JobManager(MemoryJobStore(), Runner(), workers=1)
+
+
+def test_job_goes_from_queued_to_succeeded_with_result(manager):
+    manager.runner.release.set()
+    job = manager.submit({"source": "postgres"})
+    assert job["status"] == "queued" and job["progress"] == {"schemas": 0, "tables": 0, "columns": 0}
+    job = _wait(manager.store, job["job_id"], "succeeded")
+    assert job["progress"] == {"schemas": 1, "tables": 2, "columns": 6}
+    assert job["created_at"] <= job["started_at"] <= job["finished_at"]
+    assert job["owner"] == f"{socket.gethostname()}:{os.getpid()}"
+    schema, = manager.store.result(job["job_id"])
+    assert [table["attributes"]["name"] for table in schema["tables"]] == ["t0", "t1"]
+
+
+def test_progress_is_published_while_the_job_runs(manager, monkeypatch):
+    monkeypatch.setattr(jobs, "PROGRESS_INTERVAL", 0)
+    job = manager.submit({"source": "postgres"})
+    assert manager.runner.paused.wait(10)
+    running = manager.store.get(job["job_id"])
+    assert running["status"] == "running"
+    assert running["progress"] == {"schemas": 1, "tables": 1, "columns": 3}
+    assert manager.store.result(job["job_id"]) is None
+    manager.runner.release.set()
+    assert _wait(manager.store, job["job_id"], "succeeded")["progress"]["tables"] == 2
+
+
+def test_cancelled_queued_job_never_runs(manager):
+    first = manager.submit({"source": "postgres"})
+    assert manager.runner.paused.wait(10)
+    second = manager.submit({"source": "postgres"})
+    assert manager.cancel(second["job_id"])["status"] == "cancelled"
+    manager.runner.release.set()
+    _wait(manager.store, first["job_id"], "succeeded")
+    time.sleep(0.05)
+    assert manager.runner.calls == 1
+    assert manager.store.get(second["job_id"])["status"] == "cancelled"
+
+
+def test_cancelled_running_job_stops_between_tables_and_closes_the_stream(manager):
+    job = manager.submit({"source": "postgres"})
+    assert manager.runner.paused.wait(10)
+    assert manager.cancel(job["job_id"])["status"] == "running"        # Stops at the next table
+    manager.runner.release.set()
+    job = _wait(manager.store, job["job_id"], "cancelled")
+    assert job["progress"]["tables"] == 1 and job["finished_at"]
+    assert manager.runner.closed
+    assert manager.store.result(job["job_id"]) is None
+
+
+def test_failed_job_keeps_its_error_and_progress():
+    manager = JobManager(MemoryJobStore(), Runner(fail="connection lost"), workers=1)
+    manager.runner.release.set()
+    job = _wait(manager.store, manager.submit({"source": "postgres"})["job_id"], "failed")
+    assert job["error"] == "connection lost"
+    assert job["progress"] == {"schemas": 1, "tables": 2, "columns": 6}
+
+
+def _running_job(store, owner):
+    job = _new_job({"source": "postgres"})
+    store.create(job)
+    store.update(job["job_id"], status="running", started_at=time.time(), owner=owner)
+    return job["job_id"]
+
+
+def test_sqlite_store_fails_only_jobs_of_exited_workers(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    store = SQLiteJobStore(path)
+    dead = _running_job(store, f"{socket.gethostname()}:{exited.pid}")
+    alive = _running_job(store, f"{socket.gethostname()}:{os.getpid()}")
+    remote = _running_job(store, f"{socket.gethostname()}-other:{exited.pid}")
+    queued = _new_job({"source": "postgres"})
+    store.create(queued)
+
+    reopened = SQLiteJobStore(path)
+    assert reopened.get(dead)["status"] == "running"        # Opening the store alone changes nothing
+    runner = Runner()
+    runner.release.set()
+    manager = JobManager(reopened, runner, workers=1)
+    manager.start()
+    job = reopened.get(dead)
+    assert (job["status"], job["error"]) == ("failed", "Interrupted by restart")
+    assert reopened.get(alive)["status"] == "running"
+    assert reopened.get(remote)["status"] == "running"
+    assert _wait(reopened, queued["job_id"], "succeeded")["progress"]["tables"] == 2
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(job_routes, "_job_manager", None)
+    monkeypatch.setenv("JOB_STORE", "memory")
+    monkeypatch.setenv("JOB_FILE_DIR", str(tmp_path / "allowed"))
+    monkeypatch.delenv("EXCEL_FILE_PATH", raising=False)
+    os.makedirs(tmp_path / "allowed")
+    app = Flask(__name__)
+    job_routes.register_job_routes(app)
+    assert job_routes._job_manager is None      # The store is opened on first use, not at registration
+    return app.test_client()
+
+
+@pytest.mark.parametrize("limit", ["abc", "1.5", "0", "-1"])
+def test_list_jobs_rejects_bad_limits(client, limit):
+    response = client.get(f"/jobs?limit={limit}")
+    assert response.status_code == 400
+    assert "limit" in response.get_json()["error"]
+
+
+def test_list_jobs_limit(client):
+    for _ in range(3):
+        job_routes.get_job_manager().store.create(_new_job({"source": "postgres"}))
+    response = client.get("/jobs?limit=2")
+    assert response.status_code == 200
+    assert len(response.get_json()["jobs"]) == 2
+
+
+def test_excel_job_rejects_files_outside_job_file_dir(client, tmp_path):
+    outside = write_workbook(str(tmp_path / "outside.xlsx"), sheets=1, columns=2, rows=5)
+    escape = os.path.join(str(tmp_path / "allowed"), "..", "outside.xlsx")
+    for file_path in (outside, escape):
+        response = client.post("/jobs", json={"source": "excel", "file_path": file_path})
+        assert response.status_code == 400
+        assert "JOB_FILE_DIR" in response.get_json()["error"]
+
+
+def test_excel_job_without_job_file_dir_needs_an_upload(client, tmp_path, monkeypatch):
+    monkeypatch.delenv("JOB_FILE_DIR")
+    path = write_workbook(str(tmp_path / "allowed" / "book.xlsx"), sheets=1, columns=2, rows=5)
+    assert client.post("/jobs", json={"source": "excel", "file_path": path}).status_code == 400
+    with open(path, "rb") as file:
+        response = client.post("/jobs", data={"source": "excel", "file": (file, "book.xlsx")}, content_type="multipart/form-data")
+    assert response.status_code == 202
+
+
+def test_excel_job_in_job_file_dir_runs(client, tmp_path):
+    path = write_workbook(str(tmp_path / "allowed" / "book.xlsx"), sheets=2, columns=3, rows=5)
+    response = client.post("/jobs", json={"source": "excel", "file_path": path})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    job = _wait(job_routes.get_job_manager().store, job_id, "succeeded", "failed")
+    assert job["status"] == "succeeded", job["error"]
+    assert job["progress"]["schemas"] == 2
+    result = client.get(f"/jobs/{job_id}/result")
+    assert result.status_code == 200
+    assert len(result.get_json()["schemas"]) == 2
@@ -0,0 +1,95 @@
+import re
+
+from flask import Flask
+
+from src.routes.database import BULK_QUERIES, QUERIES, SIGNAL_QUERIES
+from src.routes.metrics import register_metrics_routes
+from src.utils import metrics
+from src.utils.metrics import Counter, Histogram, collect_timings, observe_query, register_query_kind, render_metrics
+
+SAMPLE = re.compile(r'^[a-z_]+(\{([a-z_]+="([^"\\]|\\.)*",?)*\})? -?[0-9.e+-]+$')
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test latency", ("source",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, ("pg",))
+    assert histogram.render() == [
+        "# HELP test_seconds Test latency",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{source="pg",le="0.1"} 2',
+        'test_seconds_bucket{source="pg",le="1.0"} 3',
+        'test_seconds_bucket{source="pg",le="+Inf"} 4',
+        'test_seconds_sum{source="pg"} 3.65',
+        'test_seconds_count{source="pg"} 4',
+    ]
+
+
+def test_counter_series_are_sorted_and_unlabelled_counters_have_no_braces():
+    counter = Counter("test_total", "Test count", ("type",))
+    counter.inc(("table",), 2)
+    counter.inc(("column",))
+    counter.inc(("table",))
+    assert counter.render()[2:] == ['test_total{type="column"} 1', 'test_total{type="table"} 3']
+    plain = Counter("plain_total", "No labels")
+    plain.inc()
+    assert plain.render()[2:] == ["plain_total 1"]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("test_total", "Test count", ("kind",))
+    counter.inc(('a"b\\c\nd',))
+    line = counter.render()[2]
+    assert line == 'test_total{kind="a\\"b\\\\c\\nd"} 1'
+    assert SAMPLE.match(line)
+
+
+def test_query_kind_from_registry_comment_or_other():
+    register_query_kind("SELECT 42 AS answer", "answer")
+    assert metrics._query_kind("SELECT 42 AS answer") == "answer"
+    assert metrics._query_kind("/* profile_sample */ SELECT * FROM t LIMIT 10") == "profile_sample"
+    assert metrics._query_kind("SELECT 2 AS probe") == "other"
+    assert metrics._query_kind("/* unterminated SELECT 2") == "other"
+
+
+def test_catalog_queries_are_labelled_by_kind():
+    for kind, queries in QUERIES.items():
+        assert {metrics._query_kind(query) for query in queries.values()} == {kind}
+    for kind, queries in BULK_QUERIES.items():
+        assert {metrics._query_kind(query) for query in queries.values()} == {f"bulk_{kind}"}
+    assert {metrics._query_kind(query) for query in SIGNAL_QUERIES.values()} == {"signal"}
+
+
+def test_observe_query_counts_rows_errors_and_request_timings():
+    labels = ("testdb", "other")
+    before_errors = metrics.QUERY_ERRORS._values.get(labels, 0)
+    before_rows = metrics.QUERY_ROWS._values.get(labels, 0)
+    with collect_timings() as timings:
+        observe_query("testdb", "SELECT 2 AS probe", 0.25, 7)
+        observe_query("testdb", "SELECT 2 AS probe", 0.5, None)
+    observe_query("testdb", "SELECT 2 AS probe", 1.0, 3)     # Outside the request
+    assert (timings["queries"], timings["rows"], timings["query_seconds"]) == (1, 7, 0.25)
+    assert metrics.QUERY_ROWS._values[labels] - before_rows == 10
+    assert metrics.QUERY_ERRORS._values[labels] - before_errors == 1
+
+
+def test_metrics_endpoint_serves_the_text_format():
+    observe_query("testdb", "SELECT 2 AS probe", 0.01, 1)
+    app = Flask(__name__)
+    register_metrics_routes(app)
+    response = app.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = response.get_data(as_text=True)
+    assert body == render_metrics() and body.endswith("\n")
+    typed = set()
+    for line in body.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert kind in ("counter", "histogram")
+            typed.add(name)
+        elif not line.startswith("# HELP "):
+            assert SAMPLE.match(line), line
+            assert re.sub(r"(_bucket|_sum|_count)?(\{.*)? .*$", "", line) in typed
+    assert {metric.name for metric in metrics.METRICS} == typed
+    assert 'extractor_query_seconds_count{source="testdb",kind="other"}' in body
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import mysql.connector.pooling
+import pytest
+from mysql.connector.connection import MySQLConnection
+
+from src.clients.mysql import MySQLClient
+
+CREDENTIALS = {"user": "u", "password": "p", "host": "h", "port": 3306, "database": "d"}
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection, self.closed, self.description = connection, False, None
+
+    def execute(self, query, args=()):
+        self.connection.statements.append(query)
+        if "fail" in query:
+            raise mysql.connector.errors.ProgrammingError("syntax error")
+        if "slow" in query:
+            self.connection.release.wait(5)
+        self.description = [("table_name",), ("ordinal_position",)]
+
+    def fetchall(self):
+        return [("orders", 1)]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection(MySQLConnection):
+    """A MySQLConnection that never touches the network, so the real pool can manage it."""
+    def __init__(self, opened=None, **kwargs):
+        super().__init__()
+        self.statements, self.cursors, self.connected = [], [], True
+        self.release = threading.Event()
+        if opened is not None:
+            opened.append(self)
+
+    def config(self, **kwargs):
+        pass
+
+    def is_connected(self):
+        return self.connected
+
+    def reconnect(self, attempts=1, delay=0):
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+    def cursor(self, *args, **kwargs):
+        self.cursors.append(FakeCursor(self))
+        return self.cursors[-1]
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    connections = []
+    monkeypatch.setattr(mysql.connector.pooling, "connect", lambda **kwargs: FakeConnection(connections if kwargs else None))
+    return connections
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_queries_reuse_pooled_connections(opened):
+    async def main():
+        client = MySQLClient(pool_size=3)
+        await client.connect(CREDENTIALS)
+        results = await asyncio.gather(*(client.execute_query("SELECT 1") for _ in range(20)))
+        await client.close()
+        return results
+    results = [[dict(row) for row in result] for result in run(main())]
+    assert len(opened) == 3
+    assert results[0] == [{"table_name": "orders", "ordinal_position": 1}]
+    assert sum(len(connection.statements) for connection in opened) == 20
+    assert all(cursor.closed for connection in opened for cursor in connection.cursors)
+    assert not any(connection.connected for connection in opened)
+
+
+def test_failed_query_closes_cursor_and_returns_connection(opened):
+    async def main():
+        client = MySQLClient(pool_size=1)
+        await client.connect(CREDENTIALS)
+        with pytest.raises(mysql.connector.errors.ProgrammingError):
+            await client.execute_query("fail", timeout=2)
+        result = await client.execute_query("SELECT 1")     # The only connection went back to the pool
+        await client.close()
+        return [dict(row) for row in result]
+    assert run(main()) == [{"table_name": "orders", "ordinal_position": 1}]
+    connection, = opened
+    assert connection.statements == ["SET SESSION MAX_EXECUTION_TIME = 2000", "fail", "SET SESSION MAX_EXECUTION_TIME = 0", "SELECT 1"]
+    assert all(cursor.closed for cursor in connection.cursors)
+
+
+def test_stale_connection_is_reopened(opened):
+    async def main():
+        client = MySQLClient(pool_size=1)
+        await client.connect(CREDENTIALS)
+        opened[0].connected = False     # Dropped by the server while idle
+        result = await client.execute_query("SELECT 1")
+        await client.close()
+        return [dict(row) for row in result]
+    assert run(main()) == [{"table_name": "orders", "ordinal_position": 1}]
+
+
+def test_close_waits_for_running_queries_to_release(opened):
+    async def main():
+        client = MySQLClient(pool_size=2)
+        await client.connect(CREDENTIALS)
+        slow = asyncio.ensure_future(client.execute_query("slow"))
+        await asyncio.sleep(0.05)
+        await client.close()
+        busy = [connection for connection in opened if connection.statements]
+        idle = [connection for connection in opened if not connection.statements]
+        assert [connection.connected for connection in busy + idle] == [True, False]
+        busy[0].release.set()
+        await slow
+        assert not busy[0].connected        # Closed on release instead of going back to the pool
+    run(main())
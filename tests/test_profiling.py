@@ -0,0 +1,148 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.routes import database
+from src.utils.profiling import HyperLogLog, profile_frame, sample_query
+
+CREDENTIALS = {"database": "catalog"}
+CONNECTION = "test/connection"
+BUDGET = {"rows": 100, "timeout": 5.0, "top_k": 3}
+
+
+def fetch(client, db_type="postgresql", profile=BUDGET, **options):
+    return asyncio.run(database.fetch_db_metadata(client, CREDENTIALS, CONNECTION, db_type, profile=profile, **options))
+
+
+def tables(schemas):
+    return [table for schema in schemas for table in schema["tables"]]
+
+
+def without_timings(schemas):
+    for table in tables(schemas):
+        table["customAttributes"]["profile"].pop("seconds")
+    return schemas
+
+
+def sketch(values):
+    hll = HyperLogLog()
+    hll.add_hashes(pd.util.hash_array(np.asarray(values)))
+    return hll
+
+
+@pytest.mark.parametrize("cardinality", [1, 10, 100, 1000, 10000, 100000, 1000000])
+def test_hyperloglog_error_bound(cardinality):
+    # 4096 registers: ~1.6% standard error; 5% is beyond three standard errors
+    estimate = sketch(np.arange(cardinality)).estimate()
+    assert abs(estimate - cardinality) <= max(1, 0.05 * cardinality)
+
+
+def test_hyperloglog_ignores_duplicates_and_merges_as_a_union():
+    assert HyperLogLog().estimate() == 0
+    once = sketch(np.arange(5000))
+    assert sketch(np.tile(np.arange(5000), 4)).estimate() == once.estimate()
+    merged = sketch(np.arange(0, 6000))
+    left, right = sketch(np.arange(0, 4000)), sketch(np.arange(2000, 6000))
+    left.merge(right)
+    assert left.estimate() == merged.estimate()
+
+
+def test_profile_frame_statistics():
+    frame = pd.DataFrame({
+        "id": range(10),
+        "status": ["a", "b", "a", None, "a", "b", "c", None, "a", "a"],
+        "tags": [[1], [2], [1], None, [1], [3], None, None, [1], [2]],
+        "mixed": [1, "x", 2, "y", None, 3, "z", 4, 5, 6],
+    })
+    profiles = profile_frame(frame, top_k=2)
+    assert profiles["id"] == {"null_fraction": 0.0, "distinct_estimate": 10, "min": 0, "max": 9,
+                              "top_values": [{"value": 0, "count": 1}, {"value": 1, "count": 1}]}
+    assert profiles["status"]["null_fraction"] == 0.2
+    assert profiles["status"]["distinct_estimate"] == 3
+    assert profiles["status"]["top_values"] == [{"value": "a", "count": 5}, {"value": "b", "count": 2}]
+    assert profiles["tags"]["top_values"][0] == {"value": "[1]", "count": 4}       # Profiled as text
+    assert (profiles["mixed"]["min"], profiles["mixed"]["max"]) == (None, None)    # Unordered values
+    empty = profile_frame(pd.DataFrame({"id": []}))
+    assert empty["id"] == {"null_fraction": 0.0, "distinct_estimate": 0, "min": None, "max": None, "top_values": []}
+
+
+@pytest.mark.parametrize("db_type, estimate, method, fragment", [
+    ("postgresql", 1000000, "tablesample", 'FROM "s"."t" TABLESAMPLE SYSTEM (0.015000) LIMIT 100'),
+    ("postgresql", 50, "limit", 'FROM "s"."t" LIMIT 100'),
+    ("postgresql", None, "limit", 'FROM "s"."t" LIMIT 100'),
+    ("oracle", 1000000, "sample", 'FROM "s"."t" SAMPLE BLOCK (0.015000) FETCH FIRST 100 ROWS ONLY'),
+    ("oracle", 0, "limit", 'FROM "s"."t" FETCH FIRST 100 ROWS ONLY'),
+    ("mysql", 1000000, "limit", "FROM `s`.`t` LIMIT 100"),
+])
+def test_sample_query_falls_back_to_a_bounded_scan(db_type, estimate, method, fragment):
+    query, chosen = sample_query(db_type, "s", "t", ["id", 'odd"name'], 100, estimate)
+    assert chosen == method
+    assert query.startswith("/* profile_sample */ SELECT ") and query.endswith(fragment)
+    assert ('`odd"name`' if db_type == "mysql" else '"odd""name"') in query
+
+
+@pytest.mark.parametrize("db_type, method", [("postgresql", "tablesample"), ("mysql", "limit"), ("oracle", "sample")])
+def test_profiled_extraction_on_the_synthetic_catalog(catalog, db_type, method):
+    client = catalog(db_type, schemas=2, tables=3, columns=6, rows=1000)
+    schemas = fetch(client, db_type, bulk=True)
+    per_table = fetch(catalog(db_type, schemas=2, tables=3, columns=6, rows=1000), db_type, bulk=False)
+    assert without_timings(per_table) == without_timings(schemas)
+    for table in tables(schemas):
+        summary = table["customAttributes"]["profile"]
+        assert summary["status"] == "ok"
+        assert (summary["method"], summary["sampled_rows"], summary["row_estimate"]) == (method, 100, 1000)
+        columns = {column["attributes"]["name"]: column["customAttributes"]["profile"] for column in table["columns"]}
+        assert columns["column_0"]["distinct_estimate"] == 100 and columns["column_0"]["null_fraction"] == 0.0
+        assert (columns["column_0"]["min"], columns["column_0"]["max"]) == (0, 99)
+        assert columns["column_1"]["null_fraction"] == 0.1
+        assert len(columns["column_5"]["top_values"]) == 3
+
+
+def test_small_tables_are_scanned_within_the_row_budget(catalog):
+    schemas = fetch(catalog(schemas=1, tables=1, columns=2, rows=40))
+    summary = tables(schemas)[0]["customAttributes"]["profile"]
+    assert (summary["method"], summary["sampled_rows"]) == ("limit", 40)
+
+
+class Failing:
+    """Fails or stalls the sample query of some tables."""
+    def __init__(self, client, tables, delay=None):
+        self.client, self.tables, self.delay = client, set(tables), delay
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    async def execute_query(self, query, *args, timeout=None):
+        if query.startswith("/* profile_sample */") and any(f'"{table}"' in query for table in self.tables):
+            if self.delay is None:
+                raise RuntimeError("permission denied")
+            await asyncio.sleep(self.delay)
+        return await self.client.execute_query(query, *args)
+
+
+def test_failed_table_is_reported_and_does_not_fail_the_extraction(catalog):
+    schemas = fetch(Failing(catalog(schemas=1, tables=3, columns=2), ["table_1"]))
+    statuses = [table["customAttributes"]["profile"]["status"] for table in tables(schemas)]
+    assert statuses == ["ok", "failed", "ok"]
+    failed = tables(schemas)[1]
+    assert all("profile" not in column["customAttributes"] for column in failed["columns"])
+
+
+def test_table_over_its_time_budget_times_out(catalog):
+    schemas = fetch(Failing(catalog(schemas=1, tables=2, columns=2), ["table_0"], delay=5), profile={**BUDGET, "timeout": 0.1})
+    first, second = tables(schemas)
+    assert first["customAttributes"]["profile"]["status"] == "timeout"
+    assert first["customAttributes"]["profile"]["seconds"] < 1
+    assert second["customAttributes"]["profile"]["status"] == "ok"
+
+
+def test_tables_without_profilable_columns_are_skipped(catalog):
+    client = catalog(schemas=1, tables=1, columns=2)
+    for row in client.column_rows[("schema_0", "table_0")]:
+        row["data_type"] = "bytea"
+    queries = client.query_count
+    summary = tables(fetch(client))[0]["customAttributes"]["profile"]
+    assert summary["status"] == "skipped"
+    assert client.query_count - queries == 4        # Catalog queries only
@@ -0,0 +1,158 @@
+import asyncio
+import time
+
+import pytest
+
+from src.clients.registry import ClientRegistry
+
+
+class FakeClient:
+    instances = []
+
+    def __init__(self):
+        self.connected = 0
+        self.closed = 0
+        self.queries = []
+        self.healthy = True
+        FakeClient.instances.append(self)
+
+    async def connect(self, credentials):
+        await asyncio.sleep(0.01)       # Lets concurrent first leases overlap
+        self.connected += 1
+
+    async def close(self):
+        self.closed += 1
+
+    async def execute_query(self, query):
+        self.queries.append(query)
+        if not self.healthy:
+            raise ConnectionError("server closed the connection")
+        return [(1,)]
+
+
+CREDENTIALS = {"host": "db", "user": "reader", "password": "secret"}
+
+
+@pytest.fixture
+def registry():
+    FakeClient.instances = []
+    registry = ClientRegistry(idle_timeout=300, max_lifetime=3600, health_check_interval=30, reap_interval=3600)
+    yield registry
+    registry.shutdown(timeout=1)
+
+
+def run(registry, coro):
+    return asyncio.run(registry.call(coro))
+
+
+async def borrow(registry, credentials=CREDENTIALS):
+    async with registry.lease("postgresql", FakeClient, credentials) as client:
+        return client
+
+
+def entry(registry):
+    only, = registry._entries.values()
+    return only
+
+
+def test_lease_reuses_one_client_per_credential_set(registry):
+    first = run(registry, borrow(registry))
+    assert run(registry, borrow(registry)) is first
+    other = run(registry, borrow(registry, {**CREDENTIALS, "user": "admin"}))
+    assert other is not first
+    assert [client.connected for client in FakeClient.instances] == [1, 1]
+    assert all("secret" not in stats["key"] for stats in registry.stats())
+    assert [stats["leases"] for stats in registry.stats()] == [0, 0]
+
+
+def test_concurrent_first_leases_connect_once(registry):
+    async def concurrent():
+        return await asyncio.gather(*(borrow(registry) for _ in range(5)))
+    clients = run(registry, concurrent())
+    assert len(set(map(id, clients))) == 1
+    assert len(FakeClient.instances) == 1 and FakeClient.instances[0].connected == 1
+
+
+def test_health_check_keeps_a_healthy_client(registry):
+    client = run(registry, borrow(registry))
+    entry(registry).last_checked -= 60
+    assert run(registry, borrow(registry)) is client
+    assert client.queries == ["SELECT 1"]
+    assert time.monotonic() - entry(registry).last_checked < 5
+
+
+def test_failed_health_check_replaces_the_client(registry):
+    client = run(registry, borrow(registry))
+    client.healthy = False
+    assert run(registry, borrow(registry)) is client      # Not checked again within the interval
+    entry(registry).last_checked -= 60
+    replacement = run(registry, borrow(registry))
+    assert replacement is not client
+    assert client.closed == 1 and replacement.connected == 1
+
+
+def test_client_past_its_lifetime_is_closed_once_its_last_lease_returns(registry):
+    async def scenario():
+        async with registry.lease("postgresql", FakeClient, CREDENTIALS) as old:
+            entry(registry).created_at -= 7200
+            async with registry.lease("postgresql", FakeClient, CREDENTIALS) as new:
+                assert new is not old
+                assert old.closed == 0        # Still leased
+            assert old.closed == 0
+        return old, new
+    old, new = run(registry, scenario())
+    assert old.closed == 1 and new.closed == 0
+    assert entry(registry).client is new
+
+
+def test_reaper_closes_idle_and_expired_clients_but_not_leased_ones(registry):
+    registry.reap_interval = 0.01
+    registry.idle_timeout = 0.05
+
+    async def scenario():
+        idle = await borrow(registry)
+        async with registry.lease("postgresql", FakeClient, {**CREDENTIALS, "user": "busy"}) as busy:
+            await asyncio.sleep(0.2)
+            assert idle.closed == 1
+            assert busy.closed == 0
+        await asyncio.sleep(0.2)
+        return busy
+    busy = run(registry, scenario())
+    assert busy.closed == 1
+    assert registry.stats() == []
+
+
+def test_disabled_registry_connects_per_lease():
+    FakeClient.instances = []
+    registry = ClientRegistry(enabled=False)
+    first = asyncio.run(borrow(registry))
+    second = asyncio.run(borrow(registry))
+    assert first is not second
+    assert [(client.connected, client.closed) for client in (first, second)] == [(1, 1), (1, 1)]
+    assert registry._loop is None       # Never started a loop
+
+
+def test_borrowed_events_hold_the_lease_until_the_stream_ends(registry):
+    async def events(client):
+        for index in range(3):
+            assert registry.stats()[0]["leases"] == 1
+            yield index
+
+    async def consume():
+        return [item async for item in registry.borrowed_events("postgresql", FakeClient, CREDENTIALS, events)]
+    assert run(registry, consume()) == [0, 1, 2]
+    assert registry.stats()[0]["leases"] == 0
+
+
+def test_shutdown_closes_clients_cancels_the_reaper_and_allows_a_restart(registry):
+    client = run(registry, borrow(registry))
+    loop = registry.loop
+    registry.shutdown(timeout=1)
+    assert client.closed == 1
+    assert not registry._thread.is_alive() and loop.is_closed()
+    assert [task for task in asyncio.all_tasks(loop) if not task.done()] == []
+    assert registry.stats() == []
+
+    restarted = run(registry, borrow(registry))
+    assert restarted is not client and restarted.connected == 1
+    assert registry.loop is not loop
@@ -0,0 +1,57 @@
+import pytest
+
+from src.clients.rows import Row, cursor_rows
+
+DESCRIPTION = [("TABLE_NAME", 253), ("Column_Name", 253), ("ordinal", 3)]
+
+
+@pytest.fixture
+def rows():
+    return cursor_rows(DESCRIPTION, [("orders", "id", 1), ("orders", "total", 2)])
+
+
+def test_rows_share_one_lower_cased_column_map(rows):
+    assert list(rows[0].keys()) == ["table_name", "column_name", "ordinal"]
+    assert rows[0]._columns is rows[1]._columns
+
+
+def test_rows_have_slots_and_no_per_row_dict(rows):
+    assert Row.__slots__ == ("_values", "_columns")
+    assert not hasattr(rows[0], "__dict__")
+    with pytest.raises(AttributeError):
+        rows[0].extra = 1
+
+
+def test_key_and_index_lookup(rows):
+    row = rows[1]
+    assert row["column_name"] == row[1] == "total"
+    assert row[-1] == 2
+    assert row.get("ordinal") == 2
+    assert row.get("missing") is None and row.get("missing", "x") == "x"
+    assert "table_name" in row and "TABLE_NAME" not in row
+    with pytest.raises(KeyError):
+        row["missing"]
+    with pytest.raises(IndexError):
+        row[3]
+
+
+def test_reads_like_a_record(rows):
+    row = rows[0]
+    assert dict(row) == {"table_name": "orders", "column_name": "id", "ordinal": 1}
+    assert list(row) == list(row.values()) == ["orders", "id", 1]
+    assert list(row.items()) == [("table_name", "orders"), ("column_name", "id"), ("ordinal", 1)]
+    assert len(row) == 3
+    assert repr(row) == "<Row table_name='orders' column_name='id' ordinal=1>"
+
+
+def test_equality_compares_values_and_column_names(rows):
+    same = Row(("orders", "id", 1), {"table_name": 0, "column_name": 1, "ordinal": 2})
+    renamed = Row(("orders", "id", 1), {"table": 0, "column_name": 1, "ordinal": 2})
+    assert rows[0] == same
+    assert rows[0] != rows[1]
+    assert rows[0] != renamed
+    assert rows[0] != ("orders", "id", 1)
+
+
+def test_empty_result():
+    assert cursor_rows(DESCRIPTION, []) == []
@@ -0,0 +1,71 @@
+import pytest
+from flask import Flask
+
+from src.routes import database
+from src.routes.database import DEPTHS, _extraction_options, parse_selection, register_database_routes, selective_query
+
+
+SELECTION = {"include_schemas": ["sales%"], "exclude_tables": "tmp%", "object_types": ["view"]}
+
+
+@pytest.mark.parametrize("db_type, placeholders, view_type", [
+    ("postgresql", ["$2", "$3"], "'VIEW'"),
+    ("mysql", ["%s", "%s"], "'VIEW', 'SYSTEM VIEW'"),
+    ("oracle", [":2", ":3"], "'VIEW'"),
+])
+def test_selective_query_per_table(db_type, placeholders, view_type):
+    query, *args = selective_query("table", db_type, parse_selection(SELECTION), "sales_eu")
+    assert args == ["sales_eu", "tmp%"]
+    assert f"LIKE {placeholders[0]}" in query
+    assert f"IN ({view_type})" in query
+    if db_type == "oracle":     # The default TABLE filter is replaced, not ANDed with the view filter
+        assert "table_type = 'TABLE'" not in query
+
+
+@pytest.mark.parametrize("db_type, expected", [
+    ("postgresql", ["(t.table_schema LIKE $1)", "NOT t.table_name LIKE $2", "t.table_type IN ('VIEW')"]),
+    ("mysql", ["(TABLE_SCHEMA LIKE %s)", "NOT TABLE_NAME LIKE %s", "TABLE_TYPE IN ('VIEW', 'SYSTEM VIEW')"]),
+    ("oracle", ["(owner LIKE :1)", "NOT table_name LIKE :2"]),
+])
+def test_selective_query_bulk(db_type, expected):
+    query, *args = selective_query("bulk_table", db_type, parse_selection(SELECTION))
+    assert args == ["sales%", "tmp%"]
+    predicates = [line.strip() for line in query.splitlines() if line.strip().startswith("AND ")]
+    assert predicates == [f"AND {predicate}" for predicate in expected]
+    if db_type == "oracle":     # Takes the place of the default TABLE filter
+        assert "AND table_type IN ('VIEW')" in query and "table_type = 'TABLE'" not in query
+
+
+@pytest.mark.parametrize("db_type", ["postgresql", "mysql", "oracle"])
+def test_selective_query_signal_appends_to_outer_where(db_type):
+    query, *args = selective_query("signal", db_type, parse_selection({"include_tables": ["orders"], "pattern_type": "regex"}))
+    assert args == ["orders"]
+    assert query.rstrip().splitlines()[-1].strip().startswith("AND (")
+
+
+def test_selective_query_without_selection_is_unchanged():
+    assert selective_query("column", "mysql", None, "s", "t") == (database.QUERIES["column"]["mysql"], "s", "t")
+    assert parse_selection({"max_depth": DEPTHS[-1]}) is None
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"concurrency": "many"}, "concurrency must be an integer"),
+    ({"concurrency": None}, "concurrency must be a number"),
+    ({"concurrency": 0}, "concurrency must be at least 1"),
+    ({"rate_limit": [5]}, "rate_limit must be a number"),
+    ({"retries": -1}, "must not be negative"),
+    ({"profile": True, "profile_timeout": "soon"}, "profile_timeout must be a number"),
+    ({"max_depth": "row"}, "Unsupported max_depth"),
+])
+def test_invalid_options(data, message):
+    with pytest.raises(ValueError, match=message):
+        _extraction_options(data)
+
+
+@pytest.mark.parametrize("data", [{"concurrency": "many"}, {"rate_limit": "fast"}, {"max_depth": "row"}, {"retries": -1}])
+def test_invalid_options_answer_400(data):
+    app = Flask(__name__)
+    register_database_routes(app)
+    response = app.test_client().post("/extract_postgres", json=data)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
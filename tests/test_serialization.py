@@ -0,0 +1,109 @@
+import datetime
+import decimal
+import gzip
+import json
+
+import pytest
+from flask import Flask
+
+from src.clients.rows import Row
+from src.utils import serialization
+from src.utils.metrics import collect_timings
+from src.utils.serialization import _negotiate, compress, compress_chunks, json_response, stream_response
+
+needs_zstd = pytest.mark.skipif(not serialization.HAS_ZSTD, reason="zstandard is not installed")
+
+VALUES = {
+    "decimal": decimal.Decimal("12345678901234567890.0001"),
+    "timestamp": datetime.datetime(2024, 5, 1, 12, 30),
+    "date": datetime.date(2024, 5, 1),
+    "set": {1},
+    "row": Row(("orders", 1), {"table_name": 0, "ordinal_position": 1}),
+    "nested": {"tags": ("a", "b")},
+}
+
+
+def test_serializers_agree():
+    expected = {"decimal": "12345678901234567890.0001", "timestamp": "2024-05-01T12:30:00", "date": "2024-05-01",
+                "set": [1], "row": {"table_name": "orders", "ordinal_position": 1}, "nested": {"tags": ["a", "b"]}}
+    assert json.loads(serialization._json_dumps(VALUES)) == expected
+    assert json.loads(serialization._orjson_dumps(VALUES)) == expected
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("", None),
+    ("gzip", "gzip"),
+    ("gzip, zstd", "zstd"),     # Server preference wins among accepted encodings
+    ("zstd;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*", "zstd"),
+    ("*, zstd;q=0", "gzip"),
+    ("br", None),
+    ("GZIP;q=0.5", "gzip"),
+    ("gzip;q=x", None),
+])
+def test_negotiate(monkeypatch, accept_encoding, expected):
+    monkeypatch.setattr(serialization, "HAS_ZSTD", True)
+    assert _negotiate(accept_encoding) == expected
+
+
+def test_negotiate_without_zstandard(monkeypatch):
+    monkeypatch.setattr(serialization, "HAS_ZSTD", False)
+    assert _negotiate("zstd, gzip") == "gzip"
+    assert _negotiate("zstd") is None
+
+
+BODY = b'{"schemas":[' + b",".join(b'{"name":"table_%d"}' % index for index in range(500)) + b"]}"
+
+
+def decompress(body, encoding):
+    if encoding == "zstd":
+        return serialization.zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return gzip.decompress(body)
+
+
+@pytest.mark.parametrize("encoding", ["gzip", pytest.param("zstd", marks=needs_zstd)])
+def test_compression_round_trip(encoding):
+    assert decompress(compress(BODY, encoding), encoding) == BODY
+    chunks = [BODY[index:index + 100] for index in range(0, len(BODY), 100)]
+    assert decompress(b"".join(compress_chunks(chunks, encoding)), encoding) == BODY
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+@pytest.mark.parametrize("accept_encoding, encoding", [("", None), ("gzip", "gzip"), pytest.param("zstd, gzip", "zstd", marks=needs_zstd)])
+def test_json_response_encoding(app, accept_encoding, encoding):
+    payload = {"schemas": [{"name": f"table_{index}"} for index in range(500)]}
+    with app.test_request_context(headers={"Accept-Encoding": accept_encoding}):
+        response, status = json_response(payload, status=207)
+    assert status == 207 and response.status_code == 207
+    assert response.headers.get("Content-Encoding") == encoding
+    body = response.get_data()
+    assert json.loads(decompress(body, encoding) if encoding else body) == payload
+
+
+def test_small_responses_are_not_compressed(app):
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response, _ = json_response({"status": "ok"})
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(response.get_data()) == {"status": "ok"}
+
+
+def test_json_response_timings(app):
+    with app.test_request_context():
+        with collect_timings() as timings:
+            timings.update(queries=3, query_seconds=0.1234567)
+            response, _ = json_response({"schemas": []}, timings=timings)
+    assert json.loads(response.get_data())["timings"] == {"queries": 3, "query_seconds": 0.123457, "rows": 0, "entities": 0, "transform_seconds": 0.0}
+    assert response.headers["Server-Timing"].startswith('query;dur=123.5;desc="3 queries"')
+
+
+def test_stream_response_is_compressed_incrementally(app):
+    chunks = [BODY[index:index + 100] for index in range(0, len(BODY), 100)]
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response, _ = stream_response(iter(chunks), "application/x-ndjson")
+    assert response.is_streamed and response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.get_data()) == BODY
@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+import pytest
+from flask import Flask
+
+from benchmarks.workbook import write_workbook
+from src.cli import EXIT_FAILED, EXIT_OK, EXIT_PARTIAL, EXIT_USAGE, main
+from src.routes import database
+from src.routes.sources import extract_sources, parse_sources, register_source_routes
+
+
+class SlowCatalog:
+    def __init__(self, client):
+        self.client = client
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    async def execute_query(self, query, *args, timeout=None):
+        await asyncio.sleep(5)
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / "small.xlsx")
+    write_workbook(path, sheets=2, columns=4, rows=10)
+    return path
+
+
+@pytest.fixture
+def postgres(monkeypatch, catalog):
+    # PG_SOURCES_* credentials with a synthetic catalog behind the postgres source
+    monkeypatch.setenv("PG_SOURCES_HOST", "catalog.local")
+    monkeypatch.setenv("PG_SOURCES_DATABASE", "catalog")
+
+    def use(client_factory):
+        monkeypatch.setitem(database.DB_SOURCES, "postgres", (client_factory, "PG", "default/postgresql", "postgresql"))
+    use(lambda: catalog(schemas=2, tables=3))
+    return use
+
+
+def write_config(tmp_path, sources):
+    path = tmp_path / "sources.json"
+    path.write_text(json.dumps(sources))
+    return str(path)
+
+
+def test_sources_exit_codes(workbook, tmp_path):
+    output = tmp_path / "sources.json"
+    good = {"source": "excel", "file_path": workbook, "connection_qualified_name": "default/good"}
+    missing = {"source": "excel", "file_path": str(tmp_path / "missing.xlsx"), "connection_qualified_name": "default/missing"}
+
+    assert main(["sources", "--config", write_config(tmp_path, [good]), "--output", str(output)]) == EXIT_OK
+    assert main(["sources", "--config", write_config(tmp_path, [good, missing]), "--output", str(output)]) == EXIT_PARTIAL
+    result = json.loads(output.read_text())
+    assert result["summary"]["succeeded"] == 1 and result["sources"]["default/missing"]["status"] == "failed"
+    assert main(["sources", "--config", write_config(tmp_path, [missing]), "--output", str(output)]) == EXIT_FAILED
+
+
+@pytest.mark.parametrize("config", [
+    "not json",
+    json.dumps({"sources": []}),
+    json.dumps([{"source": "excel", "file_path": "a.csv"}]),
+    json.dumps({"sources": [{"source": "excel", "file_path": "a.xlsx"}], "max_parallel": "all"}),
+])
+def test_sources_invalid_config(tmp_path, config):
+    path = tmp_path / "sources.json"
+    path.write_text(config)
+    assert main(["sources", "--config", str(path), "--output", str(tmp_path / "out.json")]) == EXIT_USAGE
+    assert main(["sources", "--config", str(tmp_path / "absent.json"), "--output", str(tmp_path / "out.json")]) == EXIT_USAGE
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"sources": {}}, "non-empty list"),
+    ({"sources": ["excel"]}, "sources\\[0\\] must be an object"),
+    ({"sources": [{"source": "excel"}]}, "file_path must be an .xlsx"),
+    ({"sources": [{"source": "excel", "file_path": "a.xlsx", "sample_rows": "many"}]}, "sources\\[0\\]: sample_rows must be an integer"),
+    ({"sources": [{"source": "postgres", "env_prefix": "pg-sales"}]}, "env_prefix"),
+    ({"sources": [{"source": "postgres", "concurrency": 0}]}, "sources\\[0\\]: concurrency must be at least 1"),
+    ({"sources": [{"source": "sqlite"}]}, "unsupported source"),
+    ({"sources": [{"source": "postgres", "timeout": 0}]}, "timeout must be positive"),
+    ({"sources": [{"source": "postgres"}, {"source": "postgres", "env_prefix": "PG_OTHER"}]}, "Duplicate connection_qualified_name"),
+])
+def test_parse_sources_rejects(data, message):
+    with pytest.raises(ValueError, match=message):
+        parse_sources(data)
+
+
+def test_parse_sources_defaults():
+    excel, postgres = parse_sources({"timeout": 30, "sources": [
+        {"source": "excel", "file_path": "a.xlsx"},
+        {"source": "postgres", "env_prefix": "PG_SALES", "timeout": 5, "bulk": True},
+    ]})
+    assert (excel["connection_qualified_name"], excel["timeout"]) == ("default/excel", 30)
+    assert (postgres["connection_qualified_name"], postgres["env_prefix"], postgres["timeout"]) == ("default/postgresql", "PG_SALES", 5)
+    assert postgres["options"]["bulk"] is True
+
+
+def test_failed_and_timed_out_sources_do_not_affect_the_others(postgres, catalog, workbook, tmp_path, monkeypatch):
+    monkeypatch.setenv("PG_SLOW_HOST", "slow.local")       # Own credentials, so the registry pools the slow client apart
+    postgres(lambda: SlowCatalog(catalog(schemas=1, tables=1)))
+    specs = parse_sources({"sources": [
+        {"source": "excel", "file_path": workbook, "connection_qualified_name": "default/good"},
+        {"source": "excel", "file_path": str(tmp_path / "missing.xlsx"), "connection_qualified_name": "default/missing"},
+        {"source": "postgres", "env_prefix": "PG_SLOW", "timeout": 0.2},
+    ]})
+    result = asyncio.run(extract_sources(specs, max_parallel=3))
+    sources = result["sources"]
+    assert [sources[name]["status"] for name in ("default/good", "default/missing", "default/postgresql")] == ["succeeded", "failed", "timeout"]
+    assert len(sources["default/good"]["schemas"]) == 2
+    assert "File not found" in sources["default/missing"]["error"]
+    assert {key: result["summary"][key] for key in ("succeeded", "failed", "timeout")} == {"succeeded": 1, "failed": 1, "timeout": 1}
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    register_source_routes(app)
+    return app.test_client()
+
+
+def test_extract_sources_status_codes(postgres, workbook, tmp_path, client):
+    database_source = {"source": "postgres", "env_prefix": "PG_SOURCES"}
+    excel_source = {"source": "excel", "file_path": workbook}
+    response = client.post("/extract_sources", json={"sources": [database_source, excel_source]})
+    assert response.status_code == 200
+    sources = response.get_json()["sources"]
+    assert [schema["attributes"]["name"] for schema in sources["default/postgresql"]["schemas"]] == ["schema_0", "schema_1"]
+    assert len(sources["default/excel"]["schemas"]) == 2
+
+    missing = {"source": "excel", "file_path": str(tmp_path / "missing.xlsx"), "connection_qualified_name": "default/missing"}
+    response = client.post("/extract_sources", json={"sources": [database_source, missing]})
+    assert response.status_code == 207
+    assert response.get_json()["summary"]["failed"] == 1
+
+    assert client.post("/extract_sources", json={"sources": []}).status_code == 400
+    assert client.post("/extract_sources", json={"sources": [excel_source], "max_parallel": "all"}).status_code == 400
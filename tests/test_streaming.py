@@ -0,0 +1,79 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.routes import database
+from src.utils.serialization import dumps
+from src.utils.streaming import iterate_async, ndjson_chunks, nested_json_chunks
+
+CREDENTIALS = {"database": "catalog"}
+CONNECTION = "test/connection"
+
+
+def events(client):
+    async def collect():
+        return [event async for event in database.iter_db_metadata(client, CREDENTIALS, CONNECTION, "postgresql")]
+    return asyncio.run(collect())
+
+
+def test_streamed_json_matches_buffered_json(catalog):
+    buffered = asyncio.run(database.fetch_db_metadata(catalog(schemas=3, tables=4), CREDENTIALS, CONNECTION, "postgresql"))
+    streamed = b"".join(nested_json_chunks(events(catalog(schemas=3, tables=4))))
+    assert json.loads(streamed) == json.loads(dumps({"schemas": buffered}))
+
+
+@pytest.mark.parametrize("schemas", [[], [("SCHEMA", {"attributes": {"qualifiedName": "c/s"}, "tables": []})]])
+def test_streamed_json_without_tables(schemas):
+    expected = {"schemas": [{"attributes": {"qualifiedName": "c/s"}, "tables": []}] if schemas else []}
+    assert json.loads(b"".join(nested_json_chunks(schemas))) == expected
+
+
+def test_ndjson_framing(catalog):
+    body = b"".join(ndjson_chunks(events(catalog(schemas=2, tables=3, columns=4))))
+    assert body.endswith(b"\n") and not body.endswith(b"\n\n")
+    lines = [json.loads(line) for line in body.split(b"\n")[:-1]]
+    assert [line["typeName"] for line in lines].count("COLUMN") == 2 * 3 * 4
+    assert len(lines) == 2 + 2 * 3 + 2 * 3 * 4
+    names = {line["attributes"]["qualifiedName"] for line in lines}
+    for line in lines:
+        assert "tables" not in line and "columns" not in line       # Children are lines of their own
+        assert line.get("parentQualifiedName", CONNECTION) in names | {CONNECTION}
+        if line["typeName"] != "SCHEMA":
+            assert line["attributes"]["qualifiedName"].startswith(line["parentQualifiedName"] + "/")
+
+
+def test_iterate_async_yields_in_order_and_raises():
+    async def numbers():
+        for number in range(100):
+            yield number
+        raise RuntimeError("catalog went away")
+
+    items = iterate_async(numbers, maxsize=2)
+    assert [next(items) for _ in range(100)] == list(range(100))
+    with pytest.raises(RuntimeError, match="catalog went away"):
+        next(items)
+
+
+def test_iterate_async_stops_producer_when_consumer_leaves():
+    produced = []
+
+    async def endless():
+        try:
+            number = 0
+            while True:
+                produced.append(number)
+                yield number
+                number += 1
+        finally:
+            produced.append("closed")
+
+    items = iterate_async(endless, maxsize=1)
+    assert next(items) == 0
+    items.close()
+    for _ in range(200):
+        if produced[-1] == "closed":
+            break
+        time.sleep(0.01)
+    assert produced[-1] == "closed" and len(produced) < 10
@@ -0,0 +1,90 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.transformers.atlas import ColumnarRows, GenericAtlasTransformer
+
+KEY = {"constraint_name": "pk_orders", "constraint_type": "PRIMARY KEY", "columns": ["id"]}
+ROWS = [
+    {"column_name": "id", "schema_name": "sales", "table_name": "orders", "database_name": "db", "connection_qualified_name": "c",
+     "data_type": "integer", "is_nullable": "NO", "ordinal_position": 1, "description": "Key", "tags": ["pii"],
+     "constraint_type": "PRIMARY KEY", "constraint_types": ["PRIMARY KEY"], "constraints": [KEY]},
+    {"column_name": "note", "schema_name": "sales", "table_name": "orders", "database_name": "db", "connection_qualified_name": "c",
+     "data_type": "text", "is_nullable": "YES", "ordinal_position": 2, "description": None, "tags": [],
+     "constraint_type": "", "constraint_types": [], "constraints": []},
+]
+
+
+@pytest.fixture(scope="module")
+def transformer():
+    return GenericAtlasTransformer(connector_name="test")
+
+
+def row_by_row(transformer, typename, rows):
+    return [transformer.transform_row(typename, row) for row in rows]
+
+
+@pytest.mark.parametrize("typename", ["SCHEMA", "TABLE", "COLUMN"])
+def test_list_of_dicts(transformer, typename):
+    assert transformer.transform_batch(typename, ROWS) == row_by_row(transformer, typename, ROWS)
+
+
+@pytest.mark.parametrize("typename", ["SCHEMA", "TABLE", "COLUMN"])
+def test_dataframe(transformer, typename):
+    frame = pd.DataFrame(ROWS)
+    assert transformer.transform_batch(typename, frame) == row_by_row(transformer, typename, frame.to_dict("records"))
+
+
+@pytest.mark.parametrize("typename", ["SCHEMA", "TABLE", "COLUMN"])
+def test_arrow_table(transformer, typename):
+    table = pa.Table.from_pylist(ROWS)
+    assert transformer.transform_batch(typename, table) == row_by_row(transformer, typename, table.to_pylist())
+
+
+def test_dict_of_columns_broadcasts_scalars_and_lists(transformer):
+    columns = {
+        "column_name": ["id", "note"], "schema_name": "sales", "table_name": "orders", "database_name": "db",
+        "connection_qualified_name": "c", "data_type": ["integer", "text"], "is_nullable": ["NO", "YES"],
+        "ordinal_position": [1, 2], "description": "", "tags": [],      # One empty list for every row
+        "constraint_type": ["PRIMARY KEY", ""], "constraint_types": [["PRIMARY KEY"], []], "constraints": [[KEY], []],
+    }
+    rows = [{key: value[index] if key in ("column_name", "data_type", "is_nullable", "ordinal_position", "constraint_type",
+                                          "constraint_types", "constraints") else value
+             for key, value in columns.items()} for index in range(2)]
+    entities = transformer.transform_batch("COLUMN", columns)
+    assert entities == row_by_row(transformer, "COLUMN", rows)
+    assert [entity["customAttributes"]["tags"] for entity in entities] == [[], []]
+    assert entities[0]["customAttributes"]["constraints"] == [KEY]
+
+
+def test_list_field_given_per_row(transformer):
+    columns = {"column_name": ["a", "b"], "tags": [["x"], ["y", "z"]]}
+    entities = transformer.transform_batch("COLUMN", columns)
+    assert [entity["customAttributes"]["tags"] for entity in entities] == [["x"], ["y", "z"]]
+    assert entities == row_by_row(transformer, "COLUMN", [{"column_name": "a", "tags": ["x"]}, {"column_name": "b", "tags": ["y", "z"]}])
+
+
+@pytest.mark.parametrize("typename", ["SCHEMA", "TABLE", "COLUMN"])
+def test_missing_keys_use_the_row_defaults(transformer, typename):
+    rows = [{}, {"schema_name": "sales"}, {"column_name": "id", "ordinal_position": 3}]
+    assert transformer.transform_batch(typename, rows) == row_by_row(transformer, typename, rows)
+    columns = {"schema_name": ["a", "b"]}
+    assert transformer.transform_batch(typename, columns) == row_by_row(transformer, typename, [{"schema_name": "a"}, {"schema_name": "b"}])
+
+
+def test_malformed_row_falls_back_to_row_by_row(transformer):
+    rows = [ROWS[0], {**ROWS[1], "tags": None}]
+    assert transformer.transform_batch("COLUMN", rows) == row_by_row(transformer, "COLUMN", rows)
+
+
+def test_ragged_columns_are_rejected(transformer):
+    with pytest.raises(ValueError, match="Columns differ in length"):
+        transformer.transform_batch("COLUMN", {"column_name": ["a", "b", "c"], "data_type": ["text", "text"]})
+    with pytest.raises(ValueError, match="Columns differ in length"):
+        ColumnarRows({"column_name": ["a"], "tags": [["x"], ["y"]]})
+
+
+def test_empty_batches(transformer):
+    assert transformer.transform_batch("COLUMN", []) == []
+    assert transformer.transform_batch("COLUMN", pd.DataFrame(columns=["column_name"])) == []
+    assert transformer.transform_batch("UNKNOWN", ROWS) == []